@@ -295,6 +295,41 @@ def convertData(messageNameID,attribute, df, db):
     decimalData = decimalData.dropna()
     return decimalData
 
+def convertMessage(messageNameID, df, db, wide = False):
+    """Decodes every signal of a message at once and returns a dictionary of dataframes keyed by signal name,
+    each identical to what `convertData` returns for that signal.
+    Each frame is decoded a single time, instead of once per signal as repeated calls to `convertData` do.
+    Returns an empty dictionary if the message is not in the DBC or has no signals.
+
+    If wide is True, a single dataframe is returned instead, with columns Time and Bus and one column per signal,
+    one row per frame. Named signal values are replaced by their numerical values. Returns None if the message
+    is not in the DBC or has no signals."""
+
+    message = findMessageInfo(messageNameID, db)
+    if message == "not in DBC" or message.signals == []:
+        return None if wide else {}
+
+    messageData = ExtractChffrData(messageNameID, df, db)
+    messageData = messageData.where(messageData.MessageLength == message.length).dropna() #filter data by message length in DBC
+
+    decoded = [db.decode_message(messageNameID, bytes.fromhex(x)) for x in messageData['Message']]
+
+    if wide:
+        table = pd.DataFrame({'Time': messageData['Time'].values, 'Bus': messageData['Bus'].values.astype(np.uint8)})
+        for sig in message.signals:
+            values = [getattr(x.get(sig.name), 'value', x.get(sig.name)) for x in decoded]
+            table[sig.name] = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(np.float64)
+        return table
+
+    signals = {}
+    for sig in message.signals:
+        decimalData = messageData.copy()
+        if decoded:
+            decimalData['Message'] = pd.Series([x.get(sig.name) for x in decoded], index=messageData.index)
+        signals[sig.name] = decimalData.dropna()
+
+    return signals
+
 def plotDBC(address, attributeNum, df, db):
     """Plot the data for a specific signal.
 
@@ -10,6 +10,12 @@ from .dashboard import dashboard
 from .strymmap import *
 from .DBC_Read_Tools import *
 from .phasespace import phasespace
+from .intervalset import IntervalSet
+from .kinematics import TrajectoryIntegrator
+from .streaming import StateSpaceBuilder, StreamIntegrator
+from .matio import MatWriter
+from .dataset import read_dataset, dataset_files
+from .signalstore import SignalStore
 from .tools import acd
 from .tools import ellipse_fit
 from .tools import graham_scan
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Export of decoded signals and state space as Apache Arrow record batches, IPC files and shared memory
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import json
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        print("Arrow export requires pyarrow. Install it through `pip install pyarrow`.")
+        raise
+    return pyarrow
+
+def to_record_batch(data, metadata = None):
+    """
+    Converts decoded data into an Arrow record batch. Numerical columns are not copied when they are contiguous.
+
+    Parameters
+    -------------
+    data: `pandas.DataFrame` | `tuple`
+        A timeseries (e.g. returned by `strymread.get_ts` or topic methods), a state space returned by
+        `strymread.state_space`, or the `(matrix, schema)` tuple returned by `strymread.state_space(compact=True)`.
+        The index of a dataframe is dropped, named values such as value choices of DBC signals are converted to their
+        numerical values.
+
+    metadata: `dict`, default=None
+        Metadata of the record batch. Values are stored as JSON.
+
+    Returns
+    -----------
+    `pyarrow.RecordBatch`
+        Record batch with a column per column of `data`. For a compact state space, the first column is Time, and the
+        schema metadata holds the "kinds" and "rate" of the state space.
+    """
+    pa = _pyarrow()
+
+    metadata = dict(metadata or {})
+    if isinstance(data, tuple):
+        matrix, schema = data
+        # Columns of a matrix are contiguous in Fortran order
+        matrix = np.asfortranarray(matrix)
+        names = ['Time'] + list(schema['columns'])
+        arrays = [pa.array(np.asarray(schema['time']))] + [pa.array(matrix[:, i]) for i in range(matrix.shape[1])]
+        metadata.update({'kinds': schema['kinds'], 'rate': schema['rate']})
+    else:
+        names, arrays = [], []
+        for column in data.columns:
+            values = data[column].values
+            if values.dtype == object:
+                values = np.array([getattr(x, 'value', x) for x in values])
+            names.append(str(column))
+            arrays.append(pa.array(values))
+
+    return pa.RecordBatch.from_arrays(arrays, names = names, metadata = {k: json.dumps(v) for k, v in metadata.items()})
+
+def metadata(batch):
+    """
+    Returns the metadata of a record batch or table written by `to_record_batch` as a dictionary
+    """
+    return {k.decode(): json.loads(v) for k, v in (batch.schema.metadata or {}).items()}
+
+def write_ipc(path, data, metadata = None):
+    """
+    Writes decoded data to an Arrow IPC file, which `read_ipc` maps into memory without deserialization.
+
+    Parameters
+    -------------
+    path: `str`
+        Path of the IPC file
+
+    data: `pandas.DataFrame` | `tuple` | `pyarrow.RecordBatch`
+        Data to write, see `to_record_batch`
+
+    metadata: `dict`, default=None
+        Metadata of the record batch
+    """
+    pa = _pyarrow()
+
+    batch = data if isinstance(data, pa.RecordBatch) else to_record_batch(data, metadata)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+
+def read_ipc(path):
+    """
+    Memory-maps an Arrow IPC file. The columns of the returned `pyarrow.Table` point into the mapped file:
+    nothing is read or copied until accessed. Use `to_pandas` or `to_numpy` of the table, or of its columns, to convert.
+    """
+    pa = _pyarrow()
+
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+def to_shared_memory(data, name = None, metadata = None):
+    """
+    Writes decoded data as an Arrow IPC stream into a new block of shared memory, for other processes to map with
+    `from_shared_memory` without copying or deserialization.
+
+    The producer owns the shared memory block: it must keep the returned object alive as long as consumers use it,
+    and release it with `close()` and `unlink()` once they are done.
+
+    Parameters
+    -------------
+    data: `pandas.DataFrame` | `tuple` | `pyarrow.RecordBatch`
+        Data to write, see `to_record_batch`
+
+    name: `str`, default=None
+        Name of the shared memory block. A unique name is generated if None.
+
+    metadata: `dict`, default=None
+        Metadata of the record batch
+
+    Returns
+    -----------
+    `multiprocessing.shared_memory.SharedMemory`
+        The shared memory block. Pass its `name` to consumers.
+
+    Example
+    ----------
+    >>> from strym import arrowio
+    >>> shm = arrowio.to_shared_memory(r0.state_space())
+    >>> # in another process:
+    >>> with arrowio.from_shared_memory(shm.name) as shared:
+    >>>     state = shared.table.to_pandas()
+    """
+    pa = _pyarrow()
+
+    batch = data if isinstance(data, pa.RecordBatch) else to_record_batch(data, metadata)
+
+    # Size of the stream, to allocate the shared memory block at once
+    mock = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock, batch.schema) as writer:
+        writer.write_batch(batch)
+    size = mock.size()
+
+    block = shared_memory.SharedMemory(name = name, create = True, size = size)
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(block.buf))
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+
+    return block
+
+class SharedTable:
+    """
+    Arrow table mapped from a block of shared memory by `from_shared_memory`, along with the block.
+
+    The columns of `table` point into the block, and the block can't be closed while they are alive. Used as a context manager,
+    `SharedTable` releases the table and then closes the block on exit. Access the table as `shared.table` rather than
+    binding it to a variable, and copy what is needed beyond the block (e.g. with `to_pandas`): arrays of the table
+    that are still referenced when the block is closed make `close` raise `BufferError`.
+
+    Attributes
+    ---------------
+    table: `pyarrow.Table`
+        The table, None once closed
+
+    block: `multiprocessing.shared_memory.SharedMemory`
+        The shared memory block, None once closed
+    """
+    def __init__(self, table, block):
+        self.table = table
+        self.block = block
+
+    def close(self):
+        """
+        Releases the table and closes the block in this process. The block itself is removed by its producer.
+        """
+        if self.block is None:
+            return
+        self.table = None
+        self.block.close()
+        self.block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def from_shared_memory(name):
+    """
+    Maps Arrow data written by `to_shared_memory` in another process, without copying or deserialization.
+
+    Parameters
+    -------------
+    name: `str`
+        Name of the shared memory block
+
+    Returns
+    -----------
+    `SharedTable`
+        The table, whose columns point into the shared memory block, and the block. Use it as a context manager,
+        or call its `close()` once the table is no longer used.
+    """
+    pa = _pyarrow()
+
+    try:
+        block = shared_memory.SharedMemory(name = name, track = False)
+    except TypeError:
+        # Before Python 3.13, attaching registers the block for removal at exit of this process, although the producer owns it
+        block = shared_memory.SharedMemory(name = name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+
+    table = pa.ipc.open_stream(pa.py_buffer(block.buf)).read_all()
+    return SharedTable(table, block)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Condition language for subsetting CAN data by human-readable conditions such as "speed < 2.3 and not cruise control on"
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import re
+from functools import lru_cache
+import numpy as np
+from .intervalset import IntervalSet
+
+# Operand names accepted in conditions and the topic (see `strymread.topic2msgs`) they resolve to
+OPERAND_TOPICS = {'speed': 'speed', 'acceleration': 'accelx', 'lead_distance': 'lead_distance',
+                  'steering_angle': 'steer_angle', 'steering_rate': 'steer_rate', 'yaw_rate': 'yaw_rate'}
+
+# Named conditions and the comparison they are equivalent to
+NAMED_CONDITIONS = {
+    # 252m is read in the front when radar doesn't see any vehicle in the front.
+    'lead vehicle present': ('lead_distance', '<', 252.0),
+    # acc state of 6 denotes that cruise control was enabled.
+    'cruise control on': ('acc_state', '==', 6.0),
+}
+
+OPERATORS = {'<': np.less, '>': np.greater, '<=': np.less_equal, '>=': np.greater_equal,
+             '==': np.equal, '!=': np.not_equal}
+
+_TOKENS = re.compile(r'\s*(<=|>=|==|!=|<|>|\(|\)|[^\s()<>=!]+)')
+
+class Comparison:
+    """
+    Leaf of a condition: `operand op value`, e.g. `speed < 2.3`
+    """
+    def __init__(self, operand, op, value):
+        self.operand = operand
+        self.op = op
+        self.value = value
+
+    def operands(self):
+        return {self.operand}
+
+    def mask(self, grid, series):
+        time, values = series[self.operand]
+        truth = OPERATORS[self.op](values, self.value)
+
+        # Condition holds its value until the next sample of the operand arrives (zero-order hold).
+        # Before the first sample of the operand, the condition is not satisfied.
+        location = np.searchsorted(time, grid, side='right') - 1
+        result = np.zeros(grid.shape[0], dtype=bool)
+        available = location >= 0
+        result[available] = truth[location[available]]
+        return result
+
+    def __repr__(self):
+        return "({} {} {})".format(self.operand, self.op, self.value)
+
+class Not:
+    def __init__(self, node):
+        self.node = node
+
+    def operands(self):
+        return self.node.operands()
+
+    def mask(self, grid, series):
+        return ~self.node.mask(grid, series)
+
+    def __repr__(self):
+        return "(not {})".format(self.node)
+
+class And:
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def operands(self):
+        return set().union(*[n.operands() for n in self.nodes])
+
+    def mask(self, grid, series):
+        return np.logical_and.reduce([n.mask(grid, series) for n in self.nodes])
+
+    def __repr__(self):
+        return "(" + " and ".join(repr(n) for n in self.nodes) + ")"
+
+class Or:
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def operands(self):
+        return set().union(*[n.operands() for n in self.nodes])
+
+    def mask(self, grid, series):
+        return np.logical_or.reduce([n.mask(grid, series) for n in self.nodes])
+
+    def __repr__(self):
+        return "(" + " or ".join(repr(n) for n in self.nodes) + ")"
+
+class _Parser:
+    """
+    Recursive descent parser for the grammar
+
+        expr       := and_expr ('or' and_expr)*
+        and_expr   := not_expr ('and' not_expr)*
+        not_expr   := 'not' not_expr | '(' expr ')' | named | comparison
+        comparison := operand op number
+    """
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _TOKENS.findall(text)
+        if "".join(self.tokens) != "".join(text.split()):
+            self.error()
+        self.pos = 0
+
+    def error(self):
+        raise ValueError("Unsupported conditions provided: '{}'. See documentation for more details.".format(self.text))
+
+    def peek(self, offset=0):
+        if self.pos + offset < len(self.tokens):
+            return self.tokens[self.pos + offset]
+        return None
+
+    def keyword(self, word):
+        token = self.peek()
+        if token is not None and token.lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self.expr()
+        if self.pos != len(self.tokens):
+            self.error()
+        return node
+
+    def expr(self):
+        nodes = [self.and_expr()]
+        while self.keyword('or'):
+            nodes.append(self.and_expr())
+        return nodes[0] if len(nodes) == 1 else Or(nodes)
+
+    def and_expr(self):
+        nodes = [self.not_expr()]
+        while self.keyword('and'):
+            nodes.append(self.not_expr())
+        return nodes[0] if len(nodes) == 1 else And(nodes)
+
+    def not_expr(self):
+        if self.keyword('not'):
+            return Not(self.not_expr())
+
+        if self.peek() == '(':
+            self.pos += 1
+            node = self.expr()
+            if self.peek() != ')':
+                self.error()
+            self.pos += 1
+            return node
+
+        for phrase, (operand, op, value) in NAMED_CONDITIONS.items():
+            words = phrase.split()
+            candidate = [self.peek(i) for i in range(len(words))]
+            if None not in candidate and [w.lower() for w in candidate] == words:
+                self.pos += len(words)
+                return Comparison(operand, op, value)
+
+        return self.comparison()
+
+    def comparison(self):
+        operand, op, value = self.peek(), self.peek(1), self.peek(2)
+        if None in (operand, op, value) or op not in OPERATORS:
+            self.error()
+        try:
+            value = float(value)
+        except ValueError:
+            self.error()
+        self.pos += 3
+        return Comparison(normalize_operand(operand), op, value)
+
+def normalize_operand(operand):
+    """
+    Operand names are case-insensitive, except for signal names in `ID.SIGNAL.Message` operands
+    which are converted to upper case as in DBC files.
+    """
+    parts = operand.split('.')
+    if len(parts) == 3 and parts[0].isdigit() and parts[2].lower() == 'message':
+        return '{}.{}.message'.format(parts[0], parts[1].upper())
+    return operand.lower()
+
+@lru_cache(maxsize=256)
+def compile_condition(text):
+    """
+    Parse a human-readable condition into a tree of `Comparison`, `Not`, `And` and `Or` nodes.
+    Conditions are parsed only once, repeated calls with the same text return the cached tree.
+
+    Parameters
+    -------------
+    text: `str`
+        Condition such as `"speed < 2.3"`, `"lead vehicle present and not cruise control on"`
+        or `"(speed > 20 or 386.LONG_DIST.Message > 34.0) and acceleration < -1"`
+
+    Returns
+    ----------
+    Root node of the condition tree
+    """
+    if not isinstance(text, str) or len(text.strip()) == 0:
+        raise ValueError("Condition should be specified as a non-empty string.")
+
+    return _Parser(" ".join(text.split())).parse()
+
+def evaluate(node, series):
+    """
+    Evaluate a compiled condition in a single vectorized pass over a common time grid
+
+    Parameters
+    -------------
+    node:
+        Compiled condition returned by `compile_condition`
+
+    series: `dict`
+        Dictionary with operand names as keys and a tuple of numpy arrays `(time, values)`, sorted by time, as values
+
+    Returns
+    ----------
+    `numpy.ndarray`, `numpy.ndarray`
+        Common time grid, i.e. union of time points of all operands, and boolean array telling if the condition
+        is satisfied at each time point of the grid
+    """
+    grid = np.unique(np.concatenate([series[operand][0] for operand in node.operands()]))
+    return grid, node.mask(grid, series)
+
+def intervals(grid, mask):
+    """
+    Runs of True in `mask` as an `IntervalSet`. Each interval spans from the first to the last time point of the
+    grid at which the condition was satisfied.
+    """
+    return IntervalSet.from_mask(grid, mask)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Partitioned columnar (Parquet) datasets of decoded CAN messages across drives
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Keys a dataset can be partitioned by, in any order
+PARTITION_KEYS = ['vin', 'date', 'message', 'bus']
+
+# Name of the file, at the root of a dataset, listing all data files with their partition values and time statistics
+MANIFEST = '_manifest.json'
+
+# Partition value for drives without a VIN
+UNKNOWN_VIN = 'unknown'
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        print("Parquet datasets require pyarrow. Install it through `pip install pyarrow`.")
+        raise
+
+def _partition_value(value):
+    # Partition values become directory names
+    return str(value).replace('/', '_').replace(os.sep, '_')
+
+def write_message(root, table, message, vin, drive, partition_by = ('vin', 'date', 'message')):
+    """
+    Writes a decoded message of one drive to a partitioned dataset, one Parquet file per partition.
+
+    Files are laid out in Hive-style `key=value` directories following `partition_by`, e.g.
+    `root/vin=<vin>/date=<YYYY-MM-DD>/message=<message>/<drive>.parquet`. Partition keys are not stored as columns
+    of the files, except for "bus" that is a column unless partitioned by. A drive spanning several dates (in UTC)
+    is split across date partitions.
+
+    Parameters
+    -------------
+    root: `str`
+        Root directory of the dataset
+
+    table: `pandas.DataFrame`
+        Decoded message with columns Time and Bus and one column per signal, see `DBC_Read_Tools.convertMessage`
+
+    message: `str`
+        Message name
+
+    vin: `str`
+        Vehicle identification number. If None, drives are written to the partition "unknown".
+
+    drive: `str`
+        Identifier of the drive, used as file name
+
+    partition_by: `tuple`, default=("vin", "date", "message")
+        Partition keys, in the order of directory levels. Any of "vin", "date", "message" and "bus".
+
+    Returns
+    -----------
+    `list`
+        Manifest entries of the files written, see `update_manifest`
+    """
+    _require_pyarrow()
+
+    for key in partition_by:
+        if key not in PARTITION_KEYS:
+            raise ValueError("Unsupported partition key {}. Available keys are {}".format(key, PARTITION_KEYS))
+
+    dates = np.datetime_as_string(table['Time'].values.astype('datetime64[s]').astype('datetime64[D]'))
+    keys = pd.DataFrame({'date': dates if 'date' in partition_by else '', 'bus': table['Bus'].values if 'bus' in partition_by else -1})
+
+    entries = []
+    for (date, bus), rows in keys.groupby(['date', 'bus'], sort=True).indices.items():
+        values = {'vin': vin or UNKNOWN_VIN, 'date': date, 'message': message, 'bus': bus}
+
+        part = table.iloc[rows]
+        if 'bus' in partition_by:
+            part = part.drop(columns=['Bus'])
+
+        directory = os.path.join(*([root] + ['{}={}'.format(key, _partition_value(values[key])) for key in partition_by]))
+        filename = _partition_value(drive) if 'message' in partition_by else '{}_{}'.format(_partition_value(drive), _partition_value(message))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename + '.parquet')
+        part.to_parquet(path, engine='pyarrow', index=False)
+
+        entries.append({'path': os.path.relpath(path, root).replace(os.sep, '/'), 'vin': values['vin'],
+                        'date': date if 'date' in partition_by else None,
+                        'message': message, 'bus': None if 'bus' not in partition_by else int(bus), 'drive': drive,
+                        'rows': int(part.shape[0]), 'time_min': float(part['Time'].min()), 'time_max': float(part['Time'].max()),
+                        'columns': [column for column in part.columns]})
+
+    return entries
+
+def read_manifest(root):
+    """
+    Reads the manifest of a dataset. Returns a dictionary with the partition keys ("partition_by") and the list of
+    files ("files"), each with its path relative to `root`, partition values, drive, number of rows, minimum
+    and maximum time, and columns. The date of a file is None if the dataset is not partitioned by date.
+    """
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        raise ValueError("No dataset found at {}: {} is missing".format(root, MANIFEST))
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def update_manifest(root, entries, partition_by):
+    """
+    Adds `entries` to the manifest of the dataset at `root`, creating it if needed. Entries of files that are
+    rewritten replace the previous ones. The manifest is replaced atomically, but concurrent writers to the same
+    dataset are not supported.
+    """
+    path = os.path.join(root, MANIFEST)
+    manifest = {'partition_by': list(partition_by), 'files': []}
+    if os.path.exists(path):
+        manifest = read_manifest(root)
+        if manifest['partition_by'] != list(partition_by):
+            raise ValueError("Dataset at {} is partitioned by {}, not {}".format(root, manifest['partition_by'], list(partition_by)))
+
+    written = set(entry['path'] for entry in entries)
+    manifest['files'] = [entry for entry in manifest['files'] if entry['path'] not in written] + list(entries)
+
+    os.makedirs(root, exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+def dataset_files(root, messages = None, vins = None, dates = None, drives = None, time = None):
+    """
+    Selects the files of a dataset that may hold data matching the given conditions, from the partition values and
+    time statistics of the manifest only, without opening any data file. A condition that is None is not applied.
+
+    Parameters
+    -------------
+    root: `str`
+        Root directory of the dataset
+
+    messages: `list`, default=None
+        Message names
+
+    vins: `list`, default=None
+        Vehicle identification numbers. Drives without a VIN have the VIN "unknown".
+
+    dates: `list`, default=None
+        Dates in the format YYYY-MM-DD (UTC)
+
+    drives: `list`, default=None
+        Drive identifiers
+
+    time: `tuple`, default=None
+        Time range (t0, t1) in seconds. Either bound can be None.
+
+    Returns
+    -----------
+    `list`
+        Manifest entries of the selected files
+    """
+    def as_set(values):
+        return None if values is None else set([values] if isinstance(values, str) else values)
+
+    messages, vins, dates, drives = as_set(messages), as_set(vins), as_set(dates), as_set(drives)
+    t0, t1 = (None, None) if time is None else time
+
+    selected = []
+    for entry in read_manifest(root)['files']:
+        if messages is not None and entry['message'] not in messages:
+            continue
+        if vins is not None and entry['vin'] not in vins:
+            continue
+        if dates is not None:
+            first, last = np.array([entry['time_min'], entry['time_max']]).astype('datetime64[s]').astype('datetime64[D]')
+            if not any(first <= np.datetime64(date) <= last for date in dates):
+                continue
+        if drives is not None and entry['drive'] not in drives:
+            continue
+        if t0 is not None and entry['time_max'] < t0:
+            continue
+        if t1 is not None and entry['time_min'] > t1:
+            continue
+        selected.append(entry)
+
+    return selected
+
+def read_dataset(root, messages = None, vins = None, dates = None, drives = None, time = None, columns = None, **kwargs):
+    """
+    Reads decoded messages from a partitioned dataset written by `strymread.export_dataset`.
+
+    Files are pruned with the manifest (see `dataset_files`) and only the requested columns are read.
+    Within the remaining files, row groups outside of `time` are skipped using Parquet statistics.
+
+    Parameters
+    -------------
+    root: `str`
+        Root directory of the dataset
+
+    messages, vins, dates, drives, time:
+        Selection, see `dataset_files`
+
+    columns: `list`, default=None
+        Signal columns to read. Time and Bus are always read. All columns are read if None.
+
+    kwargs: variable list of argument in the dictionary format
+
+    workers: `int`, default = number of CPUs
+        Number of files read in parallel
+
+    Returns
+    -----------
+    `dict`
+        A dictionary of `pandas.DataFrame` keyed by message name, with columns Time, Bus, the requested signals,
+        vin and drive, sorted by time
+
+    Example
+    ----------
+    >>> from strym import read_dataset
+    >>> data = read_dataset('fleet', messages=['SPEED'], time=(1600000000.0, 1600003600.0), columns=['SPEED'])
+    >>> speed = data['SPEED']
+    """
+    _require_pyarrow()
+
+    workers = kwargs.get("workers", os.cpu_count() or 1)
+    entries = dataset_files(root, messages, vins, dates, drives, time)
+
+    filters = []
+    if time is not None:
+        if time[0] is not None:
+            filters.append(('Time', '>=', time[0]))
+        if time[1] is not None:
+            filters.append(('Time', '<=', time[1]))
+
+    def read(entry):
+        cols = None
+        if columns is not None:
+            cols = [c for c in entry['columns'] if c in ['Time', 'Bus'] or c in columns]
+        part = pd.read_parquet(os.path.join(root, entry['path']), engine='pyarrow', columns=cols, filters=filters or None)
+        if entry['bus'] is not None:
+            part.insert(1, 'Bus', np.uint8(entry['bus']))
+        part['vin'] = entry['vin']
+        part['drive'] = entry['drive']
+        return part
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(read, entries))
+
+    data = {}
+    for entry, part in zip(entries, parts):
+        data.setdefault(entry['message'], []).append(part)
+
+    for message in data:
+        data[message] = pd.concat(data[message], ignore_index=True).sort_values('Time', kind='stable', ignore_index=True)
+
+    return data
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Vectorized detection of driving events such as hard braking, cut-ins, stop-and-go and ACC engagement
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import numpy as np
+import pandas as pd
+
+from .intervalset import IntervalSet
+
+def hysteresis(values, on, off):
+    """
+    Boolean state switched on when `values` reaches `on` and switched off only when it goes back to `off`.
+
+    If `on >= off`, the state is on for high values (e.g. speed above a limit), otherwise it is on for low values
+    (e.g. deceleration below a negative threshold). NaN values keep the previous state. The state starts off.
+    """
+    values = np.asarray(values, dtype=float)
+    if on >= off:
+        switch_on, switch_off = values >= on, values <= off
+    else:
+        switch_on, switch_off = values <= on, values >= off
+
+    code = np.where(switch_on, 1, np.where(switch_off, 0, -1))
+    # state is given by the most recent sample that switched it on or off
+    last = np.maximum.accumulate(np.where(code >= 0, np.arange(values.shape[0]), -1))
+    return np.where(last >= 0, code[np.maximum(last, 0)], 0) == 1
+
+def detect_intervals(time, mask, min_duration = 0.0, debounce = 0.0):
+    """
+    Intervals of runs of True in `mask`. Intervals separated by at most `debounce` seconds are merged first, and then
+    intervals shorter than `min_duration` seconds are dropped.
+
+    Returns
+    ----------
+    `IntervalSet`
+    """
+    # runs of True are found by run-length encoding the mask
+    intervals = IntervalSet.from_mask(time, mask)
+    if debounce > 0:
+        intervals = intervals.fill_gaps(debounce)
+    if min_duration > 0:
+        intervals = intervals.min_duration(min_duration)
+    return intervals
+
+def _reduce_in(intervals, time, values, reduce):
+    """
+    Reduction of `values` over the samples within each interval
+    """
+    first = np.searchsorted(time, intervals.starts, side='left')
+    last = np.searchsorted(time, intervals.ends, side='right')
+    # reduceat over [first, last) pairs, with a padding element for intervals reaching the last sample
+    padded = np.concatenate((values, values[-1:]))
+    bounds = np.column_stack((first, last)).ravel()
+    return reduce.reduceat(padded, bounds)[::2]
+
+def interval_table(intervals, **columns):
+    """
+    Interval table with Start, End and Duration columns in seconds, followed by `columns`
+    """
+    table = pd.DataFrame({'Start': intervals.starts, 'End': intervals.ends, 'Duration': intervals.durations})
+    for name, values in columns.items():
+        table[name] = values
+    return table
+
+def _arrays(ts):
+    time = ts['Time'].values.astype(float)
+    values = pd.to_numeric(ts['Message'], errors='coerce').values.astype(float)
+    if not np.all(np.diff(time) >= 0):
+        order = np.argsort(time, kind='stable')
+        time, values = time[order], values[order]
+    return time, values
+
+def hard_brake(accelx, threshold = -3.0, release = -1.5, min_duration = 0.3, debounce = 0.5):
+    """
+    Hard braking events: longitudinal acceleration falls to `threshold` and stays below `release`.
+
+    Parameters
+    -------------
+    accelx: `pandas.DataFrame`
+        Longitudinal acceleration timeseries in m/s^2, e.g. from `strymread.accelx()`
+
+    threshold: `double`, default=-3.0
+        Acceleration at which braking counts as hard
+
+    release: `double`, default=-1.5
+        Acceleration above which the event ends
+
+    min_duration: `double`, default=0.3
+        Minimum duration of an event in seconds
+
+    debounce: `double`, default=0.5
+        Events separated by at most this many seconds are merged
+
+    Returns
+    ----------
+    `pandas.DataFrame`
+        Interval table with Start, End, Duration and Peak (lowest acceleration) columns
+    """
+    time, values = _arrays(accelx)
+    intervals = detect_intervals(time, hysteresis(values, threshold, release), min_duration, debounce)
+    if len(intervals) == 0:
+        return interval_table(intervals, Peak=[])
+    return interval_table(intervals, Peak=_reduce_in(intervals, time, np.where(np.isnan(values), np.inf, values), np.minimum))
+
+def cut_in(lead_distance, min_drop = 5.0, max_interval = 0.5, no_lead = 252.0, max_appear = 25.0, debounce = 1.0):
+    """
+    Cut-ins of another vehicle in front: lead distance drops by at least `min_drop` meters between two samples,
+    or a lead vehicle appears closer than `max_appear` meters right after a sample without lead vehicle.
+
+    Parameters
+    -------------
+    lead_distance: `pandas.DataFrame`
+        Lead distance timeseries in meters, e.g. from `strymread.lead_distance()`
+
+    min_drop: `double`, default=5.0
+        Minimum drop of lead distance between two consecutive samples
+
+    max_interval: `double`, default=0.5
+        Consecutive samples further apart than this many seconds (a dropout) are not compared
+
+    no_lead: `double`, default=252.0
+        Lead distance reported when there is no lead vehicle. Samples at or above this value have no lead vehicle.
+
+    max_appear: `double`, default=25.0
+        A lead vehicle appearing closer than this many meters is a cut-in. Lead vehicles appearing further away,
+        e.g. when catching up with traffic ahead, are not.
+
+    debounce: `double`, default=1.0
+        Drops separated by at most this many seconds are merged into one cut-in
+
+    Returns
+    ----------
+    `pandas.DataFrame`
+        Interval table with Start, End, Duration, Before (lead distance before the cut-in) and After (lead distance after) columns
+    """
+    time, values = _arrays(lead_distance)
+    lead = values < no_lead
+    absent = values >= no_lead
+    closer = lead[:-1] & (values[:-1] - values[1:] >= min_drop)
+    appeared = absent[:-1] & (values[1:] < max_appear)
+    drop = np.zeros(time.shape[0], dtype=bool)
+    drop[1:] = lead[1:] & (closer | appeared) & (np.diff(time) <= max_interval)
+
+    # each drop spans from the sample before it to the sample after it
+    index = np.flatnonzero(drop)
+    intervals = IntervalSet(time[index - 1], time[index]).fill_gaps(debounce)
+    first = np.searchsorted(time, intervals.starts, side='left')
+    last = np.searchsorted(time, intervals.ends, side='left')
+    return interval_table(intervals, Before=values[first], After=values[last])
+
+def stop_and_go(speed, stop_speed = 1.0, go_speed = 5.0, min_stop = 1.0, max_go = 60.0, min_stops = 2):
+    """
+    Stop-and-go episodes: at least `min_stops` stops, each separated from the next by at most `max_go` seconds of driving.
+
+    Parameters
+    -------------
+    speed: `pandas.DataFrame`
+        Speed timeseries in km/h, e.g. from `strymread.speed()`
+
+    stop_speed: `double`, default=1.0
+        Speed at or below which the vehicle is stopped
+
+    go_speed: `double`, default=5.0
+        Speed at or above which the vehicle is moving again
+
+    min_stop: `double`, default=1.0
+        Minimum duration of a stop in seconds
+
+    max_go: `double`, default=60.0
+        Maximum time in seconds between two stops of the same episode
+
+    min_stops: `int`, default=2
+        Minimum number of stops in an episode
+
+    Returns
+    ----------
+    `pandas.DataFrame`
+        Interval table with Start, End, Duration and Stops columns
+    """
+    time, values = _arrays(speed)
+    stops = detect_intervals(time, hysteresis(values, stop_speed, go_speed), min_duration = min_stop)
+    episodes = stops.fill_gaps(max_go)
+    counts = np.searchsorted(stops.starts, episodes.ends, side='right') - np.searchsorted(stops.starts, episodes.starts, side='left')
+    keep = counts >= min_stops
+    return interval_table(IntervalSet(episodes.starts[keep], episodes.ends[keep]), Stops=counts[keep])
+
+def acc_engagement(acc_state, engaged_states = (6, 10, 11), min_duration = 0.0, debounce = 0.0):
+    """
+    Engagements of adaptive cruise control: from engaging to disengaging.
+
+    Parameters
+    -------------
+    acc_state: `pandas.DataFrame`
+        Cruise control state timeseries, e.g. from `strymread.acc_state()`
+
+    engaged_states: `tuple`, default=(6, 10, 11)
+        States in which ACC is engaged: "enabled": 6, "hold_waiting_user_cmd": 10, "hold": 11
+
+    min_duration: `double`, default=0.0
+        Minimum duration of an engagement in seconds
+
+    debounce: `double`, default=0.0
+        Engagements separated by at most this many seconds are merged
+
+    Returns
+    ----------
+    `pandas.DataFrame`
+        Interval table with Start (engage), End (last engaged sample), Duration and Reason columns, where
+        Reason is the state right after disengaging, e.g. 2 for disabled or 5 for faulted, and NaN if the drive ends engaged.
+    """
+    time, values = _arrays(acc_state)
+    engaged = np.isin(values, engaged_states)
+    intervals = detect_intervals(time, engaged, min_duration, debounce)
+
+    # state of the sample right after each engagement
+    following = np.searchsorted(time, intervals.ends, side='right')
+    reason = np.where(following < time.shape[0], values[np.minimum(following, time.shape[0] - 1)], np.nan)
+    return interval_table(intervals, Reason=reason)
+
+DETECTORS = {'hard_brake': (hard_brake, 'accelx'), 'cut_in': (cut_in, 'lead_distance'),
+             'stop_and_go': (stop_and_go, 'speed'), 'acc_engagement': (acc_engagement, 'acc_state')}
+
+def detect(r, detectors = None, **kwargs):
+    """
+    Run event detectors on a drive
+
+    Parameters
+    -------------
+    r: `strymread`
+        Drive to run the detectors on
+
+    detectors: `list`
+        Names of detectors among "hard_brake", "cut_in", "stop_and_go" and "acc_engagement". By default, all of them.
+
+    kwargs: variable list of argument in the dictionary format
+        Options of each detector as a dictionary keyed by detector name, e.g. `hard_brake={'threshold': -4.0}`
+
+    Returns
+    ----------
+    `pandas.DataFrame`
+        Interval table of all events with Event, Start, End and Duration columns, sorted by Start, along with
+        the columns specific to each detector
+    """
+    if detectors is None:
+        detectors = list(DETECTORS.keys())
+
+    tables = []
+    for name in detectors:
+        if name not in DETECTORS:
+            raise ValueError("Unknown event detector '{}'. Available detectors are {}".format(name, list(DETECTORS.keys())))
+        detector, topic = DETECTORS[name]
+        ts = getattr(r, topic)()
+        if ts.shape[0] == 0:
+            continue
+        table = detector(ts, **kwargs.get(name, {}))
+        table.insert(0, 'Event', name)
+        tables.append(table)
+
+    if len(tables) == 0:
+        return pd.DataFrame(columns=['Event', 'Start', 'End', 'Duration'])
+    return pd.concat(tables, ignore_index=True).sort_values(by='Start', kind='stable').reset_index(drop=True)
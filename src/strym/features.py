@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Rolling-window features over irregularly sampled timeseries
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import numpy as np
+import pandas as pd
+
+STATISTICS = ['count', 'mean', 'std', 'min', 'max', 'median']
+
+def window_bounds(timepoints, windows):
+    """
+    First index of each time-based window (t - w, t] ending at every time point, for every window length.
+
+    Parameters
+    -------------
+    timepoints: `numpy.ndarray`
+        Sorted time points in seconds
+
+    windows: `list`
+        Window lengths in seconds
+
+    Returns
+    ----------
+    `numpy.ndarray`
+        Array of shape (number of windows, number of time points) with the index of the first sample in each window
+    """
+    windows = np.asarray(windows, dtype=float)
+    starts = timepoints[np.newaxis, :] - windows[:, np.newaxis]
+    return np.searchsorted(timepoints, starts.ravel(), side='right').reshape(starts.shape)
+
+class SparseTable:
+    """
+    Sparse table for minimum or maximum over any range of an array, built once in O(n log n) and
+    queried for all ranges at once. It plays the role of a monotone deque for windows of varying length,
+    without a Python loop.
+    """
+    def __init__(self, values, reduce, max_length):
+        self.reduce = reduce
+        levels = [values]
+        length = 1
+        while 2*length <= max_length:
+            previous = levels[-1]
+            levels.append(reduce(previous[:-length], previous[length:]))
+            length *= 2
+        # levels are padded to the same length, padding is never reached by a query
+        self.table = np.full((len(levels), values.shape[0]), values[0] if values.shape[0] > 0 else np.nan)
+        for k, level in enumerate(levels):
+            self.table[k, :level.shape[0]] = level
+
+    def query(self, left, right):
+        """
+        Reduction over the ranges [left, right] (inclusive) given as index arrays. Empty ranges give NaN.
+        """
+        length = right - left + 1
+        empty = length <= 0
+        level = np.floor(np.log2(np.where(empty, 1, length))).astype(int)
+        start = np.where(empty, 0, left)
+        end = np.where(empty, 0, right - (1 << level) + 1)
+        result = self.reduce(self.table[level, start], self.table[level, end])
+        return np.where(empty, np.nan, result)
+
+def _percentile(statistic):
+    if statistic == 'median':
+        return 50.0
+    if statistic.startswith('p'):
+        try:
+            return float(statistic[1:])
+        except ValueError:
+            pass
+    return None
+
+def rolling(timepoints, values, windows, statistics = ('mean', 'std', 'min', 'max'), ddof = 1):
+    """
+    Rolling statistics of a timeseries over time-based windows (t - w, t] ending at every sample, for many
+    window lengths in one pass.
+
+    Mean and standard deviation come from prefix sums, minimum and maximum from one sparse table shared by all
+    window lengths, and percentiles from pandas' time-based rolling quantile. NaN values are ignored.
+
+    Parameters
+    -------------
+    timepoints: `numpy.ndarray`
+        Sorted time points in seconds (irregular sampling is fine)
+
+    values: `numpy.ndarray`
+        Values of the timeseries
+
+    windows: `list`
+        Window lengths in seconds
+
+    statistics: `list`
+        Any of "count", "mean", "std", "min", "max", "median" and "pNN" for the NN-th percentile, e.g. "p95"
+
+    ddof: `int`, default=1
+        Delta degrees of freedom of the standard deviation, as in pandas
+
+    Returns
+    ----------
+    `numpy.ndarray`, `list`
+        Matrix of shape (number of samples, number of windows x number of statistics) and its column names
+        such as "mean_2s", ordered by window and then by statistic
+    """
+    timepoints = np.asarray(timepoints, dtype=float)
+    values = np.asarray(values, dtype=float)
+    windows = list(windows)
+    for statistic in statistics:
+        if statistic not in STATISTICS and _percentile(statistic) is None:
+            raise ValueError("Unknown statistic '{}'. Available statistics are {} and pNN for percentiles".format(statistic, STATISTICS))
+
+    n = timepoints.shape[0]
+    left = window_bounds(timepoints, windows)
+    right = np.arange(n)
+
+    valid = ~np.isnan(values)
+    counts_prefix = np.concatenate(([0], np.cumsum(valid)))
+    counts = counts_prefix[right + 1][np.newaxis, :] - counts_prefix[left]
+
+    if any(statistic in ['mean', 'std'] for statistic in statistics):
+        # values are shifted by their mean to limit cancellation in the sum of squares
+        shift = np.nanmean(values) if valid.any() else 0.0
+        centered = np.where(valid, values - shift, 0.0)
+        sum_prefix = np.concatenate(([0.0], np.cumsum(centered)))
+        square_prefix = np.concatenate(([0.0], np.cumsum(centered*centered)))
+        sums = sum_prefix[right + 1][np.newaxis, :] - sum_prefix[left]
+        squares = square_prefix[right + 1][np.newaxis, :] - square_prefix[left]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums/counts, np.nan)
+            variances = (squares - sums*means)/(counts - ddof)
+        variances = np.where(counts - ddof > 0, np.clip(variances, 0.0, None), np.nan)
+        means = means + shift
+
+    tables = {}
+    max_length = int((right[np.newaxis, :] - left + 1).max()) if n > 0 else 1
+    if 'min' in statistics:
+        tables['min'] = SparseTable(np.where(valid, values, np.inf), np.minimum, max_length)
+    if 'max' in statistics:
+        tables['max'] = SparseTable(np.where(valid, values, -np.inf), np.maximum, max_length)
+
+    if any(_percentile(statistic) is not None for statistic in statistics):
+        series = pd.Series(values, index=pd.to_datetime(timepoints, unit='s'))
+
+    columns = []
+    matrix = np.empty((n, len(windows)*len(statistics)))
+    for i, window in enumerate(windows):
+        for j, statistic in enumerate(statistics):
+            column = i*len(statistics) + j
+            if statistic == 'count':
+                matrix[:, column] = counts[i]
+            elif statistic == 'mean':
+                matrix[:, column] = means[i]
+            elif statistic == 'std':
+                matrix[:, column] = np.sqrt(variances[i])
+            elif statistic in tables:
+                result = tables[statistic].query(left[i], right)
+                matrix[:, column] = np.where(counts[i] > 0, result, np.nan)
+            else:
+                rolling_window = series.rolling(pd.Timedelta(seconds=window), min_periods=1)
+                matrix[:, column] = rolling_window.quantile(_percentile(statistic)/100.0).values
+            columns.append("{}_{:g}s".format(statistic, window))
+
+    return matrix, columns
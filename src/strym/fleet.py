@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Queries of topics across drives stored in SQLite databases of raw CAN frames
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import os
+import glob
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+import cantools
+import numpy as np
+import pandas as pd
+
+from . import condition
+from . import rawdb
+from .strymread import strymread, dbc_resource
+
+def _seconds(value):
+    # Time bounds in seconds, or dates and times such as "2020-03-01" (UTC)
+    if value is None or isinstance(value, (int, float, np.number)):
+        return value
+    return pd.Timestamp(value).timestamp()
+
+def _databases(databases):
+    # Databases given as paths, or directories of databases such as ~/.strym/
+    if isinstance(databases, str):
+        databases = [databases]
+
+    paths = []
+    for database in databases:
+        database = os.path.expanduser(database)
+        if os.path.isdir(database):
+            paths += sorted(glob.glob(os.path.join(database, '*.db')))
+        else:
+            paths.append(database)
+    return paths
+
+def drives(databases, vin = None, time = None):
+    """
+    Lists the drives of SQLite databases of raw CAN frames (see `strymread.load_db`) that match VINs and overlap a time range.
+    Only the `DRIVES` table of each database is read.
+
+    Parameters
+    -------------
+    databases: `str` | `list`
+        Paths of databases, or directories whose `.db` files are all used, e.g. `~/.strym/`
+
+    vin: `str` | `list`, default=None
+        Vehicle identification number(s). All drives are listed if None.
+
+    time: `tuple`, default=None
+        Time range (t0, t1), bounds in seconds or as dates and times, e.g. `("2020-03-01", "2020-04-01")` (UTC).
+        Either bound can be None.
+
+    Returns
+    -----------
+    `pandas.DataFrame`
+        One row per drive with columns Database, Name, VIN, StartTime, EndTime and Frames
+    """
+    vins = None if vin is None else list(np.atleast_1d(vin))
+    t0, t1 = (None, None) if time is None else (_seconds(time[0]), _seconds(time[1]))
+
+    rows = []
+    for database in _databases(databases):
+        connection = sqlite3.connect(database)
+        try:
+            tables = [t[0] for t in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table';")]
+            if rawdb.DRIVES_TABLE not in tables:
+                continue
+
+            query = 'SELECT Name, VIN, StartTime, EndTime, Frames FROM {} WHERE 1'.format(rawdb.DRIVES_TABLE)
+            parameters = []
+            if vins is not None:
+                query += ' AND VIN IN ({})'.format(','.join('?'*len(vins)))
+                parameters += vins
+            if t0 is not None:
+                query += ' AND EndTime >= ?'
+                parameters.append(t0)
+            if t1 is not None:
+                query += ' AND StartTime <= ?'
+                parameters.append(t1)
+
+            rows += [(database,) + row for row in connection.execute(query, parameters)]
+        finally:
+            connection.close()
+
+    return pd.DataFrame(rows, columns = ['Database', 'Name', 'VIN', 'StartTime', 'EndTime', 'Frames'])
+
+def query(databases, topics, vin = None, time = None, where = None, dbcfile = "", **kwargs):
+    """
+    Reads topics across drives stored in SQLite databases of raw CAN frames (see `strymread.load_db`),
+    optionally restricted to the times a condition holds, e.g. all speed samples where cruise control was on,
+    for a VIN, in March.
+
+    Selection is pushed down to the databases: drives are selected by VIN and time from the `DRIVES` table
+    (see `drives`), and only the frames of the messages needed by `topics` and `where` within `time` are read, with indexed
+    queries (see `strymread.from_db`). Messages are resolved from the DBC file and topic map of each vehicle (see
+    `strymread.dbc_message_ids`) without reading any frames. Drives of vehicles whose DBC file is not available are skipped
+    with a message. Drives are decoded in parallel worker processes.
+
+    Parameters
+    -------------
+    databases: `str` | `list`
+        Paths of databases, or directories whose `.db` files are all used, e.g. `~/.strym/`
+
+    topics: `str` | `list`
+        Topic names (see `strymread.topic2msgs`), `acc_state`, operands of conditions or signals specified as `ID.SIGNAL.Message`
+
+    vin: `str` | `list`, default=None
+        Vehicle identification number(s). All drives are read if None.
+
+    time: `tuple`, default=None
+        Time range (t0, t1), bounds in seconds or as dates and times, e.g. `("2020-03-01", "2020-04-01")` (UTC).
+        Either bound can be None.
+
+    where: `str`, default=None
+        Condition samples must satisfy, in the syntax of `strymread.msg_subset`, e.g. "cruise control on" or "speed > 20"
+
+    dbcfile: `str`, default=""
+        The DBC file. If empty, it is inferred from the VIN of each drive.
+
+    kwargs: variable list of argument in the dictionary format
+
+    workers: `int`, default = 1
+        Number of worker processes reading drives. By default, drives are read one after the other in the calling process.
+        Scripts that use more than one worker need an `if __name__ == '__main__'` guard on platforms that spawn processes.
+
+    verbose: `bool`, default = False
+        Passed to each `strymread` object
+
+    Returns
+    -----------
+    `dict`
+        A dictionary of `pandas.DataFrame` keyed by topic, with columns Time, Message, vin and drive,
+        sorted by drive and time
+
+    Example
+    ----------
+    >>> from strym import fleet
+    >>> speed = fleet.query('~/.strym/', 'speed', vin='2T3MWRFVXLW056972', time=('2020-03-01', '2020-04-01'), where='cruise control on')['speed']
+    """
+    if isinstance(topics, str):
+        topics = [topics]
+    topics = [condition.normalize_operand(topic) for topic in topics]
+
+    t0, t1 = (None, None) if time is None else (_seconds(time[0]), _seconds(time[1]))
+    node = None if where is None else condition.compile_condition(where)
+    operands = sorted(set(topics) | (set() if node is None else node.operands()))
+    workers = kwargs.get("workers", 1)
+    verbose = kwargs.get("verbose", False)
+
+    selected = drives(databases, vin, (t0, t1))
+
+    # Messages to read, from the DBC file and topic map of each vehicle, without reading any frames
+    topic_map = strymread.topic_map()
+    dbcfiles = {}
+    message_ids = {}
+    for drive_vin in selected['VIN'].unique():
+        _, inferred_dbc = strymread.infer_dbc(drive_vin)
+        vehicle_dbcfile = dbcfile or os.path.join(str(dbc_resource), inferred_dbc)
+        if not os.path.exists(vehicle_dbcfile):
+            print("The dbcfile: {} doesn't exist, or read permission error. Drives of VIN {} are skipped.".format(vehicle_dbcfile, drive_vin))
+            continue
+        if inferred_dbc not in topic_map:
+            print("No topics are known for {}. Drives of VIN {} are skipped.".format(inferred_dbc, drive_vin))
+            continue
+        dbcfiles[drive_vin] = vehicle_dbcfile
+        message_ids[drive_vin] = strymread.dbc_message_ids(operands, cantools.database.load_file(vehicle_dbcfile), topic_map[inferred_dbc])
+
+    units = [(row.Database, row.Name, row.VIN, (t0, t1), message_ids[row.VIN], dbcfiles[row.VIN], topics, where, verbose)
+             for row in selected.itertuples() if row.VIN in message_ids]
+
+    # With more than one worker, drives are decoded in worker processes, since decoding holds the GIL
+    if workers > 1 and len(units) > 1:
+        with ProcessPoolExecutor(max_workers = min(workers, len(units))) as executor:
+            scanned = list(executor.map(_scan, *zip(*units)))
+    else:
+        scanned = [_scan(*unit) for unit in units]
+
+    data = {}
+    for topic in topics:
+        parts = [(unit, result[topic]) for unit, result in zip(units, scanned) if result is not None]
+        data[topic] = pd.DataFrame({'Time': np.concatenate([[]] + [t for _, (t, _) in parts]).astype(float),
+                                    'Message': np.concatenate([[]] + [v for _, (_, v) in parts]).astype(float),
+                                    'vin': np.concatenate([np.array([], dtype=object)] + [np.full(t.shape[0], unit[2], dtype=object) for unit, (t, _) in parts]),
+                                    'drive': np.concatenate([np.array([], dtype=object)] + [np.full(t.shape[0], unit[1], dtype=object) for unit, (t, _) in parts])})
+
+    return data
+
+def _scan(database, name, vin, time, message_ids, dbcfile, topics, where, verbose):
+    # Reads the topics of a drive where the condition holds, as arrays (time, values) by topic. Runs in a worker process.
+    r = strymread.from_db(database, drives = [name], time = time, message_ids = message_ids, dbcfile = dbcfile, vin = vin, verbose = verbose)
+    if not r.success:
+        return None
+
+    selection = None if where is None else r._condition_intervals(where)
+    result = {}
+    for topic in topics:
+        timepoints, values = r._condition_series(topic)
+        if selection is not None:
+            keep = selection.contains(timepoints)
+            timepoints, values = timepoints[keep], values[keep]
+        result[topic] = (timepoints, values)
+    return result
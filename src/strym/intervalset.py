@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Interval-set algebra on time slices
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import numpy as np
+import pandas as pd
+
+class IntervalSet:
+    """
+    `IntervalSet` is a set of disjoint, closed time intervals `[start, end]`, stored as two sorted numpy arrays.
+    Overlapping or touching intervals are merged on construction, so the same time is never covered twice.
+    All set operations are vectorized.
+
+    Parameters
+    ----------------
+    starts: `numpy.ndarray` | `list`
+        Start times of intervals in seconds
+
+    ends: `numpy.ndarray` | `list`
+        End times of intervals in seconds
+
+    Attributes
+    ---------------
+    starts: `numpy.ndarray`
+        Sorted start times of disjoint intervals
+
+    ends: `numpy.ndarray`
+        Sorted end times of disjoint intervals
+
+    Example
+    ----------------
+    >>> from strym import IntervalSet
+    >>> a = IntervalSet([0.0, 10.0], [5.0, 20.0])
+    >>> b = IntervalSet([3.0], [12.0])
+    >>> (a & b).to_tuples()
+    [(3.0, 5.0), (10.0, 12.0)]
+    """
+
+    def __init__(self, starts = (), ends = ()):
+        starts = np.asarray(starts, dtype=float).ravel()
+        ends = np.asarray(ends, dtype=float).ravel()
+
+        if starts.shape != ends.shape:
+            raise ValueError("starts and ends of intervals must have the same length")
+
+        self.starts, self.ends = IntervalSet._normalize(starts, ends)
+
+    @staticmethod
+    def _normalize(starts, ends):
+        """
+        Sort intervals, drop empty ones and merge those that overlap or touch
+        """
+        keep = ends >= starts
+        starts = starts[keep]
+        ends = ends[keep]
+        if starts.shape[0] == 0:
+            return starts, ends
+
+        order = np.argsort(starts, kind='stable')
+        starts = starts[order]
+        ends = ends[order]
+
+        # An interval starts a new group if it begins after every previous interval has ended
+        running_end = np.maximum.accumulate(ends)
+        first = np.flatnonzero(np.concatenate(([True], starts[1:] > running_end[:-1])))
+        return starts[first], np.maximum.reduceat(ends, first)
+
+    @classmethod
+    def from_mask(cls, time, mask):
+        """
+        Create an `IntervalSet` from runs of True in a boolean `mask` sampled at `time`.
+        Each interval spans from the first to the last time point of a run.
+
+        Parameters
+        -------------
+        time: `numpy.ndarray`
+            Sorted time points in seconds
+
+        mask: `numpy.ndarray`
+            Boolean array of the same length as `time`
+        """
+        time = np.asarray(time, dtype=float)
+        edges = np.diff(np.concatenate(([False], np.asarray(mask, dtype=bool), [False])).astype(np.int8))
+        return cls(time[np.flatnonzero(edges == 1)], time[np.flatnonzero(edges == -1) - 1])
+
+    @classmethod
+    def from_tuples(cls, tuples):
+        """
+        Create an `IntervalSet` from a list of tuples `[(t0, t1), (t2, t3), ...]`
+        """
+        if len(tuples) == 0:
+            return cls()
+        starts, ends = zip(*tuples)
+        return cls(starts, ends)
+
+    def __len__(self):
+        return self.starts.shape[0]
+
+    def __iter__(self):
+        return iter(self.to_tuples())
+
+    def __repr__(self):
+        return "IntervalSet({})".format(self.to_tuples())
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(self.ends, other.ends)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    @property
+    def durations(self):
+        """
+        Duration of each interval in seconds
+        """
+        return self.ends - self.starts
+
+    def total_duration(self):
+        """
+        Total time in seconds covered by the set
+        """
+        return float(np.sum(self.durations))
+
+    def to_tuples(self):
+        """
+        Intervals as a list of tuples `[(t0, t1), (t2, t3), ...]`
+        """
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def to_timestamps(self):
+        """
+        Intervals as a list of tuples of `pandas.Timestamp`, compatible with the `Clock` index of `strymread` dataframes
+        """
+        return list(zip(pd.to_datetime(self.starts, unit='s'), pd.to_datetime(self.ends, unit='s')))
+
+    def union(self, *others):
+        """
+        Union of this set with one or more interval sets
+        """
+        starts = np.concatenate([self.starts] + [o.starts for o in others])
+        ends = np.concatenate([self.ends] + [o.ends for o in others])
+        return IntervalSet(starts, ends)
+
+    def intersection(self, other):
+        """
+        Intersection of two interval sets, computed by a single sweep over sorted interval boundaries
+        """
+        if len(self) == 0 or len(other) == 0:
+            return IntervalSet()
+
+        times = np.concatenate((self.starts, other.starts, self.ends, other.ends))
+        delta = np.concatenate((np.ones(len(self) + len(other), dtype=np.int8), -np.ones(len(self) + len(other), dtype=np.int8)))
+
+        # At equal times, starts are processed before ends so that touching intervals intersect in a point
+        order = np.lexsort((-delta, times))
+        times = times[order]
+        coverage = np.cumsum(delta[order])
+
+        # Both sets are disjoint within themselves, so coverage of 2 is always followed by an end
+        both = np.flatnonzero(coverage == 2)
+        return IntervalSet(times[both], times[both + 1])
+
+    def complement(self, start = -np.inf, end = np.inf):
+        """
+        Complement of the set within `[start, end]`
+        """
+        gaps = IntervalSet(np.concatenate(([-np.inf], self.ends)), np.concatenate((self.starts, [np.inf])))
+        return gaps.intersection(IntervalSet([start], [end]))._drop_points_in(self)
+
+    def _drop_points_in(self, other):
+        """
+        Drop zero-length intervals lying in `other`. Such points are artifacts of shared boundaries of closed intervals.
+        """
+        degenerate = (self.durations == 0.0) & other.contains(self.starts)
+        return IntervalSet(self.starts[~degenerate], self.ends[~degenerate])
+
+    def difference(self, other):
+        """
+        Time covered by this set but not by `other`. Points shared only by boundaries of both sets are dropped.
+        """
+        return self.intersection(other.complement())._drop_points_in(other)
+
+    def dilate(self, before, after = None):
+        """
+        Extend every interval by `before` seconds at its start and `after` seconds at its end.
+        Negative values shrink intervals, intervals that vanish are dropped.
+
+        Parameters
+        -------------
+        before: `double`
+            Seconds to add before each interval
+
+        after: `double`, default = None
+            Seconds to add after each interval. Same as `before` if None
+        """
+        if after is None:
+            after = before
+        return IntervalSet(self.starts - before, self.ends + after)
+
+    def min_duration(self, duration):
+        """
+        Keep only intervals lasting at least `duration` seconds
+        """
+        keep = self.durations >= duration
+        return IntervalSet(self.starts[keep], self.ends[keep])
+
+    def fill_gaps(self, max_gap):
+        """
+        Merge consecutive intervals separated by a gap of at most `max_gap` seconds, e.g. to debounce events
+        """
+        if len(self) == 0:
+            return IntervalSet()
+        separate = (self.starts[1:] - self.ends[:-1]) > max_gap
+        return IntervalSet(self.starts[np.concatenate(([True], separate))], self.ends[np.concatenate((separate, [True]))])
+
+    def clip(self, start, end):
+        """
+        Restrict the set to `[start, end]`
+        """
+        return self.intersection(IntervalSet([start], [end]))
+
+    def contains(self, time):
+        """
+        Boolean array telling for each time point whether it lies within one of the intervals
+
+        Parameters
+        -------------
+        time: `numpy.ndarray`
+            Time points in seconds
+        """
+        time = np.asarray(time, dtype=float)
+        location = np.searchsorted(self.starts, time, side='right') - 1
+        inside = location >= 0
+        inside[inside] = time[inside] <= self.ends[location[inside]]
+        return inside
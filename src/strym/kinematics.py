@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Vectorized and streaming dead-reckoning of vehicle trajectory from speed and heading
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import numpy as np
+from scipy import integrate
+
+# kph to meter per second
+KPH_TO_MPS = 1000.0/3600.0
+
+INTEGRATION_METHODS = ['euler', 'trapezoid', 'simpson']
+
+def velocity(speed, heading):
+    """
+    Velocity components in m/s from speed in km/h and heading in degrees.
+    `heading` may have an extra trailing axis for a batch of initial headings.
+    """
+    speed = np.asarray(speed, dtype=float)
+    heading = np.deg2rad(heading)
+    if heading.ndim > speed.ndim:
+        speed = speed[..., np.newaxis]
+    return speed*np.cos(heading)*KPH_TO_MPS, speed*np.sin(heading)*KPH_TO_MPS
+
+def _cumulative(v, dt, method):
+    """
+    Displacement at every sample from velocity `v` sampled every `dt` seconds, starting from zero before the first sample.
+    The first step is always an Euler step, as there is no earlier velocity sample.
+    """
+    first = v[:1]*dt
+    if method == 'euler':
+        steps = np.cumsum(v*dt, axis=0)
+    elif method == 'trapezoid':
+        steps = first + integrate.cumulative_trapezoid(v, dx=dt, axis=0, initial=0)
+    elif method == 'simpson':
+        if v.shape[0] < 3:
+            steps = first + integrate.cumulative_trapezoid(v, dx=dt, axis=0, initial=0)
+        else:
+            steps = first + integrate.cumulative_simpson(v, dx=dt, axis=0, initial=0)
+    else:
+        raise ValueError("Unknown integration method '{}'. Available methods are {}".format(method, INTEGRATION_METHODS))
+    return np.concatenate((np.zeros_like(v[:1]), steps), axis=0)
+
+def dead_reckoning(speed, heading, dt, x_init = 0.0, y_init = 0.0, heading_init = 0.0, method = 'euler'):
+    """
+    Integrate position from uniformly sampled speed and heading with cumulative sums.
+
+    With `method="euler"`, `X[i+1] = X[i] + Vx[i]*dt` as in the original MATLAB code of `strymread.trajectory`.
+
+    Parameters
+    -------------
+    speed: `numpy.ndarray`
+        Speed in km/h sampled every `dt` seconds
+
+    heading: `numpy.ndarray`
+        Heading in degrees at the same time points as `speed`
+
+    dt: `double`
+        Sampling interval in seconds
+
+    x_init, y_init, heading_init: `double` | `numpy.ndarray`
+        Initial position and heading (in degrees, added to `heading`). If any of them is an array,
+        a batch of trajectories is computed, one for each initial condition.
+
+    method: `str`
+        Integration method: "euler", "trapezoid" or "simpson"
+
+    Returns
+    ----------
+    `numpy.ndarray` x 4
+        X, Y, Vx, Vy with one more row than `speed`: the initial condition (with zero velocity) followed by one row
+        per sample. For a batch, each array has a second axis over initial conditions.
+    """
+    x_init, y_init, heading_init = np.broadcast_arrays(np.asarray(x_init, dtype=float),
+        np.asarray(y_init, dtype=float), np.asarray(heading_init, dtype=float))
+
+    heading = np.asarray(heading, dtype=float)
+    if heading_init.ndim > 0:
+        heading = heading[:, np.newaxis] + heading_init
+    else:
+        heading = heading + heading_init
+
+    vx, vy = velocity(speed, heading)
+    X = x_init + _cumulative(vx, dt, method)
+    Y = y_init + _cumulative(vy, dt, method)
+
+    Vx = np.concatenate((np.zeros_like(vx[:1]), vx), axis=0)
+    Vy = np.concatenate((np.zeros_like(vy[:1]), vy), axis=0)
+    return X, Y, Vx, Vy
+
+class TrajectoryIntegrator:
+    """
+    `TrajectoryIntegrator` extends a dead-reckoning trajectory as new speed and heading samples arrive, carrying
+    the last position and velocity over between updates. Concatenated updates give the same trajectory as
+    `dead_reckoning` over the whole data with "euler" or "trapezoid" method.
+
+    Parameters
+    -------------
+    dt: `double`
+        Sampling interval of speed and heading in seconds
+
+    x_init, y_init, heading_init: `double`
+        Initial position and heading in degrees
+
+    method: `str`
+        Integration method: "euler" or "trapezoid"
+
+    Example
+    ----------
+    >>> integrator = TrajectoryIntegrator(dt = 0.02)
+    >>> X, Y, Vx, Vy = integrator.update(speed_chunk, heading_chunk)
+    """
+    def __init__(self, dt, x_init = 0.0, y_init = 0.0, heading_init = 0.0, method = 'euler'):
+        if method not in ['euler', 'trapezoid']:
+            raise ValueError("Streaming integration supports 'euler' and 'trapezoid' methods only.")
+        self.dt = dt
+        self.method = method
+        self.heading_init = heading_init
+        self.x = float(x_init)
+        self.y = float(y_init)
+        self.vx = None
+        self.vy = None
+
+    def update(self, speed, heading):
+        """
+        Integrate a new chunk of speed (km/h) and heading (degrees) samples
+
+        Returns
+        ----------
+        `numpy.ndarray` x 4
+            X, Y, Vx, Vy at each of the new samples
+        """
+        vx, vy = velocity(speed, np.asarray(heading, dtype=float) + self.heading_init)
+        if vx.shape[0] == 0:
+            return vx, vy, vx, vy
+
+        if self.method == 'euler' or self.vx is None:
+            # Without earlier velocity, the first step is an Euler step
+            first_x, first_y = vx[0]*self.dt, vy[0]*self.dt
+        else:
+            first_x, first_y = (self.vx + vx[0])/2.0*self.dt, (self.vy + vy[0])/2.0*self.dt
+
+        if self.method == 'euler':
+            step_x, step_y = vx[1:]*self.dt, vy[1:]*self.dt
+        else:
+            step_x, step_y = (vx[1:] + vx[:-1])/2.0*self.dt, (vy[1:] + vy[:-1])/2.0*self.dt
+
+        X = self.x + np.cumsum(np.concatenate(([first_x], step_x)))
+        Y = self.y + np.cumsum(np.concatenate(([first_y], step_y)))
+
+        self.x, self.y = X[-1], Y[-1]
+        self.vx, self.vy = vx[-1], vy[-1]
+        return X, Y, vx, vy
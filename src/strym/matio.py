@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Incremental writing of MATLAB MAT files, one variable at a time
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import time
+import platform
+import numpy as np
+import pandas as pd
+import scipy.io as sio
+
+# MATLAB class of numpy data types
+MATLAB_CLASSES = {np.dtype(np.float64): 'double', np.dtype(np.float32): 'single',
+                  np.dtype(np.int8): 'int8', np.dtype(np.uint8): 'uint8',
+                  np.dtype(np.int16): 'int16', np.dtype(np.uint16): 'uint16',
+                  np.dtype(np.int32): 'int32', np.dtype(np.uint32): 'uint32',
+                  np.dtype(np.int64): 'int64', np.dtype(np.uint64): 'uint64'}
+
+class MatWriter:
+    """
+    `MatWriter` writes a MATLAB MAT file one variable at a time, so that variables already written
+    need not be held in memory. A file written variable by variable loads in MATLAB and `scipy.io.loadmat`
+    exactly as a file written with a single `scipy.io.savemat` call on all variables.
+
+    Parameters
+    -------------
+    matfile: `str`
+        Name of the MAT file to write. An existing file is overwritten.
+
+    version: `str`, default="5"
+        MAT file version. "5" writes a MAT v5 file with `scipy.io.savemat`, readable by all MATLAB versions
+        and by `scipy.io.loadmat`, in which a variable is limited to 2 GB.
+        "7.3" writes an HDF5-based MAT v7.3 file where numerical arrays are stored as chunked, compressed datasets,
+        readable by MATLAB 7.3 or later and by HDF5 readers. Requires `h5py`. Object arrays are written as
+        numerical arrays, with named values (such as value choices of DBC signals) replaced by their numerical values.
+
+    Example
+    ----------
+    >>> with MatWriter('drive.mat') as writer:
+    >>>     writer.write('speed', r.speed().to_numpy())
+    >>>     writer.write('yaw_rate', r.yaw_rate().to_numpy())
+
+    """
+    def __init__(self, matfile, version = "5"):
+        if version not in ["5", "7.3"]:
+            raise ValueError("Unsupported MAT file version {}. Use '5' or '7.3'.".format(version))
+
+        self.matfile = matfile
+        self.version = version
+
+        if version == "7.3":
+            try:
+                import h5py
+            except ImportError:
+                print("Writing MAT v7.3 files requires h5py. Install it through `pip install h5py`.")
+                raise
+            # MAT v7.3 files are HDF5 files with the 128-byte MAT file header in a 512-byte user block
+            self._file = h5py.File(matfile, 'w', userblock_size=512, libver='earliest')
+        else:
+            self._file = open(matfile, 'wb')
+
+    def write(self, name, value):
+        """
+        Appends a variable to the MAT file
+
+        Parameters
+        -------------
+        name: `str`
+            Variable name
+
+        value: `numpy.ndarray`, `pandas.DataFrame`, `pandas.Series`, `str` or scalar
+            Value of the variable. One-dimensional arrays are written as row vectors.
+
+        """
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            value = value.to_numpy()
+
+        if self.version == "5":
+            # savemat writes the file header only at the start of the stream, and appends after it
+            sio.savemat(self._file, {name: value})
+        else:
+            self._write_hdf5(name, value)
+
+    def _write_hdf5(self, name, value):
+        if isinstance(value, str):
+            # MATLAB char arrays are UTF-16 code units
+            data = np.frombuffer(value.encode('utf-16-le'), dtype=np.uint16).reshape(1, -1)
+            matlab_class, int_decode = 'char', 2
+        else:
+            data = np.asarray(value)
+            if data.dtype == object:
+                # Cell arrays are not supported: named values, e.g. value choices of DBC signals, are written as numbers
+                try:
+                    data = np.vectorize(lambda x: float(getattr(x, 'value', x)), otypes=[np.float64])(data)
+                except (TypeError, ValueError):
+                    raise ValueError("Variable {} can not be written to a MAT v7.3 file: only numerical arrays and strings are supported.".format(name))
+            if data.dtype == bool:
+                data = data.astype(np.uint8)
+                matlab_class, int_decode = 'logical', 1
+            elif data.dtype in MATLAB_CLASSES:
+                matlab_class, int_decode = MATLAB_CLASSES[data.dtype], None
+            else:
+                data = data.astype(np.float64)
+                matlab_class, int_decode = 'double', None
+            data = np.atleast_2d(data)
+
+        if data.size == 0:
+            # Empty variables are stored as their dimensions
+            dataset = self._file.create_dataset(name, data=np.array(data.shape[::-1], dtype=np.uint64))
+            dataset.attrs['MATLAB_empty'] = np.uint8(1)
+        else:
+            # HDF5 is row-major and MATLAB column-major: store the transpose so that MATLAB sees the same shape
+            dataset = self._file.create_dataset(name, data=data.T, chunks=True, compression='gzip')
+
+        dataset.attrs['MATLAB_class'] = np.bytes_(matlab_class)
+        if int_decode is not None:
+            dataset.attrs['MATLAB_int_decode'] = np.int32(int_decode)
+
+    def close(self):
+        """
+        Completes and closes the MAT file
+        """
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+
+        if self.version == "7.3":
+            text = "MATLAB 7.3 MAT-file, Platform: {}, Created on: {} HDF5 schema 1.00 .".format(platform.system(), time.strftime('%a %b %d %H:%M:%S %Y'))
+            header = text.ljust(116).encode('ascii')[0:116] + b'\x00'*8 + b'\x00\x02' + b'IM'
+            with open(self.matfile, 'r+b') as f:
+                f.write(header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Compact SQLite storage of raw CAN frames with fast bulk loading
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import sqlite3
+import numpy as np
+import pandas as pd
+
+# Raw CAN frames of all drives: time in integer microseconds, payload as an integer
+FRAMES_TABLE = "CAN_FRAMES"
+
+# One row per drive loaded to the database
+DRIVES_TABLE = "DRIVES"
+
+SCHEMA = ['CREATE TABLE IF NOT EXISTS {} (DriveID INTEGER PRIMARY KEY, Name TEXT UNIQUE NOT NULL, VIN TEXT, \
+StartTime REAL, EndTime REAL, Frames INTEGER);'.format(DRIVES_TABLE),
+          'CREATE TABLE IF NOT EXISTS {} (DriveID INTEGER NOT NULL, TimeUs INTEGER NOT NULL, Bus INTEGER NOT NULL, \
+MessageID INTEGER NOT NULL, Length INTEGER NOT NULL, Payload INTEGER NOT NULL);'.format(FRAMES_TABLE)]
+
+# Indexes are created after the first load into an empty table, which is much faster than maintaining them while loading.
+# The unique index is the deduplication key of frames within a drive, also serving queries by message and time.
+KEY_INDEX = '{}_FRAME_KEY'.format(FRAMES_TABLE)
+INDEXES = ['CREATE UNIQUE INDEX IF NOT EXISTS {1} ON {0} (MessageID, TimeUs, Bus, Payload, DriveID);'.format(FRAMES_TABLE, KEY_INDEX),
+           'CREATE INDEX IF NOT EXISTS {0}_DRIVE ON {0} (DriveID, TimeUs);'.format(FRAMES_TABLE)]
+
+# Former deduplication key without DriveID, which dropped the frames of a drive already loaded under another name
+LEGACY_INDEXES = ['DROP INDEX IF EXISTS {}_KEY;'.format(FRAMES_TABLE)]
+
+def connect(db_location):
+    """
+    Opens a connection to the SQLite database at `db_location` in write-ahead logging mode, creating the
+    tables of raw CAN frames if needed.
+    """
+    connection = sqlite3.connect(db_location)
+    connection.execute('PRAGMA journal_mode=WAL;')
+    connection.execute('PRAGMA synchronous=NORMAL;')
+    for statement in SCHEMA + LEGACY_INDEXES:
+        connection.execute(statement)
+    connection.commit()
+    return connection
+
+def encode_payload(messages):
+    """
+    Converts hexadecimal payloads of up to 8 bytes into signed 64-bit integers (the bytes in big-endian order,
+    as in `int(message, 16)`, wrapped to the signed range). Longer payloads are kept as bytes.
+    """
+    raw = np.asarray(messages, dtype='S')
+    n = raw.shape[0]
+    width = raw.dtype.itemsize
+
+    if n > 0 and width > 16:
+        return np.array([(int(m, 16) if m else 0) - (1 << 64)*(len(m) == 16 and int(m[0], 16) >= 8) if len(m) <= 16 else bytes.fromhex(m)
+                         for m in raw.astype(str)], dtype=object)
+
+    if width % 2 == 0 and np.all(np.char.str_len(raw) == width):
+        # Payloads of the same length are parsed at once, and right-aligned in 8 bytes
+        payload = np.zeros((n, 8), dtype=np.uint8)
+        payload[:, 8 - width//2:] = np.frombuffer(bytes.fromhex(raw.tobytes().decode('ascii')), dtype=np.uint8).reshape(n, width//2)
+    else:
+        payload = np.frombuffer(bytes.fromhex(''.join([m.zfill(16) for m in raw.astype(str)])), dtype=np.uint8).reshape(n, 8)
+
+    return payload.view('>i8').ravel().astype(np.int64)
+
+def decode_payload(payload, length):
+    """
+    Converts a payload stored by `encode_payload` back to its hexadecimal string of `length` bytes
+    """
+    if isinstance(payload, bytes):
+        return payload.hex()
+    return '{:0{}x}'.format(payload & 0xFFFFFFFFFFFFFFFF, 2*length)
+
+def load_frames(connection, df, name, vin = None, batch_size = 100000):
+    """
+    Bulk loads raw CAN frames of a drive into the database.
+
+    Duplicate frames (same time to the microsecond, bus, message ID and payload) are dropped in memory before loading,
+    and frames already in the database for the same drive are ignored. Frames are inserted in transactions of `batch_size` rows.
+    The first load into an empty database inserts without indexes and creates them afterwards.
+    Loading a drive that was already loaded only inserts its missing frames. The same frames loaded under another
+    drive name are inserted again for that drive.
+
+    The `Frames` count, start and end time of the drive in the `DRIVES` table are updated with the frames inserted.
+
+    Parameters
+    -------------
+    connection: `sqlite3.Connection`
+        Connection returned by `connect`
+
+    df: `pandas.DataFrame`
+        Raw CAN frames with columns Time, Bus, MessageID, Message (hexadecimal payload) and MessageLength
+
+    name: `str`
+        Name of the drive, e.g. the name of its CSV file
+
+    vin: `str`, default=None
+        Vehicle identification number of the drive
+
+    batch_size: `int`, default=100000
+        Number of rows inserted per transaction
+
+    Returns
+    -----------
+    `int`, `int`
+        Identifier of the drive in the database, and number of frames inserted
+    """
+    time_us = np.round(df['Time'].values.astype(np.float64)*1e6).astype(np.int64)
+    bus = df['Bus'].values.astype(np.int64)
+    message_id = df['MessageID'].values.astype(np.int64)
+    messages = df['Message'].astype(str).values
+    if 'MessageLength' in df.columns:
+        length = df['MessageLength'].values.astype(np.int64)
+    else:
+        length = np.array([len(m)//2 for m in messages], dtype=np.int64)
+    payload = encode_payload(messages)
+
+    # Duplicate frames within the drive, on the deduplication key of the table
+    if payload.dtype != object:
+        # Stable sort on the key: the first of equal keys in sorted order is the first in the drive
+        order = np.lexsort((payload, bus, time_us, message_id))
+        keys = [message_id[order], time_us[order], bus[order], payload[order]]
+        new_key = np.ones(order.shape[0], dtype=bool)
+        new_key[1:] = np.any([k[1:] != k[:-1] for k in keys], axis=0)
+        first = np.sort(order[new_key])
+    else:
+        first = np.flatnonzero(~pd.DataFrame({'m': message_id, 't': time_us, 'b': bus, 'p': payload}).duplicated().values)
+
+    cursor = connection.cursor()
+    cursor.execute('INSERT OR IGNORE INTO {} (Name, VIN, Frames) VALUES (?, ?, 0);'.format(DRIVES_TABLE), (name, vin))
+    drive_id = cursor.execute('SELECT DriveID FROM {} WHERE Name = ?;'.format(DRIVES_TABLE), (name,)).fetchone()[0]
+
+    indexed = cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name = ?;", (KEY_INDEX,)).fetchone()[0] > 0
+    empty = cursor.execute('SELECT NOT EXISTS (SELECT 1 FROM {});'.format(FRAMES_TABLE)).fetchone()[0]
+    connection.commit()
+
+    # Without the unique index, rows are deduplicated in memory only, so it must be created before loading into a non-empty table
+    if not indexed and not empty:
+        for statement in INDEXES:
+            cursor.execute(statement)
+        connection.commit()
+        indexed = True
+
+    statement = '{} INTO {} (DriveID, TimeUs, Bus, MessageID, Length, Payload) VALUES (?, ?, ?, ?, ?, ?);'.format(
+        'INSERT OR IGNORE' if indexed else 'INSERT', FRAMES_TABLE)
+    before = connection.total_changes
+    for start in range(0, first.shape[0], batch_size):
+        rows = first[start:start + batch_size]
+        cursor.executemany(statement, zip([drive_id]*rows.shape[0], time_us[rows].tolist(), bus[rows].tolist(),
+                                          message_id[rows].tolist(), length[rows].tolist(), payload[rows].tolist()))
+        connection.commit()
+    inserted = connection.total_changes - before
+
+    if not indexed:
+        for statement in INDEXES:
+            cursor.execute(statement)
+        connection.commit()
+
+    if inserted > 0:
+        inserted_time = time_us[first]
+        start_time, end_time = float(inserted_time.min())/1e6, float(inserted_time.max())/1e6
+        cursor.execute('UPDATE {} SET Frames = Frames + ?, StartTime = MIN(COALESCE(StartTime, ?), ?), EndTime = MAX(COALESCE(EndTime, ?), ?) \
+WHERE DriveID = ?;'.format(DRIVES_TABLE), (inserted, start_time, start_time, end_time, end_time, drive_id))
+        connection.commit()
+
+    return drive_id, inserted
+
+def _hex_payload(payload, length):
+    """
+    Vectorized `decode_payload` of integer payloads
+    """
+    n = payload.shape[0]
+    digits = np.frombuffer(payload.astype('>i8').tobytes().hex().encode('ascii'), dtype=np.uint8).reshape(n, 16)
+    messages = np.empty(n, dtype=object)
+    for l in np.unique(length):
+        rows = np.flatnonzero(length == l)
+        width = 2*int(min(l, 8))
+        if width == 0:
+            messages[rows] = ''
+            continue
+        messages[rows] = np.ascontiguousarray(digits[rows, 16 - width:]).view('S{}'.format(width)).ravel().astype(str)
+    return messages
+
+def query_frames(connection, vins = None, drives = None, time = None, message_ids = None, batch_size = 100000):
+    """
+    Reads raw CAN frames back from the database, selected by VIN, drive, time range and message ID with indexed queries.
+    A condition that is None is not applied. Rows are streamed in batches of `batch_size` into numpy arrays.
+
+    Parameters
+    -------------
+    connection: `sqlite3.Connection`
+        Connection returned by `connect`
+
+    vins: `list`, default=None
+        Vehicle identification numbers of the drives to read
+
+    drives: `list`, default=None
+        Names of the drives to read
+
+    time: `tuple`, default=None
+        Time range (t0, t1) in seconds, bounds included. Either bound can be None.
+
+    message_ids: `list`, default=None
+        Message IDs to read
+
+    batch_size: `int`, default=100000
+        Number of rows fetched at a time
+
+    Returns
+    -----------
+    `pandas.DataFrame`
+        Frames in the format of `strymread.dataframe` (columns Time, Bus, MessageID, Message and MessageLength)
+        sorted by time, with frames of equal time in the order they were loaded
+    """
+    def as_list(values):
+        return None if values is None else list(np.atleast_1d(values).tolist())
+
+    vins, drives, message_ids = as_list(vins), as_list(drives), as_list(message_ids)
+
+    conditions, parameters = [], []
+    if vins is not None:
+        conditions.append('DriveID IN (SELECT DriveID FROM {} WHERE VIN IN ({}))'.format(DRIVES_TABLE, ','.join('?'*len(vins))))
+        parameters += vins
+    if drives is not None:
+        conditions.append('DriveID IN (SELECT DriveID FROM {} WHERE Name IN ({}))'.format(DRIVES_TABLE, ','.join('?'*len(drives))))
+        parameters += drives
+    if message_ids is not None:
+        conditions.append('MessageID IN ({})'.format(','.join('?'*len(message_ids))))
+        parameters += [int(m) for m in message_ids]
+    if time is not None and time[0] is not None:
+        conditions.append('TimeUs >= ?')
+        parameters.append(int(np.round(time[0]*1e6)))
+    if time is not None and time[1] is not None:
+        conditions.append('TimeUs <= ?')
+        parameters.append(int(np.round(time[1]*1e6)))
+
+    query = 'SELECT rowid, TimeUs, Bus, MessageID, Length, Payload FROM {}'.format(FRAMES_TABLE)
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+
+    cursor = connection.execute(query, parameters)
+    blocks = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        try:
+            blocks.append(np.array(rows, dtype=np.int64))
+        except (TypeError, ValueError, OverflowError):
+            # Payloads longer than 8 bytes are stored as bytes
+            blocks.append(np.array(rows, dtype=object))
+
+    if len(blocks) == 0:
+        return pd.DataFrame({'Time': np.array([], dtype=np.float64), 'Bus': np.array([], dtype=np.uint8),
+                             'MessageID': np.array([], dtype=np.uint32), 'Message': np.array([], dtype=str),
+                             'MessageLength': np.array([], dtype=np.uint16)})
+
+    data = np.concatenate(blocks)
+    rowid, time_us, bus, message_id, length = [data[:, i].astype(np.int64) for i in range(5)]
+    payload = data[:, 5]
+
+    # Time order, frames of equal time in the order they were loaded
+    order = np.lexsort((rowid, time_us))
+    payload, length = payload[order], length[order]
+    if payload.dtype != object:
+        messages = _hex_payload(payload, length)
+    else:
+        messages = np.array([decode_payload(p, l) for p, l in zip(payload, length)], dtype=object)
+
+    return pd.DataFrame({'Time': time_us[order]/1e6, 'Bus': bus[order].astype(np.uint8), 'MessageID': message_id[order].astype(np.uint32),
+                         'Message': pd.array(messages, dtype=str), 'MessageLength': length.astype(np.uint16)})
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Chunked, time-indexed on-disk store of decoded timeseries with memory-mapped range reads
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+class SignalStore:
+    """
+    `SignalStore` keeps decoded timeseries on disk, so that time windows of a signal can be read repeatedly
+    without decoding the drive again.
+
+    Each signal is stored in its own directory as chunks of at most `chunk_size` samples, a pair of `.npy` files
+    (time and value) per chunk, with an index of the first and last time of each chunk. Reading a time window
+    memory-maps only the chunks overlapping it and slices them by binary search.
+
+    Parameters
+    -------------
+    root: `str`
+        Directory of the store, created if it doesn't exist
+
+    chunk_size: `int`, default=65536
+        Maximum number of samples per chunk of signals written to the store
+
+    Example
+    ----------
+    >>> from strym import strymread, SignalStore
+    >>> r0 = strymread(csvfile='2020-03-20.csv')
+    >>> store = SignalStore('drive_store')
+    >>> store.write('speed', r0.speed())
+    >>> speed = store.read('speed', 1584731850.0, 1584731910.0)
+
+    """
+    def __init__(self, root, chunk_size = 65536):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self.root = root
+        self.chunk_size = int(chunk_size)
+        self._indices = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _directory(self, name):
+        return os.path.join(self.root, str(name).replace('/', '_').replace(os.sep, '_'))
+
+    def _index(self, name):
+        """
+        Index of a signal: list of chunks, each with its files, first and last time and number of samples
+        """
+        if name not in self._indices:
+            path = os.path.join(self._directory(name), 'index.json')
+            if not os.path.exists(path):
+                raise ValueError("Signal {} is not in the store {}".format(name, self.root))
+            with open(path, 'r') as f:
+                self._indices[name] = json.load(f)
+        return self._indices[name]
+
+    def names(self):
+        """
+        Returns the names of the signals in the store
+        """
+        return sorted(d for d in os.listdir(self.root) if os.path.exists(os.path.join(self.root, d, 'index.json')))
+
+    def __contains__(self, name):
+        return os.path.exists(os.path.join(self._directory(name), 'index.json'))
+
+    def time_range(self, name):
+        """
+        Returns the first and last time of a signal
+        """
+        chunks = self._index(name)['chunks']
+        if len(chunks) == 0:
+            return None, None
+        return chunks[0]['t0'], chunks[-1]['t1']
+
+    def write(self, name, df, append = False):
+        """
+        Writes a timeseries to the store
+
+        Parameters
+        -------------
+        name: `str`
+            Name of the signal in the store
+
+        df: `pandas.DataFrame`
+            Timeseries with columns Time and Message, e.g. returned by `strymread.get_ts` or topic methods such as
+            `strymread.speed`. Named values, e.g. value choices of DBC signals, are stored as their numerical values.
+
+        append: `bool`, default=False
+            If True, samples are appended to the signal already in the store, and must be later than its last sample.
+            Else, the signal is replaced.
+        """
+        time = np.asarray(df['Time'].values, dtype=np.float64)
+        values = df['Message'].values
+        if values.dtype == object:
+            values = np.array([getattr(x, 'value', x) for x in values], dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+
+        if np.any(np.diff(time) < 0.0):
+            order = np.argsort(time, kind='stable')
+            time, values = time[order], values[order]
+
+        directory = self._directory(name)
+        chunks = []
+        if append and name in self:
+            chunks = list(self._index(name)['chunks'])
+            if len(chunks) > 0 and time.shape[0] > 0 and time[0] <= chunks[-1]['t1']:
+                raise ValueError("Appended samples of {} must be later than its last sample at {}".format(name, chunks[-1]['t1']))
+        os.makedirs(directory, exist_ok=True)
+
+        for start in range(0, time.shape[0], self.chunk_size):
+            number = len(chunks)
+            t, v = time[start:start + self.chunk_size], values[start:start + self.chunk_size]
+            files = ['time_{:06d}.npy'.format(number), 'value_{:06d}.npy'.format(number)]
+            np.save(os.path.join(directory, files[0]), t)
+            np.save(os.path.join(directory, files[1]), v)
+            chunks.append({'time': files[0], 'value': files[1], 't0': float(t[0]), 't1': float(t[-1]), 'rows': int(t.shape[0])})
+
+        index = {'chunks': chunks}
+        path = os.path.join(directory, 'index.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(path + '.tmp', path)
+        self._indices[name] = index
+
+        # Chunks of a replaced signal beyond the new ones are no longer referenced
+        referenced = set(f for chunk in chunks for f in [chunk['time'], chunk['value']])
+        for f in os.listdir(directory):
+            if f.endswith('.npy') and f not in referenced:
+                os.remove(os.path.join(directory, f))
+
+    def write_drive(self, r, topics = None):
+        """
+        Writes topics of a drive to the store, each under the name of its topic
+
+        Parameters
+        -------------
+        r: `strymread`
+            The drive
+
+        topics: `list`, default=None
+            Names of topic methods of `strymread`, such as "speed" or "yaw_rate". If None, all topics of the state space
+            (`strymread.STATE_SPACE_SIGNALS`) are written.
+        """
+        if topics is None:
+            topics = [method for _, method, _ in r.STATE_SPACE_SIGNALS if method is not None]
+
+        for topic in topics:
+            self.write(topic, getattr(r, topic)())
+
+    def read(self, name, t0 = None, t1 = None):
+        """
+        Reads a time window of a signal. Only the chunks overlapping the window are opened, memory-mapped.
+
+        Parameters
+        -------------
+        name: `str`
+            Name of the signal in the store
+
+        t0: `double`, default=None
+            Start time of the window in seconds, from the first sample if None
+
+        t1: `double`, default=None
+            End time of the window in seconds (inclusive), up to the last sample if None
+
+        Returns
+        -----------
+        `pandas.DataFrame`
+            Timeseries with columns Time and Message
+        """
+        chunks = self._index(name)['chunks']
+        directory = self._directory(name)
+
+        starts = np.array([chunk['t0'] for chunk in chunks])
+        ends = np.array([chunk['t1'] for chunk in chunks])
+        first = 0 if t0 is None else np.searchsorted(ends, t0, side='left')
+        last = len(chunks) if t1 is None else np.searchsorted(starts, t1, side='right')
+
+        times, values = [], []
+        for chunk in chunks[first:last]:
+            t = np.load(os.path.join(directory, chunk['time']), mmap_mode='r')
+            left = 0 if t0 is None else np.searchsorted(t, t0, side='left')
+            right = t.shape[0] if t1 is None else np.searchsorted(t, t1, side='right')
+            if right <= left:
+                continue
+            times.append(t[left:right])
+            values.append(np.load(os.path.join(directory, chunk['value']), mmap_mode='r')[left:right])
+
+        if len(times) == 0:
+            return pd.DataFrame({'Time': np.array([], dtype=np.float64), 'Message': np.array([], dtype=np.float64)})
+
+        return pd.DataFrame({'Time': np.concatenate(times), 'Message': np.concatenate(values)})
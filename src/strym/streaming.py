@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Author : strym contributors
+# Contact: https://github.com/jmscslgroup/strym/issues
+# Initial Date: Oct 18, 2026
+# About: Incremental construction of state space from CAN data arriving in chunks
+# License: MIT License
+
+#   Permission is hereby granted, free of charge, to any person obtaining
+#   a copy of this software and associated documentation files
+#   (the "Software"), to deal in the Software without restriction, including
+#   without limitation the rights to use, copy, modify, merge, publish,
+#   distribute, sublicense, and/or sell copies of the Software, and to
+#   permit persons to whom the Software is furnished to do so, subject
+#   to the following conditions:
+
+#   The above copyright notice and this permission notice shall be
+#   included in all copies or substantial portions of the Software.
+
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF
+#   ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED
+#   TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+#   PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+#   SHALL THE AUTHORS, COPYRIGHT HOLDERS OR ARIZONA BOARD OF REGENTS
+#   BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN
+#   AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#   OR OTHER DEALINGS IN THE SOFTWARE.
+
+__author__ = 'strym contributors'
+
+
+import numpy as np
+import pandas as pd
+
+from .strymread import strymread
+
+class StreamIntegrator:
+    """
+    `StreamIntegrator` integrates a timeseries with the trapezoidal rule over chunks arriving in time order,
+    carrying the running sum and the last sample over between chunks. Samples not later than the last sample
+    already received are dropped.
+
+    Concatenated cumulative outputs are the same as `strymread.integrate` over the whole timeseries.
+    With `cumulative=False`, only the running total is updated, so integrating a long drive needs
+    no more memory than its largest chunk.
+
+    Parameters
+    -------------
+    init: `double`, default=0.0
+        Initial value of the integral
+
+    Example
+    ----------
+    >>> integrator = StreamIntegrator()
+    >>> for chunk in chunks:
+    >>>     integrator.update(chunk['Time'].values, chunk['Message'].values, cumulative = False)
+    >>> distance = integrator.total
+    """
+    def __init__(self, init = 0.0):
+        self.total = float(init)
+        self.last_time = None
+        self.last_value = None
+
+    def update(self, timepoints, values, cumulative = True):
+        """
+        Integrate the next chunk of a timeseries
+
+        Parameters
+        -------------
+        timepoints: `numpy.ndarray`
+            Time points of the chunk, sorted
+
+        values: `numpy.ndarray`
+            Values of the timeseries at `timepoints`
+
+        cumulative: `bool`, default=True
+            If True, returns the integral at each new time point, otherwise only updates `total`
+
+        Returns
+        ----------
+        (`numpy.ndarray`, `numpy.ndarray`) | `double`
+            New time points and the integral at those time points, or the running total if `cumulative` is False
+        """
+        timepoints = np.asarray(timepoints, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if self.last_time is not None:
+            new = timepoints > self.last_time
+            timepoints, values = timepoints[new], values[new]
+
+        if timepoints.shape[0] == 0:
+            return (timepoints, values) if cumulative else self.total
+
+        if self.last_time is None:
+            # the first sample starts the integral
+            previous_time, previous_value = timepoints[:1], values[:1]
+        else:
+            previous_time, previous_value = np.array([self.last_time]), np.array([self.last_value])
+
+        steps = 0.5*(values + np.concatenate((previous_value, values[:-1])))*np.diff(np.concatenate((previous_time, timepoints)))
+        self.last_time, self.last_value = timepoints[-1], values[-1]
+
+        if not cumulative:
+            self.total += np.sum(steps)
+            return self.total
+
+        integral = self.total + np.cumsum(steps)
+        self.total = integral[-1]
+        return timepoints, integral
+
+class StateSpaceBuilder:
+    """
+    `StateSpaceBuilder` builds the state space of `strymread.state_space` incrementally from CAN data arriving in chunks,
+    e.g. from a drive file that keeps growing, or from a live stream of CAN messages.
+
+    Each signal keeps the samples that are still needed for interpolation across chunk boundaries. A grid point is emitted
+    only when every signal has a sample at or after it, so rows are never revised once emitted. Duplicate or overlapping
+    samples at chunk boundaries are dropped, and distance covered is integrated continuously across chunks.
+
+    The grid starts at the latest first sample among all of the signals and advances in steps of exactly `1/rate`, as the grid of
+    `strymread.state_space`, so that the rows built from all of the chunks are those of `strymread.state_space` over the whole data.
+
+    Emitted rows are kept for `result` unless `keep_rows` is False. Call `drain` to collect the rows emitted so far and release them,
+    so that building the state space of a long drive or of a live stream does not need more memory than its latest rows.
+
+    Parameters
+    -------------
+    rate: `double`, default=20
+        Sampling rate of the state space in Hz
+
+    cont_method: `str`, default="nearest"
+        Interpolation method for numerical signals: "nearest", "linear" or "previous"
+
+    cat_method: `str`, default="nearest"
+        Interpolation method for categorical signals: "nearest" or "previous"
+
+    signals: `list`
+        Names of signals to include (see `strymread.STATE_SPACE_SIGNALS`). By default, all state space signals are included.
+        Leave out signals that the vehicle does not publish, as no row is emitted before every signal has data.
+
+    keep_rows: `bool`, default=True
+        If False, emitted rows are only returned by `update` and not kept for `result` and `drain`
+
+    kwargs: variable list of argument in the dictionary format
+        Passed to `strymread` when a chunk is given as a dataframe of raw CAN messages, e.g. `dbcfile`.
+        The DBC file is loaded from the first of these chunks only, and its CAN database is reused for the chunks that follow.
+
+    Example
+    ----------
+    >>> builder = StateSpaceBuilder(rate = 20, dbcfile = 'toyota_rav4_2019.dbc')
+    >>> for chunk in pd.read_csv(csvfile, chunksize = 100000):
+    >>>     rows = builder.update(chunk)
+    >>> state = builder.result()
+
+    >>> builder = StateSpaceBuilder(rate = 20, dbcfile = 'toyota_rav4_2019.dbc')
+    >>> for chunk in pd.read_csv(csvfile, chunksize = 100000):
+    >>>     builder.update(chunk)
+    >>>     dashboard.append(builder.drain())
+    """
+
+    METHODS = ['nearest', 'linear', 'previous']
+
+    def __init__(self, rate = 20, cont_method = 'nearest', cat_method = 'nearest', signals = None, keep_rows = True, **kwargs):
+        if cont_method not in StateSpaceBuilder.METHODS or cat_method not in StateSpaceBuilder.METHODS:
+            raise ValueError("Incremental state space supports {} interpolation only.".format(StateSpaceBuilder.METHODS))
+
+        self.rate = rate
+        self.kwargs = kwargs
+        self.kwargs.setdefault("verbose", False)
+
+        if signals is None:
+            signals = [state for state, _, _ in strymread.STATE_SPACE_SIGNALS]
+        kinds = {state: kind for state, _, kind in strymread.STATE_SPACE_SIGNALS}
+        for state in signals:
+            if state not in kinds:
+                raise ValueError("Unknown state space signal {}".format(state))
+
+        self.signals = [state for state, _, _ in strymread.STATE_SPACE_SIGNALS if state in signals]
+        self.methods = {state: cat_method if kinds[state] == "categorical" else cont_method for state in self.signals}
+
+        # Samples of each signal not yet consumed by emitted grid points
+        self.buffers = {state: (np.empty(0), np.empty(0)) for state in self.signals}
+        self.last_time = {state: -np.inf for state in self.signals}
+
+        # distance covered is integrated from speed continuously across chunks
+        self.distance = StreamIntegrator()
+
+        self.start = None
+        self.next_index = 0
+        self.keep_rows = keep_rows
+        self.rows = []
+
+    def update(self, chunk):
+        """
+        Add a chunk of CAN data and return the newly completed rows of the state space.
+
+        Parameters
+        -------------
+        chunk: `strymread` | `pandas.DataFrame`
+            Next chunk of CAN data in time order, either as a `strymread` object or a dataframe of raw CAN messages
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            New rows of the state space with Time column followed by one column per signal, indexed by Clock.
+        """
+        if isinstance(chunk, pd.DataFrame):
+            chunk = strymread(chunk, **self.kwargs)
+            if chunk.success:
+                self.kwargs.setdefault("candb", chunk.candb)
+        if not chunk.success:
+            return self._frame(np.empty(0), np.empty((0, len(self.signals))))
+
+        # Chunks are decoded in the calling process, as they are small and arrive one after the other
+        series = chunk._state_space_series(workers = 1)
+        if "distance_covered" in self.buffers:
+            series["distance_covered"] = self.distance.update(*series["speed"])
+
+        for state in self.signals:
+            self._append(state, *series[state])
+
+        return self._emit()
+
+    def result(self):
+        """
+        State space built from all of the chunks so far, except for rows already collected by `drain`
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            Time column followed by one column per signal, indexed by Clock.
+        """
+        if len(self.rows) == 0:
+            return self._frame(np.empty(0), np.empty((0, len(self.signals))))
+        return pd.concat(self.rows)
+
+    def drain(self):
+        """
+        Rows emitted since the last call to `drain`, which are released by the builder
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            Time column followed by one column per signal, indexed by Clock.
+        """
+        rows = self.result()
+        self.rows = []
+        return rows
+
+    def _append(self, state, timepoints, values):
+        """
+        Append new samples of a signal, dropping samples that are not later than the ones already received
+        """
+        new = timepoints > self.last_time[state]
+        timepoints, values = timepoints[new], values[new]
+        if timepoints.shape[0] == 0:
+            return
+        buffered_time, buffered_values = self.buffers[state]
+        self.buffers[state] = (np.concatenate((buffered_time, timepoints)), np.concatenate((buffered_values, values)))
+        self.last_time[state] = timepoints[-1]
+
+    def _emit(self):
+        """
+        Interpolate every signal at the grid points covered by all of the signals, and trim the buffers
+        """
+        if any(self.buffers[state][0].shape[0] == 0 for state in self.signals):
+            return self._frame(np.empty(0), np.empty((0, len(self.signals))))
+
+        if self.start is None:
+            self.start = max(self.buffers[state][0][0] for state in self.signals)
+
+        safe_time = min(self.last_time[state] for state in self.signals)
+        grid = strymread._state_space_grid(self.start, safe_time, self.rate, first = self.next_index)
+        if grid.shape[0] == 0:
+            return self._frame(np.empty(0), np.empty((0, len(self.signals))))
+        self.next_index += grid.shape[0]
+
+        matrix = np.empty((grid.shape[0], len(self.signals)))
+        for i, state in enumerate(self.signals):
+            timepoints, values = self.buffers[state]
+            matrix[:, i] = strymread.resample_many([(timepoints, values)], grid, method = self.methods[state], as_array = True)[:, 0]
+
+            # keep the last sample at or before the last grid point, and everything after it
+            keep = max(np.searchsorted(timepoints, grid[-1], side='right') - 1, 0)
+            self.buffers[state] = (timepoints[keep:], values[keep:])
+
+        rows = self._frame(grid, matrix)
+        if self.keep_rows:
+            self.rows.append(rows)
+        return rows
+
+    def _frame(self, grid, matrix):
+        state_var = pd.DataFrame(matrix, columns = self.signals)
+        state_var.insert(0, 'Time', grid)
+        return strymread.timeindex(state_var)
@@ -38,6 +38,7 @@ import sys, getopt
 ## General Data processing and visualization Import
 
 import time
+from concurrent.futures import ProcessPoolExecutor
 import ntpath
 import datetime
 import numpy as np
@@ -47,7 +48,7 @@ plt.rcParams["image.cmap"] = "Dark2"
 # to change default color cycle
 plt.rcParams['axes.prop_cycle'] = plt.cycler(color=plt.cm.Dark2.colors)
 
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, CubicSpline
 from scipy import signal
 
 import pandas as pd # Note that this is not commai Panda, but Database Pandas
@@ -95,6 +96,17 @@ def truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100):
         cmap(np.linspace(minval, maxval, n)))
     return new_cmap
 
+# DBC database of a worker process decoding messages, see `strymread._decode_messages`
+_worker_candb = None
+
+def _init_decode_worker(candb):
+    global _worker_candb
+    _worker_candb = candb
+
+def _decode_worker_frames(message_name, frames, wide):
+    # Runs in a worker process, on the frames of a single message
+    return dbc.convertMessage(message_name, frames, _worker_candb, wide = wide)
+
 import IPython
 shell_type = IPython.get_ipython().__class__.__name__
 
@@ -107,6 +119,14 @@ from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 
 from .config import config
+from . import condition
+from .intervalset import IntervalSet
+from . import kinematics
+from . import features
+from .matio import MatWriter
+from . import dataset
+from . import rawdb
+from . import events as event_detectors
 
 class strymread:
     """
@@ -136,12 +156,29 @@ class strymread:
         Option for verbosity, prints some information when True
 
     createdb: `bool`
-        If True, creates a sqlite3 database for raw CAN data if the database doesn't exist
+        If True, loads the raw CAN data into a sqlite3 database, created if it doesn't exist. See `load_db`.
 
     dbdir: `str`
         Optional argument that specifies where sqlite3 database will be stored.
         The default location is `~/.strym/`
 
+    dedup: `dict` | default = None
+        Policy for messages received more than once with the same timestamp (e.g. on more than one bus), per topic such as "speed".
+        The key "default" applies to all other topics. A policy is "first", "last", "mean" or an integer bus ID to prefer that bus.
+        Default policy is "first". See `set_dedup_policy`.
+
+    dedup_tolerance: `double` | default = 0.001
+        Messages of a topic received within `dedup_tolerance` seconds of each other are copies of the same message,
+        e.g. received on two buses a fraction of a millisecond apart. It should be shorter than the period of the messages.
+
+    vin: `str` | default = None
+        Vehicle identification number of the vehicle the data was recorded from. If None, the VIN is parsed from
+        the name of the csvfile, if it has one.
+
+    candb: `cantools.db` | default = None
+        CAN database already loaded from `dbcfile`, used instead of loading `dbcfile` again,
+        e.g. when many `strymread` objects are created for chunks of the same drive.
+
     Attributes
     ---------------
     dbcfile: `str`, default = ""
@@ -181,6 +218,15 @@ class strymread:
         Location of database where sqlite3 database for CAN Dataframe will stored.
         Default location: `~/.strym/`
 
+    dedup: `dict`
+        Deduplication policy per topic applied when decoding topics.
+
+    dedup_tolerance: `double`
+        Time in seconds within which messages of a topic are copies of the same message.
+
+    vin: `str`
+        Vehicle identification number, None if it was neither passed nor found in the name of the csvfile.
+
     database: `str`
         The name of the database corresponding to the model/make of the vehicle from which the CAN data
         was captured
@@ -206,6 +252,21 @@ class strymread:
     """
 
     sunset = truncate_colormap(plt.get_cmap('magma'), 0.0, 0.7) # truncated color map from magma
+
+    # Signals of the state space in the order of its columns: (column, topic method, kind of interpolation).
+    # distance_covered is integrated from speed.
+    STATE_SPACE_SIGNALS = [("speed", "speed", "numerical"), ("distance_covered", None, "numerical"),
+                           ("accelx", "accelx", "numerical"), ("accely", "accely", "numerical"),
+                           ("accelz", "accelz", "numerical"), ("yaw_rate", "yaw_rate", "numerical"),
+                           ("steer_rate", "steer_rate", "numerical"), ("steer_angle", "steer_angle", "numerical"),
+                           ("steer_fraction", "steer_fraction", "numerical"), ("wheel_speed_fl", "wheel_speed_fl", "numerical"),
+                           ("wheel_speed_fr", "wheel_speed_fr", "numerical"), ("wheel_speed_rl", "wheel_speed_rl", "numerical"),
+                           ("wheel_speed_rr", "wheel_speed_rr", "numerical"), ("lead_distance", "lead_distance", "numerical"),
+                           ("acc_status", "acc_state", "categorical"), ("relative_vel", "relative_vel", "numerical")]
+
+    # Interpolation methods of `resample_many`
+    RESAMPLE_METHODS = ['linear', 'nearest', 'previous', 'cubic', 'decimate']
+
     def __init__(self, csvfile, dbcfile = "", **kwargs):
 
        # success attributes will be set to True ultimately if everything goes well and csvfile is read successfully
@@ -220,7 +281,8 @@ class strymread:
         if isinstance(csvfile, pd.DataFrame):
             self.dataframe = csvfile
             self.csvfile = ''
-            if ((len(dbcfile) == 0) or (dbcfile is None)):
+            # Without a dbcfile, the DBC file can still be inferred from a VIN
+            if ((dbcfile is None) or (len(dbcfile) == 0)) and not kwargs.get("vin", None):
                 print("Please provide a valid dbcfile using argument `dbcfile` to strymread if you intend to supply a dataframe to strymread")
                 return
 
@@ -249,6 +311,10 @@ class strymread:
         # Optional argument for bus ID
         self.bus = kwargs.get("bus", None)
 
+        # Optional argument for deduplication policy of topics received more than once with the same timestamp
+        self.dedup = dict(kwargs.get("dedup", None) or {})
+        self.dedup_tolerance = kwargs.get("dedup_tolerance", 0.001)
+
         # Optional argument for dbcfolder where to look for dbc files
         self.dbcfolder = kwargs.get("dbcfolder", None)
 
@@ -358,22 +424,11 @@ class strymread:
             else:
                 return 'VIN not part of filename'
 
-        vin = vin(self.csvfile)
-        brand = "toyota"
-        model = "rav4"
-        year = "2019"
-
-        try:
-            if Vin(vin).verify_checksum() == True:
-                vin_dict = decode_vin(vin)
-                brand= vin_dict["manufacturer"].lower()
-                model = vin_dict["model"].lower()
-                year = vin_dict["year"].lower()
-        except:
-            if self.verbose:
-                print('No valid vin... Continuing as Toyota RAV4. If this is inaccurate, please append VIN number to csvfile prefixed with an underscore.')
-
-        self.inferred_dbc = "{}_{}_{}.dbc".format(brand, model, year)
+        # A VIN passed by the user is kept even if its checksum can't be verified
+        self.vin = kwargs.get("vin", None)
+        verified_vin, self.inferred_dbc = strymread.infer_dbc(self.vin or vin(self.csvfile), self.verbose)
+        if verified_vin is not None:
+            self.vin = verified_vin
 
         if (dbcfile is None) or(dbcfile==""):
             dbcfile = str(dbc_resource) + "/" + self.inferred_dbc
@@ -406,7 +461,9 @@ class strymread:
         # DBC file that has CAN message codec
         self.dbcfile = dbcfile
         # save the CAN database for later use
-        if self.dbcfile:
+        if kwargs.get("candb", None) is not None:
+            self.candb = kwargs["candb"]
+        elif self.dbcfile:
             self.candb = cantools.db.load_file(self.dbcfile)
         else:
             self.candb = None
@@ -418,23 +475,120 @@ class strymread:
 
 
         # We will create an SQLite DB based on VIN number
-        self.database = brand.upper() + '_' + model.upper() + '_' + year.upper() + ".db"
-        self.raw_table = "RAW_CAN"
+        self.database = self.inferred_dbc[:-len('.dbc')].upper() + ".db"
+        self.raw_table = rawdb.FRAMES_TABLE
 
         self.db_location = '{}{}'.format(self.dbdir, self.database)
 
         if self.createdb:
-            dbconnection = self.dbconnect(self.db_location)
-            cursor = dbconnection.cursor()
-            cursor.execute('CREATE TABLE IF NOT EXISTS {} (Clock TIMESTAMP, Time REAL NOT NULL, Bus INTEGER, MessageID INTEGER, Message TEXT, MessageLength INTEGER, PRIMARY KEY (Clock, Bus, MessageID, Message));'.format(self.raw_table))
-            dbconnection.commit()
-            try:
-                self.dataframe[['Time', 'Bus', 'MessageID', 'Message', 'MessageLength']].to_sql(self.raw_table, con=dbconnection, index=True, if_exists='append')
-            except sqlite3.IntegrityError as e:
-                print(e)
-                if self.verbose:
-                    print("Attempted to insert duplicate entries to the RAW_CAN table.\nRAW_CAN table has (Clock, Bus, MessageID, Message) composite primary key.")
+            self.load_db()
+
+    def load_db(self, db_location = None, **kwargs):
+        """
+        Bulk loads the raw CAN frames of the drive into an SQLite database, as done when `createdb=True` is passed to the constructor.
+
+        Frames are stored compactly in the `CAN_FRAMES` table with integer time (microseconds) and integer payload,
+        and drives in the `DRIVES` table. The database uses write-ahead logging, frames are inserted in batched transactions,
+        duplicate frames are dropped, and indexes are built after the first load. Loading a drive again only inserts its missing frames.
+        See `rawdb.load_frames`.
+
+        Parameters
+        -------------
+        db_location: `str`, default=None
+            Path of the SQLite database. Defaults to `db_location` attribute, the database of the make and model of the vehicle in `dbdir`.
+
+        kwargs: variable list of argument in the dictionary format
+
+        batch_size: `int`, default=100000
+            Number of frames inserted per transaction
+
+        Returns
+        -----------
+        `int`
+            Number of frames inserted
+        """
+        if db_location is None:
+            db_location = self.db_location
+
+        batch_size = kwargs.get("batch_size", 100000)
+
+        name = self.basefile if self.csvfile else "drive_{}".format(int(self.dataframe['Time'].iloc[0]))
+        df = self.dataframe
+
+        dbconnection = rawdb.connect(db_location)
+        try:
+            _, inserted = rawdb.load_frames(dbconnection, df, name, vin = self.vin, batch_size = batch_size)
+        finally:
+            dbconnection.close()
+
+        if self.verbose:
+            print("Inserted {} of {} CAN frames into the {} table of {}".format(inserted, df.shape[0], self.raw_table, db_location))
+
+        return inserted
+
+    @classmethod
+    def from_db(cls, db_location, vin = None, time = None, message_ids = None, dbcfile = "", **kwargs):
+        """
+        Creates a `strymread` object from raw CAN frames stored in an SQLite database by `load_db` (or `createdb=True`).
+
+        Frames are selected with indexed range queries on VIN, time and message ID, and streamed in batches into the
+        dataframe of the `strymread` object. See `rawdb.query_frames`.
+
+        Parameters
+        -------------
+        db_location: `str`
+            Path of the SQLite database
 
+        vin: `str` | `list`, default=None
+            Vehicle identification number(s) of the drives to read. All drives are read if None.
+
+        time: `tuple`, default=None
+            Time range (t0, t1) in seconds, bounds included. Either bound can be None.
+
+        message_ids: `list`, default=None
+            Message IDs to read. All messages are read if None.
+
+        dbcfile: `str`, default=""
+            The DBC file. If empty, it is inferred from `vin`.
+
+        kwargs: variable list of argument in the dictionary format
+
+        drives: `list`, default=None
+            Names of the drives to read, e.g. names of their CSV files
+
+        batch_size: `int`, default=100000
+            Number of rows fetched from the database at a time
+
+        Other keyword arguments are passed to the `strymread` constructor.
+
+        Returns
+        -----------
+        `strymread`
+            A `strymread` object whose `db_location` is `db_location`. Its `success` attribute is False if no frame was selected.
+
+        Example
+        ----------
+        >>> r0 = strymread.from_db('~/.strym/TOYOTA_RAV4_2020.db', vin='2T3MWRFVXLW056972', time=(1584731850.0, 1584732150.0), message_ids=[180, 552])
+        """
+        db_location = os.path.expanduser(db_location)
+        if not os.path.exists(db_location):
+            raise ValueError("Database {} doesn't exist".format(db_location))
+
+        drives = kwargs.pop("drives", None)
+        batch_size = kwargs.pop("batch_size", 100000)
+
+        dbconnection = rawdb.connect(db_location)
+        try:
+            df = rawdb.query_frames(dbconnection, vins = vin, drives = drives, time = time, message_ids = message_ids, batch_size = batch_size)
+        finally:
+            dbconnection.close()
+
+        if isinstance(vin, str):
+            kwargs.setdefault("vin", vin)
+
+        r = cls(df, dbcfile = dbcfile, **kwargs)
+        r.db_location = db_location
+        return r
 
     def dbconnect(self, db_location):
         """
@@ -457,6 +611,43 @@ class strymread:
         # dbconnection = self.dbengine.raw_connection()
         return dbconnection
 
+    @staticmethod
+    def infer_dbc(vin, verbose = False):
+        """
+        Infers the name of the DBC file, <brand>_<model>_<year>.dbc, from a VIN. Defaults to Toyota RAV4 2019
+        if the checksum of the VIN can't be verified.
+
+        Parameters
+        -------------
+        vin: `str`
+            Vehicle identification number
+
+        verbose: `bool`, default = False
+            If True, print a message when the VIN is not valid
+
+        Returns
+        -------------
+        `str`, `str`
+            The VIN if its checksum was verified, else None, and the name of the DBC file
+        """
+        brand = "toyota"
+        model = "rav4"
+        year = "2019"
+        verified_vin = None
+
+        try:
+            if Vin(vin).verify_checksum() == True:
+                verified_vin = vin
+                vin_dict = decode_vin(vin)
+                brand= vin_dict["manufacturer"].lower()
+                model = vin_dict["model"].lower()
+                year = vin_dict["year"].lower()
+        except:
+            if verbose:
+                print('No valid vin... Continuing as Toyota RAV4. If this is inaccurate, please append VIN number to csvfile prefixed with an underscore.')
+
+        return verified_vin, "{}_{}_{}.dbc".format(brand, model, year)
+
     def _set_dbc(self):
         """
         `_set_dbc` sets the DBC file
@@ -505,6 +696,12 @@ class strymread:
             if verbose:
                 print("Signal Name: {}\n".format(signal))
 
+        # Decoded timeseries are cached, callers get a copy they are free to modify
+        cache = self._cache()
+        key = ('ts', msg, signal)
+        if key in cache:
+            return cache[key].copy()
+
         # try-exception is fix for hybrid RAV4 since if you are using data
         # from a hybrid the accel message length is 4 vs. 8 in the Internal Combustion Engine
 
@@ -528,7 +725,9 @@ class strymread:
                         # self.candb.messages[index_of_acceldef] = accel_def
                         self.dataframe = dbc.CleanData(self.dataframe,address=552)
                         ts = dbc.convertData(msg, signal,  self.dataframe, self.candb)
-        return ts
+
+        self._cache()[key] = ts
+        return ts.copy()
 
     def messageIDs(self):
         """
@@ -596,29 +795,13 @@ class strymread:
             fig.suptitle("Message ID counts: "+ ntpath.basename(self.csvfile), y=0.98)
             fig.show()
 
-        bus = dataframe['Bus'].unique()
-        bus.sort()
-        columns = ['Counts_Bus_' + str(int(s)) for s in bus]
-        columns.insert(0, 'MessageID')
-        all_msgs = self.messageIDs()
-        dfx = pd.DataFrame(columns=columns)
-        dfx['MessageID'] = all_msgs
+        # Counts of all (MessageID, Bus) pairs in a single grouped pass
+        dfx = dataframe.groupby(['MessageID', 'Bus']).size().unstack(fill_value=0)
+        dfx.columns = ['Counts_Bus_{}'.format(int(b)) for b in dfx.columns]
+        dfx['TotalCount'] = dfx.sum(axis=1)
+        dfx.insert(0, 'MessageID', dfx.index.values)
         dfx.index = dfx['MessageID'].values
 
-        countbybus = dataframe.groupby(['MessageID', 'Bus'])
-
-
-        for key,item in countbybus:
-            a_group = countbybus.get_group(key)
-            dfx.at[key[0], 'Counts_Bus_{}'.format(int(key[1]))] = a_group.shape[0]
-
-        dfx.fillna(0, inplace=True)
-
-        dfx['TotalCount'] = 0
-        for b in bus:
-
-            dfx['TotalCount'] =  dfx['TotalCount'] + dfx['Counts_Bus_{}'.format(int(b))]
-
         return dfx
 
     def start_time(self):
@@ -675,16 +858,16 @@ class strymread:
         speed_in_ms['Time'] = speed['Time']
         speed_in_ms['Message'] = speed['Message']*1000.0/3600.0
 
-        dist = self.integrate(speed_in_ms)
-
         required_distance = 0.0
         if time == -1:
-            required_distance =  dist['Message'].iloc[-1]
+            required_distance = self.integrate(speed_in_ms, total_only = True)
         else:
             if time <= self.triptime():
-                desired_time = dist['Time'].iloc[0] + time
-                data = dist[dist['Time'] > desired_time]
-                required_distance =  data['Message'].iloc[0]
+                # distance at the first time point after the desired time
+                desired_time = speed_in_ms['Time'].iloc[0] + time
+                end = np.searchsorted(speed_in_ms['Time'].values, desired_time, side='right')
+                if end < speed_in_ms.shape[0]:
+                    required_distance = self.integrate(speed_in_ms.iloc[:end + 1], total_only = True)
         return required_distance
 
     def driving_characteristics(self):
@@ -754,20 +937,7 @@ class strymread:
         # OLD
         # return self.get_ts('SPEED', 1)
         # NEW
-        d=self.topic2msgs('speed')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('speed')
         return ts
 
     def speed_limit(self):
@@ -781,21 +951,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('KINEMATICS', 'ACCEL_Y')
 
-        d=self.topic2msgs('speed_limit')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('speed_limit')
         return ts
     
     def relative_vel(self):
@@ -809,21 +965,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('KINEMATICS', 'ACCEL_Y')
 
-        d=self.topic2msgs('relative_vel')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('relative_vel')
         return ts
 
     def accely(self):
@@ -837,22 +979,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('KINEMATICS', 'ACCEL_Y')
 
-        d=self.topic2msgs('accely')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('accely')
         return ts
 
     def accelx(self):
@@ -867,21 +994,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('ACCELEROMETER', 'ACCEL_X')
 
-        d=self.topic2msgs('accelx')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('accelx')
         return ts
 
     def accelz(self):
@@ -896,20 +1009,7 @@ class strymread:
         # OLD
         #ts = self.get_ts('ACCELEROMETER', 'ACCEL_Z')
 
-        d=self.topic2msgs('accelz')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('accelz')
         return ts
 
     def steer_torque(self):
@@ -925,20 +1025,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('KINEMATICS', 'STEERING_TORQUE')
 
-        d=self.topic2msgs('steer_torque')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('steer_torque')
         return ts
 
     def yaw_rate(self):
@@ -953,20 +1040,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('KINEMATICS', 'YAW_RATE')
 
-        d=self.topic2msgs('yaw_rate')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('yaw_rate')
         return ts
 
 
@@ -982,20 +1056,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('STEER_ANGLE_SENSOR', 'STEER_RATE')
 
-        d=self.topic2msgs('steer_rate')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('steer_rate')
         return ts
 
     def steer_angle(self):
@@ -1008,20 +1069,7 @@ class strymread:
         """
 #         signal_id = dbc.getSignalID('STEER_ANGLE_SENSOR', 'STEER_ANGLE', self.candb)
 #         return self.get_ts('STEER_ANGLE_SENSOR', signal_id)
-        d=self.topic2msgs('steer_angle')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('steer_angle')
         return ts
     # NEXT
 
@@ -1037,20 +1085,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('STEER_ANGLE_SENSOR', 'STEER_FRACTION')
 
-        d=self.topic2msgs('steer_fraction')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('steer_fraction')
         return ts
 
     def wheel_speed_fl(self):
@@ -1067,20 +1102,7 @@ class strymread:
         # signal = 'WHEEL_SPEED_FL'
         # ts = self.get_ts(message, signal)
 
-        d=self.topic2msgs('wheel_speed_fl')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('wheel_speed_fl')
         return ts
 
     def wheel_speed_fr(self):
@@ -1097,20 +1119,7 @@ class strymread:
         # signal = 'WHEEL_SPEED_FR'
         # ts = self.get_ts(message, signal)
 
-        d=self.topic2msgs('wheel_speed_fr')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('wheel_speed_fr')
         return ts
 
     def wheel_speed_rr(self):
@@ -1127,20 +1136,7 @@ class strymread:
         # signal = 'WHEEL_SPEED_RR'
         # ts = self.get_ts(message, signal)
 
-        d=self.topic2msgs('wheel_speed_rr')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('wheel_speed_rr')
         return ts
 
     def wheel_speed_rl(self):
@@ -1157,20 +1153,7 @@ class strymread:
         # signal = 'WHEEL_SPEED_RL'
         # ts = self.get_ts(message, signal)
 
-        d=self.topic2msgs('wheel_speed_rl')
-        ts = self.get_ts(d['message'],d['signal'])
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('wheel_speed_rl')
         return ts
 
     def rel_accel(self, track_id):
@@ -1382,21 +1365,7 @@ class strymread:
         # OLD
         # ts = self.get_ts('DSU_CRUISE', 'LEAD_DISTANCE')
 
-        d=self.topic2msgs('lead_distance')
-        ts =  self.get_ts(d['message'],d['signal'])
-
-
-        # Messages such as acceleration, speed may come on multiple buses
-        # as observed from data obtained from Toyota RAV4 and Honda Pilot
-        # and often they are copy of each other, they can be identified as
-        # duplicate if they were received with same time-stamp
-
-        # We will remove the bus column as it is irrelevant to bus column
-        # if we want to remove duplicates
-        if 'Bus' in ts.columns:
-            ts.drop(columns=['Bus'], inplace=True)
-
-        ts = strymread.remove_duplicates(ts)
+        ts = self._topic_ts('lead_distance')
         return ts
 
     def plt_speed(self):
@@ -1405,7 +1374,7 @@ class strymread:
         """
         dbc.plotDBC('SPEED',1,  self.dataframe, self.candb)
 
-    def frequency(self):
+    def frequency(self, by_bus = False):
         """
         Retrieves the frequency of each message in a pandas.Dataframe()
 
@@ -1420,69 +1389,200 @@ class strymread:
         |           |          |            |         |         |         |         |
         +-----------+----------+------------+---------+---------+---------+---------+
 
+        Rates of all messages are computed in a single sorted, grouped pass over the dataframe.
+
+        Parameters
+        ------------
+        by_bus: `bool`, default = False
+            If True, rate statistics are computed separately for each message on each bus,
+            and the returned data frame has an additional `Bus` column
+
         Returns
         ----------
         `pandas.DataFrame`
-            Returns the a data frame containing mean rate, std rate, max rate, min rate, rate iqr
+            Returns the a data frame containing mean rate, std rate, max rate, min rate, rate iqr.
+            Statistics are NaN for messages received less than twice.
 
         """
+        keys = ['MessageID', 'Bus'] if by_bus else ['MessageID']
+
+        # Sort by message (and bus), then by time, so that consecutive rows of the same group
+        # give inter-arrival times of a message
+        groups = [self.dataframe[k].values for k in keys]
+        timepoints = self.dataframe['Time'].values
+        order = np.lexsort([timepoints] + groups[::-1])
+        timepoints = timepoints[order]
+        groups = [g[order] for g in groups]
 
-        messageIDs = self.messageIDs()
+        same_group = np.ones(max(timepoints.shape[0] - 1, 0), dtype=bool)
+        for g in groups:
+            same_group &= g[1:] == g[:-1]
 
-        f = pd.DataFrame()
+        # Messages with same timestamps (e.g. received on more than one bus) are counted once, the same
+        # as removing duplicates, so zero inter-arrival times are skipped.
+        tdiff = np.diff(timepoints)
+        valid = same_group & (tdiff > 0)
 
-        means = []
-        medians = []
-        maxs = []
-        mins = []
-        stds = []
-        iqrs = []
-        for ID in messageIDs:
-            r = self.dataframe[self.dataframe['MessageID'] == ID]
-            r = strymread.remove_duplicates(r)
-            tdiff = 1./r['Time'].diff()
-            tdiff = tdiff[1:]
-            means.append(np.mean(tdiff.values))
-            medians.append(np.median(tdiff.values))
-            maxs.append(np.max(tdiff.values))
-            mins.append(np.min(tdiff.values))
-            stds.append(np.std(tdiff.values))
+        rates = pd.DataFrame({k: g[1:][valid] for k, g in zip(keys, groups)})
+        rates['Rate'] = 1./tdiff[valid]
 
-            first_quartile = np.percentile(tdiff.values, 25)
-            third_quartile = np.percentile(tdiff.values, 75)
-            iqrs.append(third_quartile- first_quartile) #interquartile range
+        grouped = rates.groupby(keys)['Rate']
+        f = pd.DataFrame({'MeanRate': grouped.mean(), 'MedianRate': grouped.median(), 'RateStd': grouped.std(ddof=0),
+            'MaxRate': grouped.max(), 'MinRate': grouped.min()})
+        f['RateIQR'] = grouped.quantile(0.75) - grouped.quantile(0.25) #interquartile range
 
-        f['MessageID'] = messageIDs
-        f['MeanRate'] = means
-        f['MedianRate'] = medians
-        f['RateStd'] = stds
-        f['MaxRate'] = maxs
-        f['MinRate'] = mins
-        f['RateIQR'] = iqrs
+        # Messages received only once have no rate
+        all_groups = self.dataframe[keys].drop_duplicates().sort_values(keys)
+        f = f.reindex(pd.MultiIndex.from_frame(all_groups) if by_bus else pd.Index(all_groups['MessageID'], name='MessageID'))
 
-        return f
+        return f.reset_index()
+
+    def _inter_arrival(self):
+        """
+        Inter-arrival times of every message, as numpy arrays (message ID, time of earlier message, inter-arrival time, median
+        inter-arrival time of the message). Messages with same timestamps (e.g. received on more than one bus) are counted once.
+        """
+        message_ids = self.dataframe['MessageID'].values
+        timepoints = self.dataframe['Time'].values
+        order = np.lexsort([timepoints, message_ids])
+        message_ids = message_ids[order]
+        timepoints = timepoints[order]
+
+        tdiff = np.diff(timepoints)
+        valid = (message_ids[1:] == message_ids[:-1]) & (tdiff > 0)
+        message_ids, timepoints, tdiff = message_ids[1:][valid], timepoints[:-1][valid], tdiff[valid]
+
+        period = pd.Series(tdiff).groupby(message_ids).median()
+        return message_ids, timepoints, tdiff, period.reindex(message_ids).values
+
+    def gaps(self, factor = 5.0):
+        """
+        Gap index of the drive: every interval in which a message stopped arriving for longer than `factor` times
+        its usual (median) period. Gaps of all messages are found in a single sorted, grouped pass over the dataframe.
+
+        Parameters
+        ------------
+        factor: `double`, default=5.0
+            A message is missing when its inter-arrival time exceeds `factor` times its median inter-arrival time
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            A data frame with MessageID, Start, End and Duration columns (time in seconds), one row per gap
+        """
+        message_ids, timepoints, tdiff, period = self._inter_arrival()
+        gap = tdiff > factor*period
+        return pd.DataFrame({'MessageID': message_ids[gap], 'Start': timepoints[gap],
+            'End': timepoints[gap] + tdiff[gap], 'Duration': tdiff[gap]})
+
+    def completeness(self, factor = 5.0):
+        """
+        Data-completeness summary of the drive per message.
+
+        Parameters
+        ------------
+        factor: `double`, default=5.0
+            A message is missing when its inter-arrival time exceeds `factor` times its median inter-arrival time
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            A data frame with following columns per MessageID:
+
+            Count: number of messages with distinct timestamps
+
+            Period: median inter-arrival time in seconds
+
+            FirstTime, LastTime: time of first and last message
+
+            Gaps: number of gaps (see `gaps`)
+
+            GapDuration: total duration of gaps in seconds
+
+            Completeness: fraction of messages received out of those expected at the median period over the whole drive
+        """
+        unique = self.dataframe[['MessageID', 'Time']].drop_duplicates()
+        grouped = unique.groupby('MessageID')['Time']
+        summary = pd.DataFrame({'Count': grouped.size(), 'FirstTime': grouped.min(), 'LastTime': grouped.max()})
+
+        message_ids, _, tdiff, period = self._inter_arrival()
+        gap = tdiff > factor*period
+        summary['Period'] = pd.Series(tdiff).groupby(message_ids).median()
+        summary['Gaps'] = pd.Series(gap.astype(int)).groupby(message_ids).sum()
+        summary['GapDuration'] = pd.Series(np.where(gap, tdiff, 0.0)).groupby(message_ids).sum()
+        summary[['Gaps', 'GapDuration']] = summary[['Gaps', 'GapDuration']].fillna(0)
+        summary['Gaps'] = summary['Gaps'].astype(int)
+
+        drive_duration = self.dataframe['Time'].max() - self.dataframe['Time'].min()
+        expected = drive_duration/summary['Period'] + 1
+        summary['Completeness'] = np.clip(summary['Count']/expected, 0.0, 1.0)
+
+        summary = summary[['Count', 'Period', 'FirstTime', 'LastTime', 'Gaps', 'GapDuration', 'Completeness']]
+        return summary.reset_index()
+
+    @staticmethod
+    def gap_index(df, factor = 5.0, period = None):
+        """
+        Gaps of a timeseries, where samples stopped arriving for longer than `factor` times the expected period.
+
+        Parameters
+        ------------
+        df: `pandas.DataFrame`
+            Timeseries with a `Time` column
+
+        factor: `double`, default=5.0
+            Multiple of the expected period above which an inter-arrival time is a gap
+
+        period: `double`, default=None
+            Expected period in seconds. By default, the median inter-arrival time.
+
+        Returns
+        ----------
+        `IntervalSet`
+            Gaps, each from the last sample before the gap to the first sample after it
+        """
+        timepoints = np.unique(df['Time'].values.astype(float))
+        if timepoints.shape[0] < 2:
+            return IntervalSet()
+        tdiff = np.diff(timepoints)
+        if period is None:
+            period = np.median(tdiff)
+        gap = tdiff > factor*period
+        return IntervalSet(timepoints[:-1][gap], timepoints[1:][gap])
 
     # Based on MATLAB Code provided by Gustavo Lee
-    def trajectory(self, x_init  = 0.0, y_init= 0.0, data_rate = 50.0):
+    def trajectory(self, x_init  = 0.0, y_init= 0.0, data_rate = 50.0, method = 'euler', heading_init = 0.0):
         """
-        A simple trajectory tracing function based on CAN data
+        A simple trajectory tracing function based on CAN data.
+
+        Speed and heading (integrated yaw rate) are resampled at `data_rate` and
+        integrated with cumulative sums, so the whole drive is traced without a Python loop.
+        Use `kinematics.TrajectoryIntegrator` to extend a trajectory as new data arrives.
 
         Parameters
         --------------
-        x_init: `double`
+        x_init: `double` | `numpy.ndarray`
             Initial X-coordinate of the vehicle
 
-        y_init: `double`
+        y_init: `double` | `numpy.ndarray`
             Initial Y-coordinate of the vehicle
 
         data_rate: `double`
             Rate at which message are sampled.
 
+        method: `str`, default="euler"
+            Integration method: "euler" (same as the original MATLAB code), "trapezoid" or "simpson"
+
+        heading_init: `double` | `numpy.ndarray`, default=0.0
+            Initial heading of the vehicle in degrees
+
         Returns
         ----------
 
         `pandas.DataFrame`
-            A pandas Dataframe with three columns: Time, X, Y, Vx, Vy
+            A pandas Dataframe with five columns: Time, X, Y, Vx, Vy.
+            If any of `x_init`, `y_init` or `heading_init` is an array, a list of such
+            dataframes is returned, one for each initial condition.
         """
 
         ts_yaw_rate = self.yaw_rate()
@@ -1491,56 +1591,23 @@ class strymread:
         # integrate yaw rate to get the heading
         ts_yaw = self.integrate(ts_yaw_rate)
 
-        ts_resampled_yaw, ts_resampled_speed = self.ts_sync(ts_yaw, ts_speed)
+        ts_resampled_yaw, ts_resampled_speed = self.ts_sync(ts_yaw, ts_speed, rate = data_rate)
 
         yaw = ts_resampled_yaw['Message'].values
         speed = ts_resampled_speed['Message'].values
 
-        """
-        X_Pos = Initial_Position(1);
-        Y_Pos = Initial_Position(2);
-        kph_to_mps = 1000/3600;
-        for i = 1:length(Complete_Speed)
-            Vx(i) = cosd(Complete_Heading(i))*kph_to_mps*Complete_Speed(i);
-            Vy(i) = sind(Complete_Heading(i))*kph_to_mps*Complete_Speed(i);
-            X_Pos(i) = X_Pos(end) + Vx(i)*dt;
-            Y_Pos(i) = Y_Pos(end) + Vy(i)*dt;
-        end
-        """
         dt = 1./data_rate
-        X = []
-        Y = []
-        Vx = []
-        Vy = []
-        X.append(x_init)
-        Y.append(y_init)
-        Vx.append(0.0)
-        Vy.append(0.0)
-        kph_to_mps = 1000.0/3600.0 # kph to meter per second
-        for i in range(0, ts_resampled_speed.shape[0]):
-            vx = speed[i]*np.cos(np.deg2rad(yaw[i]))*kph_to_mps
-            vy = speed[i]*np.sin(np.deg2rad(yaw[i]))*kph_to_mps
-            x =  X[-1] + vx*dt
-            y =  Y[-1] + vy*dt
-            Vx.append(vx)
-            Vy.append(vy)
-            X.append(x)
-            Y.append(y)
-        traj = pd.DataFrame()
-
-        Time = ts_resampled_yaw['Time']
-
-        ExtendedTime = [Time[0] - dt]
-        ExtendedTime[1:] = Time
-        ExtendedTime= pd.Series(ExtendedTime)
-
-        traj['Time'] = ExtendedTime
-        traj['X'] = X
-        traj['Y'] = Y
-        traj['Vx'] = Vx
-        traj['Vy'] = Vy
-
-        return traj
+        X, Y, Vx, Vy = kinematics.dead_reckoning(speed, yaw, dt, x_init = x_init, y_init = y_init,
+            heading_init = heading_init, method = method)
+
+        Time = ts_resampled_yaw['Time'].values
+        ExtendedTime = np.concatenate(([Time[0] - dt], Time))
+
+        if X.ndim == 1:
+            return pd.DataFrame({'Time': ExtendedTime, 'X': X, 'Y': Y, 'Vx': Vx, 'Vy': Vy})
+
+        return [pd.DataFrame({'Time': ExtendedTime, 'X': X[:, i], 'Y': Y[:, i], 'Vx': Vx[:, i], 'Vy': Vy[:, i]})
+                for i in range(X.shape[1])]
 
     def msg_subset(self, **kwargs):
         """
@@ -1570,7 +1637,17 @@ class strymread:
             - steering_rate: timeseries steering rate of the vehicle
             - yaw_rate: timeseries yaw rate of the vehicle
 
-            For example, "speed < 2.3"
+            Any other topic available through `topic2msgs`, `acc_state`, or a signal specified as `ID.SIGNAL.Message`
+            (e.g. `386.LONG_DIST.Message`) can also be used as an operand.
+
+            Conditions can be combined with `and`, `or`, `not` and parentheses. Operands of combined conditions
+            are evaluated on the union of their time points, each holding its last received value.
+
+            For example, "speed < 2.3", "lead vehicle present and not (speed < 20 or cruise control on)"
+
+        combine: `str`, default = "or"
+            How slices of multiple conditions are combined. "or" extracts messages satisfying any of the conditions,
+            "and" extracts messages satisfying all of them. Messages in overlapping slices are extracted only once.
 
         time: (t0, t1)
 
@@ -1586,11 +1663,11 @@ class strymread:
 
         Returns
         -----------
-        `strymread`
-            Returns strymread object with a modified dataframe attribute
+        `strymview`
+            Returns a `strymview`, a `strymread` object whose dataframe attribute is the subset of message dataframe.
+            The view shares parsed data, DBC database and decoded timeseries with this object instead of copying them.
 
         """
-        df = None
 
         # Whole time by default
         time = (0, self.dataframe['Time'].iloc[-1] - self.dataframe['Time'].iloc[0])
@@ -1619,14 +1696,17 @@ class strymread:
         except KeyError as e:
             pass
 
-        df = self.dataframe[(self.dataframe['Time'] - self.dataframe['Time'].iloc[0] >= time[0]) & (self.dataframe['Time'] - self.dataframe['Time'].iloc[0] <= time[1])]
-        df = df[df.MessageID.isin(ids)]
+        # Selected time window in absolute time
+        start_time = self.dataframe['Time'].iloc[0]
+        selection = IntervalSet([start_time + time[0]], [start_time + time[1]])
 
         conditions = None
 
 
         try:
             if isinstance(kwargs["conditions"], list):
+                if len(kwargs["conditions"]) == 0:
+                    raise ValueError('conditions should be a non-empty list of strings with valid conditions. See documentation for more detail..')
                 conditions = kwargs["conditions"]
 
             elif isinstance(kwargs["conditions"], str):
@@ -1638,112 +1718,25 @@ class strymread:
         except KeyError as e:
             pass
 
-        if conditions is None:
-            r_new = copy.deepcopy(self)
-            r_new.dataframe = df
-            return r_new
-
-        subset_frames = []
-        if conditions is not None:
-            for con in conditions:
-                slices = []
-                index = None
-                con = con.strip()
-                con = " ".join(con.split()) # removee whitespace characters - even multiple of them and replaces them with a single whitespace
-
-                # get all the meassages for which lead vehicle is present.
-                if con.lower() == "lead vehicle present":
-                    msg_DSU_CRUISE = self.get_ts('DSU_CRUISE', 6)
-                    # 252m is read in the front when radar doesn't see any vehicle in the front.
-                    index = msg_DSU_CRUISE['Message'] < 252
-
-                elif con.lower() == "cruise control on":
-                    acc_state = self.acc_state()
-                    # acc state of 6 denotes that cruise control was enabled.
-                    index = acc_state['Message'] == 6
+        combine = kwargs.get("combine", "or")
+        if combine not in ["or", "and"]:
+            raise ValueError("combine should either be 'or' or 'and'")
 
-                else:
-                    conlower = con.lower()
-                    constrip = conlower.split()
-                    if len(constrip) < 3:
-                        print("Unsupported conditions provided. See documentation for more details.")
-                        raise ValueError("Unsupported conditions provided. See documentation for more details.")
-                        return None
-
-                    operators = ['<', '>', '>=','<=','==','!=']
-                    operand = ['speed', 'acceleration', 'lead_distance', 'steering_angle', 'steering_rate', 'yaw_rate' ]
-
-                    valuecheck = False
-                    value = None
-                    try:
-                        value = float(constrip[2])
-                        valuecheck = True
-                    except ValueError:
-                        valuecheck = False
-
-                    # This is equivalent to pattern: `operator op value`
-                    if (constrip[0] in operand) & (constrip[1] in operators) & (valuecheck):
-                        if constrip[0] == 'speed':
-                            speed = self.speed()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'acceleration':
-                            acceleration = self.accelx()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_angle':
-                            steering_angle = self.steer_angle()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_rate':
-                            steering_rate = self.steer_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_rate':
-                            steering_rate = self.steer_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'yaw_rate':
-                            yaw_rate = self.yaw_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                    elif (constrip[0].split('.')[0].isdigit()) &  (constrip[0].split('.')[2].lower()  == 'message') & (constrip[1] in operators) & (valuecheck):
-                        # above condition check something like 386.LONG_DIST.Message > 34.0 where 345 is a valid message id.
-                        required_id =  int(constrip[0].split('.')[0])
-
-                        if constrip[0].split('.')[1].isdigit():
-                            required_signal = int(constrip[0].split('.')[1])
-                        else:
-                            required_signal = constrip[0].split('.')[1].upper()
-
-                        if required_id not in self.messageIDs():
-                            raise ValueError('Request Message ID {} was unavailable in the data file {}'.format(required_id,  self.csvfile))
-
-
-                        ts = self.get_ts(required_id, required_signal)
-
-                        bool_result = eval("ts " + constrip[1] + constrip[2])
-                        index = bool_result['Message']
+        if conditions is None:
+            return strymview(self, selection, ids)
+
+        # Intervals of all conditions are combined first, so rows in overlapping slices are selected only once
+        interval_sets = [self._condition_intervals(con) for con in conditions]
+        if combine == 'and':
+            intervals = interval_sets[0]
+            for i in interval_sets[1:]:
+                intervals = intervals & i
+        else:
+            intervals = interval_sets[0].union(*interval_sets[1:])
 
-                # Get the list of time slices satisfying the given condition
-                if (index is None):
-                    continue
-                slices = self.timeslices(index)
-                for time_frame in slices:
-                    sliced_frame = df.loc[time_frame[0]: time_frame[1]]
-                    subset_frames.append(sliced_frame)
-
-        if len(subset_frames) > 0:
-            set_frames = pd.concat(subset_frames)
-            r_new = copy.deepcopy(self)
-            r_new.dataframe = set_frames
-            return r_new
+        intervals = selection & intervals
+        if len(intervals) > 0:
+            return strymview(self, intervals, ids)
         else:
             print("No data was extracted based on the given condition(s).")
             return None
@@ -1762,12 +1755,18 @@ class strymread:
 
         - "lead vehicle present": Extracts only those message for which there was lead vehicle present.
 
+        See `msg_subset` for all available conditions and how to combine them.
+
+        return_intervalset: `bool`, default = False
+            If True, slices of each condition are returned as an `IntervalSet` of times in seconds
+
         Returns
         --------
         `list`
             A list of tuples with start and end time of slices. E.g. [(t0, t1), (t2, t3), ...] satisfying the given conditions
 
         """
+        return_intervalset = kwargs.get("return_intervalset", False)
 
         conditions  = None
         try:
@@ -1786,102 +1785,172 @@ class strymread:
         slices_set = []
         if conditions is not None:
             for con in conditions:
-                slices = []
-                index = None
-                con = con.strip()
-                con = " ".join(con.split()) # removee whitespace characters - even multiple of them and replaces them with a single whitespace
-                # get all the meassages for which lead vehicle is present.
-                if con.lower() == "lead vehicle present":
-                    msg_DSU_CRUISE = self.get_ts('DSU_CRUISE', 6)
-                    # 252m is read in the front when radar doesn't see any vehicle in the front.
-                    index = msg_DSU_CRUISE['Message'] < 252
-
-                elif con.lower() == "cruise control on":
-                    acc_state = self.acc_state()
-                    # acc state of 6 denotes that cruise control was enabled.
-                    index = acc_state['Message'] == 6
-
-                else:
-                    conlower = con.lower()
-                    constrip = conlower.split()
-                    if len(constrip) < 3:
-                        print("Unsupported conditions provided. See documentation for more details.")
-                        raise ValueError("Unsupported conditions provided. See documentation for more details.")
-                        return None
-
-                    operators = ['<', '>', '>=','<=','==','!=']
-                    operand = ['speed', 'acceleration', 'lead_distance', 'steering_angle', 'steering_rate', 'yaw_rate' ]
-
-                    valuecheck = False
-                    value = None
-                    try:
-                        value = float(constrip[2])
-                        valuecheck = True
-                    except ValueError:
-                        valuecheck = False
-
-                    # This is equivalent to pattern: `operator op value`
-                    if (constrip[0] in operand) & (constrip[1] in operators) & (valuecheck):
-                        if constrip[0] == 'speed':
-                            speed = self.speed()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'acceleration':
-                            acceleration = self.accelx()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_angle':
-                            steering_angle = self.steer_angle()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_rate':
-                            steering_rate = self.steer_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'steering_rate':
-                            steering_rate = self.steer_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                        elif constrip[0] == 'yaw_rate':
-                            yaw_rate = self.yaw_rate()
-                            bool_result = eval(conlower)
-                            index = bool_result['Message']
-
-                    elif (constrip[0].split('.')[0].isdigit()) &  (constrip[0].split('.')[2].lower()  == 'message') & (constrip[1] in operators) & (valuecheck):
-                        # above condition check something like 386.LONG_DIST.Message > 34.0 where 345 is a valid message id.
-                        required_id =  int(constrip[0].split('.')[0])
-
-                        if constrip[0].split('.')[1].isdigit():
-                            required_signal = int(constrip[0].split('.')[1])
-                        else:
-                            required_signal = constrip[0].split('.')[1].upper()
-
-                        if required_id not in self.messageIDs():
-                            raise ValueError('Request Message ID {} was unavailable in the data file {}'.format(required_id,  self.csvfile))
-
-
-                        ts = self.get_ts(required_id, required_signal)
-
-                        bool_result = eval("ts " + constrip[1] + constrip[2])
-                        index = bool_result['Message']
-
                 # Get the list of time slices satisfying the given condition
-                if (index is None):
-                    continue
-                slices = self.timeslices(index)
-                slices_set.append(slices)
+                intervals = self._condition_intervals(con)
+                if return_intervalset:
+                    slices_set.append(intervals)
+                else:
+                    slices_set.append(intervals.to_timestamps())
 
         return slices_set
 
-    def export2mat(self, force_rewrite=False):
+    def _cache(self):
+        """
+        Cache of decoded data for the current `dataframe`. The cache is discarded whenever
+        `dataframe` is replaced by another dataframe.
+        """
+        if getattr(self, '_cache_owner', None) is not self.dataframe:
+            self._decoded = {}
+            self._cache_owner = self.dataframe
+        return self._decoded
+
+    def events(self, detectors = None, **kwargs):
+        """
+        Detect driving events such as hard braking, cut-ins, stop-and-go and ACC engagement. Detection is vectorized
+        with hysteresis thresholds, minimum durations and debouncing. See the `events` module for each detector's options.
+
+        Parameters
+        -------------
+        detectors: `list`
+            Names of detectors among "hard_brake", "cut_in", "stop_and_go" and "acc_engagement". By default, all of them.
+
+        kwargs: variable list of argument in the dictionary format
+            Options of each detector as a dictionary keyed by detector name
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            Interval table of all events with Event, Start, End and Duration columns (time in seconds), sorted by Start
+
+        Example
+        ----------
+        >>> r0 = strymread(csvfile=csvdata)
+        >>> ev = r0.events(hard_brake={'threshold': -4.0, 'min_duration': 0.5})
+        """
+        return event_detectors.detect(self, detectors, **kwargs)
+
+    def set_dedup_policy(self, policy, topic = "default"):
+        """
+        Set how messages of a topic received more than once (within `dedup_tolerance` seconds) are deduplicated when decoded.
+
+        Messages such as acceleration, speed may come on multiple buses as observed from data obtained from
+        Toyota RAV4 and Honda Pilot, and often they are copy of each other. The policy is applied once when the
+        topic is decoded, so topic methods such as `speed()` always return deduplicated data.
+
+        Parameters
+        -------------
+        policy: `str` | `int`
+            "first" (default): keep the message received first
+
+            "last": keep the message received last
+
+            "mean": average the messages
+
+            `int`: keep the messages received on this bus, or the first ones if the topic was never received on this bus
+
+        topic: `str`, default="default"
+            Topic such as "speed", "accelx" for which the policy is set. "default" applies to all topics without their own policy.
+
+        Example
+        ----------
+        >>> r0 = strymread(csvfile=csvdata, dedup={"speed": 0})
+        >>> r0.set_dedup_policy("mean", topic = "accelx")
+        """
+        if not (isinstance(policy, (int, np.integer)) or policy in ['first', 'last', 'mean']):
+            raise ValueError("Deduplication policy must be 'first', 'last', 'mean' or an integer bus ID")
+        # a new dictionary, since views of this object start from the same one
+        dedup = dict(self.dedup)
+        dedup[topic] = policy
+        self.dedup = dedup
+
+    def _topic_ts(self, topic):
+        """
+        Decoded timeseries of a topic, deduplicated according to the topic's policy (see `set_dedup_policy`) and without Bus column.
+        Each topic is deduplicated only once per policy and cached.
+        """
+        policy = self.dedup.get(topic, self.dedup.get("default", "first"))
+        tolerance = self.dedup_tolerance
+        cache = self._cache()
+        key = ('topic', topic, policy, tolerance)
+        if key not in cache:
+            d = self.topic2msgs(topic)
+            ts = self.get_ts(d['message'], d['signal'])
+            if isinstance(policy, (int, np.integer)):
+                ts = strymread.remove_duplicates(ts, prefer_bus = policy, tolerance = tolerance)
+            else:
+                ts = strymread.remove_duplicates(ts, keep = policy, tolerance = tolerance)
+            if 'Bus' in ts.columns:
+                ts = ts.drop(columns=['Bus'])
+            cache[key] = ts
+        return cache[key].copy()
+
+    def _condition_series(self, operand):
+        """
+        Decoded timeseries of an operand of a condition, as a tuple of numpy arrays `(time, values)` sorted by time.
+        Each operand is decoded only once and cached.
+
+        Parameters
+        -------------
+        operand: `str`
+            Operand name as listed in `msg_subset`, topic name, `acc_state`, or `ID.SIGNAL.message`
+        """
+        cache = self._cache()
+        key = ('condition', operand)
+        if key in cache:
+            return cache[key]
+
+        parts = operand.split('.')
+        if operand == 'acc_state':
+            ts = self.acc_state()
+        elif len(parts) == 3 and parts[0].isdigit():
+            # operand such as 386.LONG_DIST.message where 386 is a valid message id.
+            required_id = int(parts[0])
+            required_signal = int(parts[1]) if parts[1].isdigit() else parts[1]
+
+            if required_id not in self.messageIDs():
+                raise ValueError('Request Message ID {} was unavailable in the data file {}'.format(required_id,  self.csvfile))
+
+            ts = self.get_ts(required_id, required_signal)
+        else:
+            topic = condition.OPERAND_TOPICS.get(operand, operand)
+            try:
+                ts = self._topic_ts(topic)
+            except KeyError:
+                raise ValueError("Unsupported operand '{}' in conditions. See documentation for more details.".format(operand))
+
+        timepoints = ts['Time'].values.astype(float)
+        values = pd.to_numeric(ts['Message'], errors='coerce').values.astype(float)
+        order = np.argsort(timepoints, kind='stable')
+        cache[key] = (timepoints[order], values[order])
+        return cache[key]
+
+    def _condition_intervals(self, conditions):
+        """
+        Time intervals satisfying a condition, evaluated in a single vectorized pass
+
+        Parameters
+        -------------
+        conditions: `str`
+            Human readable condition, see `msg_subset`
+
+        Returns
+        ----------
+        `IntervalSet`
+            Time intervals in seconds during which the condition was satisfied
+        """
+        node = condition.compile_condition(conditions)
+        series = {operand: self._condition_series(operand) for operand in node.operands()}
+        grid, mask = condition.evaluate(node, series)
+        return condition.intervals(grid, mask)
+
+    def export2mat(self, force_rewrite=False, **kwargs):
         """
         Extract the known messages in MAT file for further downstream analysis
 
+        Messages of the DBC file are decoded in parallel worker processes, every frame a single time for all signals of its message,
+        and each variable is appended to the MAT file as soon as its message is decoded. At most `workers` decoded
+        messages are held in memory at a time.
+
         Parameters
         -------------
 
@@ -1889,6 +1958,19 @@ class strymread:
             If the mat file exists then `force_rewrite=True` regenerates the file and overwrite the existing one.
             If the mat file doesn't exist, then this parameter will be ignored.
 
+        kwargs: variable list of argument in the dictionary format
+
+        workers: `int`, default = 1
+            Number of worker processes decoding messages. By default, messages are decoded in the calling process.
+            Scripts that use more than one worker need an `if __name__ == '__main__'` guard on platforms that spawn processes.
+
+        version: `str`, default = "5"
+            MAT file version, "5" or "7.3" (HDF5-based, with chunked and compressed variables, requires `h5py`).
+            See `MatWriter`.
+
+        verbose: `bool`, default = False
+            If True, print the name of each message as it is extracted
+
         Returns
         -----------
         `list`:
@@ -1902,77 +1984,233 @@ class strymread:
         if checkfile:
             print("Data file {} already exists".format(matfile))
 
-        if force_rewrite:
-            print("Overwriting ...\n")
-        else:
-            print("No overwriting. Pass 'force_rewrite=True' to overwrite the extracted data file.")
-            return
+            if force_rewrite:
+                print("Overwriting ...\n")
+            else:
+                print("No overwriting. Pass 'force_rewrite=True' to overwrite the extracted data file.")
+                return
 
         if self.dbcfile == '':
             self._set_dbc()
 
-        import scipy.io as sio
-
         db = self.candb
 
         if db is None:
             raise ValueError("No CAN Database found. Unable to extract data")
 
-        speed = self.speed()
-        accely = self.accely()
-        accelx = self.accelx()
-        accelz = self.accelz()
-       # steer_torque = self.steer_torque()
-        yaw_rate = self.yaw_rate()
-        steer_rate = self.steer_rate()
-        steer_angle = self.steer_angle()
-        steer_fraction = self.steer_fraction()
-        wheel_speed_fl = self.wheel_speed_fl()
-        wheel_speed_fr = self.wheel_speed_fr()
-        wheel_speed_rr = self.wheel_speed_rr()
-        wheel_speed_rl = self.wheel_speed_rl()
-
-
-        track_ids = np.arange(0,16)
-        long_dist = self.long_dist(track_ids)
-        lat_dist = self.lat_dist(track_ids)
-        rel_velocity = self.rel_velocity(track_ids)
-        rel_accel = self.rel_accel(track_ids)
-        acc_state = self.acc_state()
-        lead_distance = self.lead_distance()
+        workers = kwargs.get("workers", 1)
+        version = kwargs.get("version", "5")
+        verbose = kwargs.get("verbose", False)
 
         dt_object = datetime.datetime.fromtimestamp(time.time())
         creation_date = dt_object.strftime('%Y-%m-%d-%H-%M-%S-%f')
 
         import socket
         system_name = socket.gethostname()
-        variable_dictionary = {}
-        variable_dictionary = { 'speed': speed.to_numpy(), 'accely': accely.to_numpy(), 'accelx': accelx.to_numpy(), 'accelz': accelz.to_numpy(),
-            'yaw_rate': yaw_rate.to_numpy(), 'steer_rate': steer_rate.to_numpy(),
-            'steer_angle': steer_angle.to_numpy(), 'steer_fraction': steer_fraction.to_numpy(), 'wheel_speed_fl': wheel_speed_fl.to_numpy(),
-            'wheel_speed_fr': wheel_speed_fr.to_numpy(), 'wheel_speed_rr': wheel_speed_rr.to_numpy(),
-            'wheel_speed_rl': wheel_speed_rl.to_numpy(), 'acc_state': acc_state, 'lead_distance': lead_distance.to_numpy(), 'creation_date': creation_date,
-            'system_name': system_name }
-
-        for i in range(0, 16):
-            variable_dictionary['long_dist_' + str(i)] = long_dist[0].to_numpy()
-            variable_dictionary['lat_dist_' + str(i)] = lat_dist[0].to_numpy()
-            variable_dictionary['rel_velocity_' + str(i)] = rel_velocity[0].to_numpy()
-            variable_dictionary['rel_accel_' + str(i)] = rel_accel[0].to_numpy()
-
-        for message in db.messages:
-            print("Extracting {}".format(message.name))
-            for signal in message.signal_tree:
-                print("\t{}".format(signal))
-                df = self.get_ts(msg=message.name, signal=signal)
-                variable_dictionary[message.name+'_'+signal] = df.to_numpy()
-
-        sio.savemat(matfile, variable_dictionary)
+
+        with MatWriter(matfile, version = version) as writer:
+            writer.write('speed', self.speed())
+            writer.write('accely', self.accely())
+            writer.write('accelx', self.accelx())
+            writer.write('accelz', self.accelz())
+            writer.write('yaw_rate', self.yaw_rate())
+            writer.write('steer_rate', self.steer_rate())
+            writer.write('steer_angle', self.steer_angle())
+            writer.write('steer_fraction', self.steer_fraction())
+            writer.write('wheel_speed_fl', self.wheel_speed_fl())
+            writer.write('wheel_speed_fr', self.wheel_speed_fr())
+            writer.write('wheel_speed_rr', self.wheel_speed_rr())
+            writer.write('wheel_speed_rl', self.wheel_speed_rl())
+            writer.write('acc_state', self.acc_state())
+            writer.write('lead_distance', self.lead_distance())
+            writer.write('creation_date', creation_date)
+            writer.write('system_name', system_name)
+
+            # Radar traces by track id (lists returned for several track ids skip the empty tracks)
+            for i in range(0, 16):
+                writer.write('long_dist_' + str(i), self.long_dist(i))
+                writer.write('lat_dist_' + str(i), self.lat_dist(i))
+                writer.write('rel_velocity_' + str(i), self.rel_velocity(i))
+                writer.write('rel_accel_' + str(i), self.rel_accel(i))
+
+            # Decoded messages are written in the order of the DBC file, with at most `workers` of them in flight
+            for message, decoded in self._decode_messages(db.messages, workers = workers):
+                if verbose:
+                    print("Extracting {}".format(message.name))
+                for signal_name, df in decoded.items():
+                    writer.write(message.name+'_'+signal_name, df)
 
         files_written = []
         files_written.append(matfile)
 
-        return files_written
+        return files_written
+
+    def _decode_message(self, message, wide = False):
+        """
+        Decodes all signals of a DBC message. Returns a dictionary of timeseries keyed by signal name,
+        or a single table with a column per signal if `wide` is True (see `DBC_Read_Tools.convertMessage`).
+        """
+        try:
+            return dbc.convertMessage(message.name, self.dataframe, self.candb, wide = wide)
+        except ValueError as e:
+            if wide:
+                print("Unable to decode {}: {}".format(message.name, e))
+                return None
+            # e.g. 4-byte acceleration messages of the hybrid RAV4, handled by `get_ts`
+            return {signal.name: self.get_ts(message.name, signal.name) for signal in message.signals}
+
+    def _decode_frames(self, message_name, frames, wide = False):
+        """
+        Decodes the `frames` of a single message in the calling process, see `DBC_Read_Tools.convertMessage`.
+        Frames that fail to decode are skipped. Neither `self.dataframe` nor the cache of `get_ts` is changed.
+        """
+        try:
+            return dbc.convertMessage(message_name, frames, self.candb, wide = wide)
+        except (ValueError, cantools.database.DecodeError):
+            pass
+
+        valid = np.zeros(len(frames), dtype = bool)
+        for i, payload in enumerate(frames['Message'].values):
+            try:
+                self.candb.decode_message(message_name, bytes.fromhex(payload))
+                valid[i] = True
+            except (ValueError, TypeError, cantools.database.DecodeError):
+                continue
+        return dbc.convertMessage(message_name, frames[valid], self.candb, wide = wide)
+
+    def _decode_messages(self, messages, wide = False, workers = 1):
+        """
+        Decodes DBC messages, see `_decode_message`. Yields `(message, decoded)` in the order of `messages`.
+
+        By default, messages are decoded one after the other in the calling process. With `workers` greater than one,
+        the frames of each message are decoded in a pool of worker processes instead, since decoding holds the GIL.
+        Worker processes only receive the frames of a message and the DBC database, and decoded data is handled
+        in the calling thread only. At most `workers` decoded messages are held in memory at a time.
+        Messages that the worker processes fail to decode are decoded again from the same frames by `_decode_frames`.
+        Scripts that use worker processes need an `if __name__ == '__main__'` guard on platforms that spawn processes.
+        """
+        if workers <= 1:
+            for message in messages:
+                yield message, self._decode_message(message, wide)
+            return
+
+        df = self.dataframe
+        positions = df.groupby('MessageID').indices
+
+        def result(message, frames, future):
+            try:
+                return message, future.result()
+            except (ValueError, cantools.database.DecodeError):
+                return message, self._decode_frames(message.name, frames, wide)
+
+        pending = []
+        with ProcessPoolExecutor(max_workers = workers, initializer = _init_decode_worker, initargs = (self.candb,)) as executor:
+            for message in messages:
+                frames = df.iloc[positions.get(message.frame_id, [])]
+                pending.append((message, frames, executor.submit(_decode_worker_frames, message.name, frames, wide)))
+                if len(pending) >= workers:
+                    yield result(*pending.pop(0))
+            while pending:
+                yield result(*pending.pop(0))
+
+    def _prefetch(self, topics, workers = 1):
+        """
+        Decodes the messages of topics (see `topic_message_ids`) that are not cached yet (see `_decode_messages`),
+        and caches all of their signals for `get_ts`. Topics that can't be resolved to messages are left to be decoded by their methods.
+        """
+        cache = self._cache()
+        messages = []
+        for topic in topics:
+            try:
+                ids = self.topic_message_ids([topic])
+            except (ValueError, KeyError):
+                continue
+            for frame_id in ids:
+                message = self.candb.get_message_by_frame_id(frame_id)
+                if message in messages or all(('ts', message.name, signal.name) in cache for signal in message.signals):
+                    continue
+                messages.append(message)
+
+        for message, decoded in self._decode_messages(messages, workers = workers):
+            for signal_name, ts in decoded.items():
+                self._cache().setdefault(('ts', message.name, signal_name), ts)
+
+    def export_dataset(self, root, partition_by = ('vin', 'date', 'message'), **kwargs):
+        """
+        Exports all messages of the DBC file, decoded, to a partitioned columnar dataset of Parquet files
+        that many drives can be exported to. Requires `pyarrow`.
+
+        Each message is decoded in a single pass into a table with columns Time, Bus and one column per signal,
+        and written in Hive-style `key=value` directories, e.g. `root/vin=<vin>/date=<YYYY-MM-DD>/message=SPEED/<drive>.parquet`.
+        The manifest `root/_manifest.json` lists every file with its partition values and minimum/maximum time,
+        so that `read_dataset` prunes files without opening them.
+
+        Parameters
+        -------------
+        root: `str`
+            Root directory of the dataset
+
+        partition_by: `tuple`, default=("vin", "date", "message")
+            Partition keys, in the order of directory levels. Any of "vin", "date" (UTC), "message" and "bus".
+            All drives exported to a dataset must use the same partition keys.
+
+        kwargs: variable list of argument in the dictionary format
+
+        drive: `str`, default = name of the csvfile without extension
+            Identifier of the drive. Exporting a drive again replaces its files.
+
+        messages: `list`, default = None
+            Names of the messages to export. All messages of the DBC file are exported if None.
+
+        workers: `int`, default = 1
+            Number of worker processes decoding messages. By default, messages are decoded in the calling process.
+            Scripts that use more than one worker need an `if __name__ == '__main__'` guard on platforms that spawn processes.
+
+        verbose: `bool`, default = False
+            If True, print the name of each message as it is exported
+
+        Returns
+        -----------
+        `list`
+            Manifest entries of the files written
+
+        Example
+        ----------
+        >>> import strym
+        >>> from strym import strymread, read_dataset
+        >>> r0 = strymread(csvfile='2020-03-20-13-17-30_2T3MWRFVXLW056972_CAN_Messages.csv')
+        >>> r0.export_dataset('fleet')
+        >>> speed = read_dataset('fleet', messages=['SPEED'], vins=['2T3MWRFVXLW056972'])['SPEED']
+        """
+        if self.dbcfile == '':
+            self._set_dbc()
+
+        db = self.candb
+
+        if db is None:
+            raise ValueError("No CAN Database found. Unable to extract data")
+
+        drive = kwargs.get("drive", None)
+        if drive is None:
+            drive = os.path.splitext(self.basefile)[0] if self.csvfile else "drive_{}".format(int(self.dataframe['Time'].iloc[0]))
+        names = kwargs.get("messages", None)
+        workers = kwargs.get("workers", 1)
+        verbose = kwargs.get("verbose", False)
+
+        messages = [message for message in db.messages if names is None or message.name in names]
+
+        # Decoded messages are written in the order of the DBC file, with at most `workers` of them in flight
+        entries = []
+        for message, table in self._decode_messages(messages, wide = True, workers = workers):
+            if table is None or table.empty:
+                continue
+            if verbose:
+                print("Exporting {}".format(message.name))
+            entries.extend(dataset.write_message(root, table, message.name, self.vin, drive, partition_by))
+
+        dataset.update_manifest(root, entries, partition_by)
+
+        return entries
 
     def load_data(self):
         """
@@ -2019,147 +2257,103 @@ class strymread:
         ]
         return dfs
     
-    def state_space(self, rate = 20, cont_method = 'nearest', cat_method = 'nearest', todb = False):
+    def state_space(self, rate = 20, cont_method = 'nearest', cat_method = 'nearest', todb = False, **kwargs):
         """
         `state_space` generates a DataFrame with Time column and several other signals - uniformly
         sampled with common start and end-points for further downstream analysis
-        """
-
-        speed = self.speed()
-        distance_covered  = self.integrate(speed)
-        accelx = self.accelx()
-        accely = self.accely()
-        accelz = self.accelz()
-        yaw_rate = self.yaw_rate()
-        steer_rate = self.steer_rate()
-        steer_angle = self.steer_angle()
-        steer_fraction = self.steer_fraction()
-        wheel_speed_fl = self.wheel_speed_fl()
-        wheel_speed_fr = self.wheel_speed_fr()
-        wheel_speed_rl = self.wheel_speed_rl()
-        wheel_speed_rr = self.wheel_speed_rr()
-        lead_distance = self.lead_distance()
-        acc_status = self.acc_state()
-
-        # #we will be estimating relative velocity  based on lead distance data using AE method
-        # # For that first we will need to divide data into chunks
-        # chunks = strymread.create_chunks(lead_distance, column_of_interest = "Message", plot = False)
-        # relative_vel_list = []
-        # for c  in chunks:
-        #     cdiff = strymread.differentiate(c, method="AE")
-        #     relative_vel_list.append(cdiff)
-
-        # relative_vel = pd.concat(relative_vel_list)
-        # relative_vel.sort_index(inplace=True)
 
-        relative_vel = self.relative_vel()
-
-        dfs = [speed, distance_covered, accelx, accely, accelz, 
-               yaw_rate, steer_rate, steer_angle, steer_fraction, wheel_speed_fl,
-               wheel_speed_fr, wheel_speed_rl, wheel_speed_rr, lead_distance, acc_status,
-               relative_vel]
+        Messages of the topics are decoded in worker processes (reusing any decode already cached on this object) and all
+        signals are interpolated onto one shared time grid spanning the latest start and
+        the earliest end among all of the signals, in steps of exactly `1/rate`.
 
-        states = [ "speed", "distance_covered", "accelx", "accely", "accelz",
-                    "yaw_rate", "steer_rate", "steer_angle", "steer_fraction", "wheel_speed_fl",
-                    "wheel_speed_fr", "wheel_speed_rl", "wheel_speed_rr", "lead_distance", "acc_status",
-                    "relative_vel"]
+        Parameters
+        -------------
+        rate: `double`, default=20
+            Sampling rate of the state space in Hz
 
-        #categorical_index = [16]
+        cont_method: `str`, default="nearest"
+            Interpolation method for numerical signals: "nearest", "linear", "previous", "cubic" or "decimate"
+            for anti-aliased downsampling (see `resample_many`)
 
-        categorical_index = [ "numerical", "numerical", "numerical", "numerical", "numerical", 
-                             "numerical","numerical", "numerical", "numerical", "numerical",
-                             "numerical", "numerical", "numerical", "numerical", "categorical",
-                             "numerical"]
-        
+        cat_method: `str`, default="nearest"
+            Interpolation method for categorical signals
 
-        # Step 1. Find the latest start point among all of the signals.
-        # Step 2. Find the earliest end point among all of the signals.
-        # Step 3. Calculate the value at those point for all of the signals
-        # Step 4. Truncate anything before the common first point
-        # Step 5. Truncate anything after the common end point.
+        todb: `bool`, default=False
+            If True, state space is also written to STATE_SPACE table of the database at `db_location`
 
-        start_points = []
-        end_points = []
+        workers: `int`, default=1
+            Number of worker processes decoding the messages of the topics. By default, messages are decoded in the calling process.
+            Scripts that use more than one worker need an `if __name__ == '__main__'` guard on platforms that spawn processes.
 
-        # print(dfs)
+        compact: `bool`, default=False
+            If True, returns a `float32` matrix with one column per signal, along with a schema dictionary
+            instead of a DataFrame
 
-        for i, d in enumerate(dfs):
-    
-            if(d.shape[0]==0):
-                continue
-            start_points.append(d['Time'].iloc[0])
-            end_points.append(d['Time'].iloc[-1])
+        verbose: `bool`
+            Overrides verbosity of the `strymread` object for this call
 
-        # Step 1
-        common_start_point  = np.max(start_points)
+        max_gap: `double`, default=None
+            If given, a signal is NaN at grid points inside its dropouts longer than `max_gap` seconds,
+            instead of being interpolated across them
 
-        argmax = [i for i, j in enumerate(start_points) if j == common_start_point]
-        common_start_clock = pd.to_datetime(common_start_point, unit='s')
+        Returns
+        ----------
+        `pandas.DataFrame`
+            Time column followed by one column per signal, indexed by Clock.
 
-        # Step 2
-        common_end_point  = np.min(end_points)
-        argmin =  [i for i, j in enumerate(end_points) if j == common_end_point]
-        common_end_clock = pd.to_datetime(common_end_point, unit='s')
+        (`numpy.ndarray`, `dict`)
+            If `compact=True`: `float32` matrix of shape (number of grid points, number of signals), and a schema dictionary with
+            keys "columns" (signal names), "kinds" ("numerical" or "categorical"), "rate" and "time" (`float64` time grid).
+        """
+        workers = kwargs.get("workers", 1)
+        compact = kwargs.get("compact", False)
+        verbose = kwargs.get("verbose", self.verbose)
+        max_gap = kwargs.get("max_gap", None)
 
-        dflist = []
+        decoded = self._state_space_series(workers = workers)
 
-        # Step 3
+        # Signals missing from the data are left out of the state space
         state_header = []
-        for i, d in enumerate(dfs):
-            print(i)
-            print(states[i])
-            if(d.shape[0]==0):
+        kinds = []
+        series = []
+        for state, _, kind in strymread.STATE_SPACE_SIGNALS:
+            timepoints, values = decoded[state]
+            if timepoints.shape[0] == 0:
+                if verbose:
+                    print("No data for {}, it will not be included in the state space.".format(state))
                 continue
-            if i  not in argmax:              
-                d = pd.concat([d, pd.DataFrame({'Time':common_start_point, 'Message':float("NAN")},
-                      index = [common_start_clock])], sort=False)
+            state_header.append(state)
+            kinds.append(kind)
+            series.append((timepoints, values))
 
-            d.sort_index(inplace=True)
-
-            d.bfill(inplace=True)
-
-            if i not in argmin:               
-                d = pd.concat([d, pd.DataFrame({'Time':common_end_point, 'Message':float("NAN")},
-                      index = [common_end_clock])], sort=False)
-
-            d.sort_index(inplace=True)
-
-            if categorical_index[i] == "categorical":
-                d.interpolate(method=cat_method, inplace=True)
-            else:
-                d.interpolate(method=cont_method, inplace=True)
-
-            # Step 4 and Step 5
-            d = d[(d['Time'] >= common_start_point) & (d['Time'] <= common_end_point)]
-
-            if categorical_index[i] == "categorical":
-                print("Categorical")
-                d = self.resample(d, rate=rate, categorical=True, cont_method =  cont_method, cat_method = cat_method)
-            else:
-                print("Numerical")
-                d = self.resample(d, rate=rate, categorical=False, cont_method = cont_method, cat_method = cat_method)
-
-            state_header.append(states[i])
-            dflist.append(d)
+        if len(series) == 0:
+            print("None of the state space signals are available in {}".format(self.csvfile))
+            return None
 
-        # there is a possibility that one of those resampled dataframe may be 1 row less than the others
+        # Common start point is the latest start, and common end point is the earliest end among all of the signals
+        common_start_point = max(t[0] for t, _ in series)
+        common_end_point = min(t[-1] for t, _ in series)
+        if common_end_point < common_start_point:
+            print("Signals of the state space do not overlap in time.")
+            return None
 
-        # Find the smallest dataframe size
-        smaller_df_size = min(d.shape[0] for d in dflist)
+        grid = strymread._state_space_grid(common_start_point, common_end_point, rate)
 
-        # Truncate or pad all dataframes to match the smallest size
-        for i, d in enumerate(dflist):
-            if d.shape[0] > smaller_df_size:
-                # Truncate the dataframe if it's larger than the smallest size
-                dflist[i] = d.iloc[:smaller_df_size]
-        
-        state_var = dflist[0]
-        for i, d in enumerate(dflist):
+        matrix = np.empty((grid.shape[0], len(series)), dtype=np.float32 if compact else float)
+        for kind, method in [("numerical", cont_method), ("categorical", cat_method)]:
+            columns = [i for i in range(len(series)) if kinds[i] == kind]
+            if len(columns) > 0:
+                matrix[:, columns] = strymread.resample_many([series[i] for i in columns], grid, method = method, as_array = True,
+                    max_gap = max_gap)
 
-            state_var[state_header[i]] = d['Message'].values
+        if compact and not todb:
+            schema = {"columns": state_header, "kinds": kinds, "rate": rate, "time": grid}
+            return matrix, schema
 
-        state_var.drop(columns=['Message'], inplace=True)
-        states.append("Time")
+        state_var = pd.DataFrame(matrix, columns = state_header)
+        state_var.insert(0, 'Time', grid)
+        state_var = strymread.timeindex(state_var)
+        states = ["Time"] + state_header
 
         if todb:
             # TODO: modify the query if one of the variable is empty
@@ -2176,13 +2370,55 @@ class strymread:
 
             
             try:
-                state_var[states].to_sql(self.raw_table, con=dbconnection, index=True, if_exists='append')
+                state_var[states].to_sql(state_space_table, con=dbconnection, index=True, if_exists='append')
             except sqlite3.IntegrityError as e:
                 if self.verbose:
                     print("Insertion of raw CAN messages to STATE_SPACE table failed due to primary key violation. STATE_SPACE table has (Clock) primary key.")
 
+        if compact:
+            schema = {"columns": state_header, "kinds": kinds, "rate": rate, "time": grid}
+            return matrix, schema
+
         return state_var
 
+    @staticmethod
+    def _state_space_grid(start, end, rate, first = 0):
+        """
+        Time grid of the state space, from `start` in steps of exactly `1/rate` up to `end` included, starting at its `first`-th point.
+        `streaming.StateSpaceBuilder` extends the grid with the same points as it receives data.
+        """
+        last = int(np.floor((end - start)*rate))
+        grid = start + np.arange(first, last + 1)/rate
+        # floating point rounding may put the last grid point past the end
+        return grid[grid <= end]
+
+    def _state_space_series(self, workers = 1):
+        """
+        Decode the signals of `STATE_SPACE_SIGNALS`, each of their messages once (see `_prefetch`), as a dictionary of sorted numpy arrays `(time, values)`
+        with unique time points. Signals without data have empty arrays.
+        """
+        topics = {state: topic for state, topic, _ in strymread.STATE_SPACE_SIGNALS if topic is not None}
+
+        # messages are decoded once for all of their signals, and topic methods then read them from the cache
+        self._prefetch(topics.values(), workers = workers)
+        decoded = {state: getattr(self, topic)() for state, topic in topics.items()}
+
+        series = {}
+        for state, d in decoded.items():
+            timepoints = d['Time'].values.astype(float)
+            values = pd.to_numeric(d['Message'], errors='coerce').values.astype(float)
+            if not np.all(np.diff(timepoints) > 0):
+                timepoints, unique_index = np.unique(timepoints, return_index=True)
+                values = values[unique_index]
+            series[state] = (timepoints, values)
+
+        timepoints, speed = series["speed"]
+        if timepoints.shape[0] > 0:
+            series["distance_covered"] = (timepoints, integrate.cumulative_trapezoid(speed, timepoints, initial=0.0))
+        else:
+            series["distance_covered"] = (timepoints, speed)
+        return series
+
     @staticmethod
     def create_chunks(df, continuous_threshold = 3.0, column_of_interest = 'Message', plot = False):
         """
@@ -2225,26 +2461,14 @@ class strymread:
 
         df = strymread.remove_duplicates(df)
 
+        # Change point detection: a new chunk starts wherever two consecutive values of
+        # column of interest differ by more than `continuous_threshold`
         chunksdf_list = []
-        for i, msg in df.iterrows():
-
-            if i == df.index[0]:
-                start = i
-                last = i
-                continue
-
-            # Change point detection
-            if np.abs(msg[column_of_interest] - df.loc[last][column_of_interest]) > continuous_threshold:
-                chunk = df.loc[start:last]
-                start = i
-                chunksdf_list.append(chunk)
-
-            last = i
-
-            # when the last message is read
-            if i == df.index[-1]:
-                chunk = df.loc[start:last]
-                chunksdf_list.append(chunk)
+        if df.shape[0] > 1:
+            values = np.asarray(df[column_of_interest].values, dtype=float)
+            change_points = np.flatnonzero(np.abs(np.diff(values)) > continuous_threshold) + 1
+            for rows in np.split(np.arange(df.shape[0]), change_points):
+                chunksdf_list.append(df.iloc[rows[0]:rows[-1] + 1])
 
         if plot:
             fig, ax = strymread.create_fig(num_of_subplots=1)
@@ -2289,6 +2513,64 @@ class strymread:
         # TODO add an exception here if the d return value is empty
         return d
 
+    def topic_message_ids(self, topics):
+        """
+        Message IDs needed to decode topics, e.g. to read only those messages from a database with `from_db`
+
+        Parameters
+        -------------
+        topics: `list`
+            Topic names (see `topic2msgs`), `acc_state`, operands of conditions (see `msg_subset`)
+            or signals specified as `ID.SIGNAL.Message`
+
+        Returns
+        -------------
+        `list`
+            Sorted message IDs
+        """
+        return strymread.dbc_message_ids(topics, self.candb, self.dbcdict.get(self.inferred_dbc, {}))
+
+    @staticmethod
+    def dbc_message_ids(topics, candb, topic_map):
+        """
+        Message IDs of a DBC database needed to decode topics, without reading any CAN data. See `topic_message_ids`.
+
+        Parameters
+        -------------
+        topics: `list`
+            Topic names (see `topic2msgs`), `acc_state`, operands of conditions (see `msg_subset`)
+            or signals specified as `ID.SIGNAL.Message`
+
+        candb: `cantools.database.Database`
+            CAN database of the DBC file
+
+        topic_map: `dict`
+            Message and signal of each topic for the DBC file, e.g. `strymread.topic_map()['toyota_rav4_2019.dbc']`
+
+        Returns
+        -------------
+        `list`
+            Sorted message IDs
+        """
+        ids = set()
+        for topic in topics:
+            parts = topic.split('.')
+            if len(parts) == 3 and parts[0].isdigit():
+                ids.add(int(parts[0]))
+                continue
+
+            if topic == 'acc_state':
+                message = 'PCM_CRUISE_SM'
+            else:
+                try:
+                    message = topic_map[condition.OPERAND_TOPICS.get(topic, topic)]['message']
+                except KeyError:
+                    raise ValueError("Unsupported topic '{}'. See documentation for more details.".format(topic))
+
+            ids.add(message if isinstance(message, int) else candb.get_message_by_name(message).frame_id)
+
+        return sorted(ids)
+
     def _dbc_addTopic(self,dbcfile,topic,message,signal):
         """
         Add a new message/signal pair to a topic of interest for this DBC file. For example,
@@ -2333,6 +2615,19 @@ class strymread:
         -------------
         None
 
+        """
+        self.dbcdict = strymread.topic_map()
+
+    @staticmethod
+    def topic_map():
+        """
+        Message and signal of each topic for all potential DBC files we are using, keyed by the name of the DBC file
+        (without the path). See `_dbc_init_dict`.
+
+        Returns
+        -------------
+        `dict`
+            A new dictionary, e.g. `strymread.topic_map()['toyota_rav4_2019.dbc']['speed']` is `{'message': 'SPEED', 'signal': 1}`
         """
         toyota_rav4_2019='toyota_rav4_2019.dbc'
         toyota_rav4_2020='toyota_rav4_2020.dbc'
@@ -2340,105 +2635,110 @@ class strymread:
         honda='honda_pilot_2017.dbc'
         nissan_rogue_2021='nissan_rogue_2021.dbc'
 
-        self.dbcdict={  toyota_rav4_2019: { },
-                        toyota_rav4_2020: { },
-                        toyota_rav4_2021: { },
-                        honda : { },
-                        nissan_rogue_2021: { }
-                    }
-
-        self._dbc_addTopic(toyota_rav4_2019,'speed','SPEED',1)
-        self._dbc_addTopic(toyota_rav4_2019,'speed_limit','RSA1','SPDVAL1')
-        self._dbc_addTopic(toyota_rav4_2019,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
-        self._dbc_addTopic(toyota_rav4_2019,'accely','KINEMATICS','ACCEL_Y')
-        self._dbc_addTopic(toyota_rav4_2019,'accelx','ACCELEROMETER','ACCEL_X')
-        self._dbc_addTopic(toyota_rav4_2019,'accelz','ACCELEROMETER','ACCEL_Z')
-        self._dbc_addTopic(toyota_rav4_2019,'steer_torque','KINEMATICS','STEERING_TORQUE')
-        self._dbc_addTopic(toyota_rav4_2019,'yaw_rate','KINEMATICS','YAW_RATE')
-        self._dbc_addTopic(toyota_rav4_2019,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
-        self._dbc_addTopic(toyota_rav4_2019,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
-        self._dbc_addTopic(toyota_rav4_2019,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
-        self._dbc_addTopic(toyota_rav4_2019,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
-        self._dbc_addTopic(toyota_rav4_2019,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
-        self._dbc_addTopic(toyota_rav4_2019,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
-        self._dbc_addTopic(toyota_rav4_2019,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
-        self._dbc_addTopic(toyota_rav4_2019,'relative_vel','DSU_CRUISE','REL_SPEED')
-
-
-
-        self._dbc_addTopic(toyota_rav4_2020,'speed','SPEED',1)
-        self._dbc_addTopic(toyota_rav4_2020,'speed_limit','RSA1','SPDVAL1')
-        self._dbc_addTopic(toyota_rav4_2020,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
-        self._dbc_addTopic(toyota_rav4_2020,'accely','KINEMATICS','ACCEL_Y')
-        self._dbc_addTopic(toyota_rav4_2020,'accelx','ACCELEROMETER','ACCEL_X')
-        self._dbc_addTopic(toyota_rav4_2020,'accelz','ACCELEROMETER','ACCEL_Z')
-        self._dbc_addTopic(toyota_rav4_2020,'steer_torque','KINEMATICS','STEERING_TORQUE')
-        self._dbc_addTopic(toyota_rav4_2020,'yaw_rate','KINEMATICS','YAW_RATE')
-        self._dbc_addTopic(toyota_rav4_2020,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
-        self._dbc_addTopic(toyota_rav4_2020,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
-        self._dbc_addTopic(toyota_rav4_2020,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
-        self._dbc_addTopic(toyota_rav4_2020,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
-        self._dbc_addTopic(toyota_rav4_2020,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
-        self._dbc_addTopic(toyota_rav4_2020,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
-        self._dbc_addTopic(toyota_rav4_2020,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
-        self._dbc_addTopic(toyota_rav4_2020,'relative_vel','DSU_CRUISE','REL_SPEED')
-
-
-
-        self._dbc_addTopic(toyota_rav4_2021,'speed','SPEED',1)
-        self._dbc_addTopic(toyota_rav4_2021,'speed_limit','RSA1','SPDVAL1')
-        self._dbc_addTopic(toyota_rav4_2021,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
-        self._dbc_addTopic(toyota_rav4_2021,'accely','KINEMATICS','ACCEL_Y')
-        self._dbc_addTopic(toyota_rav4_2021,'accelx','ACCELEROMETER','ACCEL_X')
-        self._dbc_addTopic(toyota_rav4_2021,'accelz','ACCELEROMETER','ACCEL_Z')
-        self._dbc_addTopic(toyota_rav4_2021,'steer_torque','KINEMATICS','STEERING_TORQUE')
-        self._dbc_addTopic(toyota_rav4_2021,'yaw_rate','KINEMATICS','YAW_RATE')
-        self._dbc_addTopic(toyota_rav4_2021,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
-        self._dbc_addTopic(toyota_rav4_2021,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
-        self._dbc_addTopic(toyota_rav4_2021,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
-        self._dbc_addTopic(toyota_rav4_2021,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
-        self._dbc_addTopic(toyota_rav4_2021,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
-        self._dbc_addTopic(toyota_rav4_2021,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
-        self._dbc_addTopic(toyota_rav4_2021,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
-        self._dbc_addTopic(toyota_rav4_2021,'relative_vel','DSU_CRUISE','REL_SPEED')
+        dbcdict={  toyota_rav4_2019: { },
+                   toyota_rav4_2020: { },
+                   toyota_rav4_2021: { },
+                   honda : { },
+                   nissan_rogue_2021: { }
+                }
+
+        def add(dbcfile, topic, message, signal):
+            dbcdict[dbcfile][topic] = {'message': message, 'signal': signal}
+
+        add(toyota_rav4_2019,'speed','SPEED',1)
+        add(toyota_rav4_2019,'speed_limit','RSA1','SPDVAL1')
+        add(toyota_rav4_2019,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
+        add(toyota_rav4_2019,'accely','KINEMATICS','ACCEL_Y')
+        add(toyota_rav4_2019,'accelx','ACCELEROMETER','ACCEL_X')
+        add(toyota_rav4_2019,'accelz','ACCELEROMETER','ACCEL_Z')
+        add(toyota_rav4_2019,'steer_torque','KINEMATICS','STEERING_TORQUE')
+        add(toyota_rav4_2019,'yaw_rate','KINEMATICS','YAW_RATE')
+        add(toyota_rav4_2019,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
+        add(toyota_rav4_2019,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
+        add(toyota_rav4_2019,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
+        add(toyota_rav4_2019,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
+        add(toyota_rav4_2019,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
+        add(toyota_rav4_2019,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
+        add(toyota_rav4_2019,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
+        add(toyota_rav4_2019,'relative_vel','DSU_CRUISE','REL_SPEED')
+
+
+
+        add(toyota_rav4_2020,'speed','SPEED',1)
+        add(toyota_rav4_2020,'speed_limit','RSA1','SPDVAL1')
+        add(toyota_rav4_2020,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
+        add(toyota_rav4_2020,'accely','KINEMATICS','ACCEL_Y')
+        add(toyota_rav4_2020,'accelx','ACCELEROMETER','ACCEL_X')
+        add(toyota_rav4_2020,'accelz','ACCELEROMETER','ACCEL_Z')
+        add(toyota_rav4_2020,'steer_torque','KINEMATICS','STEERING_TORQUE')
+        add(toyota_rav4_2020,'yaw_rate','KINEMATICS','YAW_RATE')
+        add(toyota_rav4_2020,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
+        add(toyota_rav4_2020,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
+        add(toyota_rav4_2020,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
+        add(toyota_rav4_2020,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
+        add(toyota_rav4_2020,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
+        add(toyota_rav4_2020,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
+        add(toyota_rav4_2020,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
+        add(toyota_rav4_2020,'relative_vel','DSU_CRUISE','REL_SPEED')
+
+
+
+        add(toyota_rav4_2021,'speed','SPEED',1)
+        add(toyota_rav4_2021,'speed_limit','RSA1','SPDVAL1')
+        add(toyota_rav4_2021,'steer_angle','STEER_ANGLE_SENSOR','STEER_ANGLE')
+        add(toyota_rav4_2021,'accely','KINEMATICS','ACCEL_Y')
+        add(toyota_rav4_2021,'accelx','ACCELEROMETER','ACCEL_X')
+        add(toyota_rav4_2021,'accelz','ACCELEROMETER','ACCEL_Z')
+        add(toyota_rav4_2021,'steer_torque','KINEMATICS','STEERING_TORQUE')
+        add(toyota_rav4_2021,'yaw_rate','KINEMATICS','YAW_RATE')
+        add(toyota_rav4_2021,'steer_rate','STEER_ANGLE_SENSOR','STEER_RATE')
+        add(toyota_rav4_2021,'steer_fraction','STEER_ANGLE_SENSOR','STEER_FRACTION')
+        add(toyota_rav4_2021,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
+        add(toyota_rav4_2021,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
+        add(toyota_rav4_2021,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
+        add(toyota_rav4_2021,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
+        add(toyota_rav4_2021,'lead_distance','DSU_CRUISE','LEAD_DISTANCE')
+        add(toyota_rav4_2021,'relative_vel','DSU_CRUISE','REL_SPEED')
 
 
 # NEXT
-        self._dbc_addTopic(honda,'speed','ENGINE_DATA','XMISSION_SPEED')
-        self._dbc_addTopic(honda,'steer_angle','STEERING_SENSORS','STEER_ANGLE')
-        self._dbc_addTopic(honda,'accely','KINEMATICS','LAT_ACCEL')
-        self._dbc_addTopic(honda,'accelx','VEHICLE_DYNAMICS','LONG_ACCEL')
-        self._dbc_addTopic(honda,'steer_rate','STEERING_SENSORS','STEER_ANGLE_RATE')
-        self._dbc_addTopic(honda,'steer_torque','STEERING_CONTROL','STEER_TORQUE')
-        self._dbc_addTopic(honda,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
-        self._dbc_addTopic(honda,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
-        self._dbc_addTopic(honda,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
-        self._dbc_addTopic(honda,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
+        add(honda,'speed','ENGINE_DATA','XMISSION_SPEED')
+        add(honda,'steer_angle','STEERING_SENSORS','STEER_ANGLE')
+        add(honda,'accely','KINEMATICS','LAT_ACCEL')
+        add(honda,'accelx','VEHICLE_DYNAMICS','LONG_ACCEL')
+        add(honda,'steer_rate','STEERING_SENSORS','STEER_ANGLE_RATE')
+        add(honda,'steer_torque','STEERING_CONTROL','STEER_TORQUE')
+        add(honda,'wheel_speed_fl','WHEEL_SPEEDS','WHEEL_SPEED_FL')
+        add(honda,'wheel_speed_fr','WHEEL_SPEEDS','WHEEL_SPEED_FR')
+        add(honda,'wheel_speed_rr','WHEEL_SPEEDS','WHEEL_SPEED_RR')
+        add(honda,'wheel_speed_rl','WHEEL_SPEEDS','WHEEL_SPEED_RL')
        
 # add nissan
 
-        self._dbc_addTopic(nissan_rogue_2021,'speed','SPEED','SPEED')
-        self._dbc_addTopic(nissan_rogue_2021,'speed_limit','ACC_HUD','SET_SPEED')
-        self._dbc_addTopic(nissan_rogue_2021,'steer_angle','STEER_ANGLE','STEER_ANGLE')
-        self._dbc_addTopic(nissan_rogue_2021,'accelx','ACCEL_STEER','ACCEL_X')
-        self._dbc_addTopic(nissan_rogue_2021,'steer_torque','STEER_TORQUE_SENSOR2','STEERING_TORQUE')
-        self._dbc_addTopic(nissan_rogue_2021,'steer_rate','STEERING_WHEEL','STEER_RATE')
-        self._dbc_addTopic(nissan_rogue_2021,'wheel_speed_fl','WHEEL_ENCODERS','WHEEL_SPEED_FL')
-        self._dbc_addTopic(nissan_rogue_2021,'wheel_speed_fr','WHEEL_ENCODERS','WHEEL_SPEED_FR')
-        self._dbc_addTopic(nissan_rogue_2021,'wheel_speed_rr','WHEEL_ENCODERS','WHEEL_SPEED_RR')
-        self._dbc_addTopic(nissan_rogue_2021,'wheel_speed_rl','WHEEL_ENCODERS','WHEEL_SPEED_RL')
-        self._dbc_addTopic(nissan_rogue_2021,'lead_distance','ACC_HUD','SET_DISTANCE')
-        #self._dbc_addTopic(nissan_rogue_2021,'cruise_status','CRUISE_RELATED','ON_OFF')
-        #self._dbc_addTopic(nissan_rogue_2021,'stopped_status','BRAKE_ENGINE','STOPPED_STATE')
-
-
+        add(nissan_rogue_2021,'speed','SPEED','SPEED')
+        add(nissan_rogue_2021,'speed_limit','ACC_HUD','SET_SPEED')
+        add(nissan_rogue_2021,'steer_angle','STEER_ANGLE','STEER_ANGLE')
+        add(nissan_rogue_2021,'accelx','ACCEL_STEER','ACCEL_X')
+        add(nissan_rogue_2021,'steer_torque','STEER_TORQUE_SENSOR2','STEERING_TORQUE')
+        add(nissan_rogue_2021,'steer_rate','STEERING_WHEEL','STEER_RATE')
+        add(nissan_rogue_2021,'wheel_speed_fl','WHEEL_ENCODERS','WHEEL_SPEED_FL')
+        add(nissan_rogue_2021,'wheel_speed_fr','WHEEL_ENCODERS','WHEEL_SPEED_FR')
+        add(nissan_rogue_2021,'wheel_speed_rr','WHEEL_ENCODERS','WHEEL_SPEED_RR')
+        add(nissan_rogue_2021,'wheel_speed_rl','WHEEL_ENCODERS','WHEEL_SPEED_RL')
+        add(nissan_rogue_2021,'lead_distance','ACC_HUD','SET_DISTANCE')
+        #add(nissan_rogue_2021,'cruise_status','CRUISE_RELATED','ON_OFF')
+        #add(nissan_rogue_2021,'stopped_status','BRAKE_ENGINE','STOPPED_STATE')
+
+        return dbcdict
 
     @staticmethod
-    def integrate(df, init = 0.0, msg_axis = 'Message', integrator=integrate.cumulative_trapezoid):
+    def integrate(df, init = 0.0, msg_axis = 'Message', integrator=integrate.cumulative_trapezoid, total_only = False):
 
         """
         Integrate a timeseries data using scipy.integrate.cumtrapz
 
+        To integrate data arriving in chunks, see `streaming.StreamIntegrator`.
+
         Parameters
         -------------
         df: `pandas.Datframe`
@@ -2455,11 +2755,18 @@ class strymread:
         integrator: `function`
             Integrator method. By default, it is `scipy.integrate.cumptrapz`
 
+        total_only: `bool`, default=False
+            If True, returns only the value of the integral at the last time point, without materializing the cumulative integral
+            when `integrator` is the default trapezoidal integrator.
+
         Returns
         ----------
         df: `pandas.Dataframe`
             A two column Pandas data frame with first column named 'Time' and second column named 'Message'
 
+        `double`
+            Value of the integral at the last time point if `total_only` is True
+
         """
         if 'Time' not in df.columns:
             print("Data frame provided is not a timeseries data.\nFor standard timeseries data, Column 1 should be 'Time' and Column 2 should be {}".format(msg_axis))
@@ -2469,7 +2776,15 @@ class strymread:
             print("Column naming convention violated.\nFor standard timeseries data, Column 1 should be 'Time' and Column 2 should be {} ".format(msg_axis))
             raise ValueError('{} column not found'.format(msg_axis))
 
-        result = integrator(df[msg_axis],df['Time'].values, initial=init)
+        if total_only:
+            if df.shape[0] == 0:
+                return init
+            if integrator is integrate.cumulative_trapezoid:
+                return init + integrate.trapezoid(df[msg_axis].values, df['Time'].values)
+            return init + integrator(df[msg_axis].values, df['Time'].values, initial=0.0)[-1]
+
+        # recent scipy only accepts zero initial value, so the initial condition is added afterwards
+        result = integrator(df[msg_axis].values, df['Time'].values, initial=0.0) + init
 
         newdf = pd.DataFrame()
         newdf['Time'] = df['Time']
@@ -2524,14 +2839,7 @@ class strymread:
 
         # Usually timeseries have duplicated TimeIndex because more than one bus might produce same
         # information. For example, speed is received on Bus 0, and Bus 1 in Toyota Rav4.
-        # Drop the duplicated index, if the type of the index pd.DateTimeIndex
-        # Easier to drop the index, this way. If the type is not DateTime, first convert to DateTime
-        # and then drop.
-        if isinstance(df.index, pd.DatetimeIndex):
-            df = df[~df.index.duplicated(keep='first')]
-        else:
-            df = strymread.timeindex(df, inplace=True)
-            df= df[~df.index.duplicated(keep='first')]
+        df = strymread.remove_duplicates(df)
 
         # collect_indices = []
         # for i in range(0, len(df['Time'].values)-1):
@@ -2617,29 +2925,182 @@ class strymread:
         return df_new
 
     @staticmethod
-    def remove_duplicates(df):
+    def remove_duplicates(df, keep = 'first', prefer_bus = None, tolerance = 0.0):
         """
         Remove rows with duplicate time index from the timeseries data
 
+        Duplicates are found directly on the float `Time` column, without going through a `DatetimeIndex`.
+        Order of the remaining rows is preserved.
+
         Parameters
         --------------
         df: `pandas.DataFrame`
             A pandas dataframe with at least one column `Time` or DateTimeIndex type Index
+
+        keep: `str`, default="first"
+            Which of the rows with the same time to keep:
+
+            "first": the row appearing first
+
+            "last": the row appearing last
+
+            "mean": the row appearing first, with its numeric columns (except `Time` and `Bus`) averaged over all rows with the same time,
+            e.g. to merge copies of a signal received on several buses
+
+        prefer_bus: `int`, default=None
+            If given, only the rows received on this bus are kept, unless it has no row at all. Requires a `Bus` column.
+
+        tolerance: `double`, default=0.0
+            Rows less than `tolerance` seconds after the previous row have the same time, e.g. copies of a message
+            received on two buses a fraction of a millisecond apart. By default, only rows with exactly the same time are duplicates.
+
+        Returns
+        -----------
+        `pandas.DataFrame`
+            Dataframe with unique time points, indexed by Clock
         """
         # Usually timeseries have duplicated TimeIndex because more than one bus might produce same
         # information. For example, speed is received on Bus 0, and Bus 1 in Toyota Rav4.
-        # Drop the duplicated index, if the type of the index pd.DateTimeIndex
-        # Easier to drop the index, this way. If the type is not DateTime, first convert to DateTime
-        # and then drop.
-        if isinstance(df.index, pd.DatetimeIndex):
-            df= df[~df.index.duplicated(keep='first')]
+        if keep not in ['first', 'last', 'mean']:
+            raise ValueError("keep must be one of 'first', 'last' or 'mean'")
 
+        if 'Time' in df.columns:
+            timepoints = df['Time'].values
+        elif isinstance(df.index, pd.DatetimeIndex):
+            timepoints = df.index.asi8
         else:
-            df = strymread.timeindex(df, inplace=True)
-            df= df[~df.index.duplicated(keep='first')]
+            print("Dataframe has neither a Time column nor a DatetimeIndex.")
+            raise ValueError('Time column not found')
 
-        return df
+        if prefer_bus is not None:
+            if 'Bus' not in df.columns:
+                print("prefer_bus requires a Bus column in the dataframe.")
+                raise ValueError('Bus column not found')
+            preferred = df['Bus'].values == prefer_bus
+            if np.any(preferred) and not np.all(preferred):
+                df = df[preferred]
+                timepoints = timepoints[preferred]
+
+        if isinstance(df.index, pd.DatetimeIndex) and 'Time' not in df.columns:
+            # DatetimeIndex is in nanoseconds
+            tolerance = tolerance*1e9
+
+        rows, groups = strymread._unique_time_rows(timepoints, keep = keep, tolerance = tolerance)
+
+        if rows.shape[0] < df.shape[0]:
+            newdf = df.iloc[rows]
+            if keep == 'mean':
+                newdf = newdf.copy()
+                counts = np.bincount(groups)
+                for col in newdf.columns:
+                    if col in ['Time', 'Bus'] or not pd.api.types.is_numeric_dtype(df[col]):
+                        continue
+                    newdf[col] = np.bincount(groups, weights=df[col].values.astype(float))/counts
+        else:
+            newdf = df
+
+        if not isinstance(newdf.index, pd.DatetimeIndex):
+            newdf = strymread.timeindex(newdf)
+        return newdf
+
+    @staticmethod
+    def _unique_time_rows(timepoints, keep = 'first', tolerance = 0.0):
+        """
+        Positions of the rows to keep for unique time points, in their original order, and the group
+        (position among the rows to keep) of every row. Time points less than `tolerance` after the previous
+        one are in the same group.
+        """
+        n = timepoints.shape[0]
+        if n == 0:
+            return np.arange(0), np.arange(0)
+
+        if keep != 'last' and np.all(timepoints[1:] >= timepoints[:-1]):
+            # sorted time points: first row of every run of equal time points
+            first = np.concatenate(([True], np.diff(timepoints) > tolerance))
+            return np.flatnonzero(first), np.cumsum(first) - 1
+
+        # rows ordered by time, then position in the dataframe
+        order = np.argsort(timepoints, kind='stable')
+        ordered_time = timepoints[order]
+        first = np.concatenate(([True], np.diff(ordered_time) > tolerance))
+        starts = np.flatnonzero(first)
+        # first or last row in the dataframe of each group
+        if keep == 'last':
+            rows = np.maximum.reduceat(order, starts)
+        else:
+            rows = np.minimum.reduceat(order, starts)
+
+        group_of_ordered = np.cumsum(first) - 1
+        # groups are numbered by the position of their kept row
+        rank = np.empty(rows.shape[0], dtype=int)
+        rank[np.argsort(rows, kind='stable')] = np.arange(rows.shape[0])
+        groups = np.empty(n, dtype=int)
+        groups[order] = rank[group_of_ordered]
+
+        return np.sort(rows), groups
+
+    @staticmethod
+    def rolling_features(df, windows, statistics = ['mean', 'std', 'min', 'max'], as_array = False, **kwargs):
+        """
+        Rolling statistics of a timeseries over time-based windows, for many window lengths and statistics in one pass.
+
+        Each window (t - w, t] ends at a sample of `df` and is defined in seconds, so irregular sampling and
+        dropouts are handled correctly. Mean and standard deviation use prefix sums, minimum and maximum use a sparse table
+        shared by all window lengths (a vectorized equivalent of the monotone deque), and percentiles use pandas' rolling quantile.
+
+        Parameters
+        -------------
+        df: `pandas.DataFrame`
+            Timeseries with `Time` and `Message` columns, e.g. from `speed()`, `accelx()`, or a jerk from `differentiate`
+
+        windows: `list`
+            Window lengths in seconds
+
+        statistics: `list`, default=["mean", "std", "min", "max"]
+            Any of "count", "mean", "std", "min", "max", "median", and "pNN" for the NN-th percentile, e.g. "p95"
+
+        as_array: `bool`, default=False
+            If True, returns a numpy matrix and the list of its column names instead of a dataframe
+
+        ddof: `int`
+            Delta degrees of freedom of standard deviation. Default value is 1
+
+        msg_col: `str`
+            Name of message column in `df`. Default value is "Message"
+
+        Returns
+        ----------
+        `pandas.DataFrame`
+            Time column followed by one column per window and statistic such as "mean_2s", indexed by Clock
+
+        `numpy.ndarray`, `list`
+            If `as_array` is True
+
+        Example
+        ----------
+        >>> r0 = strymread(csvfile=csvdata)
+        >>> feat = strymread.rolling_features(r0.accelx(), windows = [1, 5, 30], statistics = ['mean', 'std', 'max', 'p95'])
+        """
+        ddof = kwargs.get("ddof", 1)
+        msg_col = kwargs.get("msg_col", "Message")
 
+        if 'Time' not in df.columns:
+            print("Data frame provided is not a timeseries data.\nFor standard timeseries data, Column 1 should be 'Time' and Column 2 should be {}".format(msg_col))
+            raise ValueError('Time column not found')
+
+        timepoints = df['Time'].values.astype(float)
+        values = pd.to_numeric(df[msg_col], errors='coerce').values.astype(float)
+        if not np.all(np.diff(timepoints) >= 0):
+            order = np.argsort(timepoints, kind='stable')
+            timepoints, values = timepoints[order], values[order]
+
+        matrix, columns = features.rolling(timepoints, values, windows, statistics, ddof = ddof)
+        if as_array:
+            return matrix, columns
+
+        newdf = pd.DataFrame(matrix, columns = columns)
+        newdf.insert(0, 'Time', timepoints)
+        return strymread.timeindex(newdf)
 
     @staticmethod
     def denoise(df, method="MA", **kwargs):
@@ -2705,7 +3166,10 @@ class strymread:
             Desired sampling rate in Hz
 
         cont_method: `str`
-            Resampling method for continuous dataset. Available methods: "cubic", "nearest", "linear", "nearest", "exact"
+            Resampling method for continuous dataset. Available methods: "cubic", "nearest", "linear", "nearest", "exact", "decimate"
+
+            "decimate": anti-aliased downsampling by the integer ratio closest to the ratio of the native rate of `df` to `rate`,
+            with a polyphase FIR low-pass filter (see `resample_many`). Resampled points are spaced by exactly `1/rate`.
 
         cat_method: `str'
             Resampling method for categorical dataset. Available method: "nearest"
@@ -2719,6 +3183,10 @@ class strymread:
         msg_col: `str`
             Name of message column in `df`. Default value is "Message"
 
+        max_gap: `double`
+            If given, resampled points inside a gap longer than `max_gap` seconds in `df` are NaN
+            instead of being interpolated across the gap. Default value is None
+
         Returns
         ------------
         dfnew1: `pandas.DataFrame`
@@ -2726,13 +3194,6 @@ class strymread:
 
         """
 
-        # Remove duplicate entries. If two data points have
-        # same timestamps, then interpolation fails. Usually, we have
-        # duplicates because same data is received on more than one bus.
-        if not np.all(np.diff(df['Time']) > 0):
-            df = strymread.remove_duplicates(df)
-
-
         cont_method = kwargs.get("cont_method", "cubic")
 
         cat_method = kwargs.get("cat_method", "nearest")
@@ -2743,19 +3204,35 @@ class strymread:
         # Optional argument for message column
         msg_col = kwargs.get("msg_col", "Message")
 
+        # Interpolation needs increasing time points. Rows are sorted by time, keeping rows
+        # with the same time in their order, and duplicate entries are removed. Usually, we have
+        # duplicates because same data is received on more than one bus.
+        if not np.all(np.diff(df[time_col].values) > 0):
+            df = df.iloc[np.argsort(df[time_col].values, kind = 'stable')]
+            df = strymread.remove_duplicates(df)
+
         dft0 = df[time_col].iloc[0]
         dftend = df[time_col].iloc[-1]
         n = (dftend - dft0)*rate
         n = int(n)
         t_newdf1 = np.linspace(dft0, dftend, num=n)
+        if not categorical and cont_method == 'decimate':
+            # decimation needs points spaced by exactly 1/rate
+            t_newdf1 = dft0 + np.arange(n)/rate
         # Interpolate function using cubic method
 
-        if categorical:
-            f1 = interp1d(df[time_col].values,df[msg_col], kind = cat_method)
+        max_gap = kwargs.get("max_gap", None)
+
+        method = cat_method if categorical else cont_method
+        if method in strymread.RESAMPLE_METHODS:
+            newvalue1 = strymread.resample_many([(df[time_col].values, df[msg_col].values)], t_newdf1, method = method,
+                as_array = True, max_gap = max_gap)[:, 0]
         else:
-            f1 = interp1d(df[time_col].values,df[msg_col], kind = cont_method)
+            f1 = interp1d(df[time_col].values,df[msg_col], kind = method)
+            newvalue1 = f1(t_newdf1)
+            if max_gap is not None:
+                newvalue1[strymread._in_gaps(df[time_col].values, t_newdf1, max_gap)] = np.nan
 
-        newvalue1 = f1(t_newdf1)
         dfnew = pd.DataFrame()
         dfnew[time_col] = t_newdf1
         dfnew[msg_col] = newvalue1
@@ -2763,6 +3240,142 @@ class strymread:
 
         return dfnew
 
+    @staticmethod
+    def resample_many(series_list, grid, method = 'linear', as_array = False, **kwargs):
+        """
+        Resample many timeseries onto one shared time grid.
+
+        Interpolation is vectorized with `numpy.searchsorted` over the whole grid for each timeseries,
+        without creating an interpolation object per timeseries.
+
+        Parameters
+        -------------
+        series_list: `list`
+            Timeseries to be resampled, each either a `pandas.DataFrame` with time and message columns,
+            or a tuple of numpy arrays `(time, values)` sorted by time
+
+        grid: `numpy.ndarray`
+            Sorted time points at which all timeseries are resampled
+
+        method: `str`, default="linear"
+            Interpolation method: "linear", "nearest", "previous", "cubic" or "decimate".
+
+            "decimate" is for downsampling by an integer ratio and requires a uniform `grid`. Each timeseries is linearly
+            interpolated onto a uniform grid at the multiple of the grid rate closest to its own rate, then low-pass filtered
+            and downsampled with a polyphase FIR filter (`scipy.signal.resample_poly`). Timeseries with the same ratio are
+            filtered together as one matrix.
+
+        as_array: `bool`, default=False
+            If True, a numpy array of shape (length of `grid`, number of timeseries) is returned,
+            without building any dataframe or time index
+
+        max_gap: `double`, default=None
+            If given, grid points strictly inside a gap longer than `max_gap` seconds between two samples are NaN
+            instead of being interpolated across the gap
+
+        time_col: `str`
+            Name of time column in dataframes of `series_list`. Default value is "Time"
+
+        msg_col: `str`
+            Name of message column in dataframes of `series_list`. Default value is "Message"
+
+        Returns
+        ------------
+        `list` of `pandas.DataFrame` | `numpy.ndarray`
+            Resampled timeseries with "Time" and "Message" columns indexed by Clock, or a numpy array if `as_array` is True.
+            Grid points outside the time range of a timeseries are NaN (except for a timeseries with a single sample,
+            which is held constant).
+
+        Example
+        ----------
+        >>> grid = np.arange(t0, t1, 0.05)
+        >>> X = strymread.resample_many([r.speed(), r.accelx(), r.steer_angle()], grid, as_array = True)
+        """
+        if method not in strymread.RESAMPLE_METHODS:
+            raise ValueError("Unknown resampling method '{}'. Available methods are {}".format(method, strymread.RESAMPLE_METHODS))
+
+        time_col = kwargs.get("time_col", "Time")
+        msg_col = kwargs.get("msg_col", "Message")
+        max_gap = kwargs.get("max_gap", None)
+
+        grid = np.asarray(grid, dtype=float)
+        resampled = np.full((grid.shape[0], len(series_list)), np.nan)
+
+        if method == 'decimate' and grid.shape[0] > 1:
+            step = (grid[-1] - grid[0])/(grid.shape[0] - 1)
+            if not np.allclose(np.diff(grid), step, rtol=0.0, atol=1e-3*step):
+                raise ValueError("Decimation requires a uniformly sampled grid.")
+        # timeseries to be decimated, grouped by downsampling ratio
+        decimated = {}
+
+        for i, series in enumerate(series_list):
+            if isinstance(series, pd.DataFrame):
+                timepoints, values = series[time_col].values, series[msg_col].values
+            else:
+                timepoints, values = series
+            timepoints = np.asarray(timepoints, dtype=float)
+            values = np.asarray(values, dtype=float)
+
+            n = timepoints.shape[0]
+            if n == 0:
+                continue
+            if n == 1:
+                resampled[:, i] = values[0]
+                continue
+
+            inside = (grid >= timepoints[0]) & (grid <= timepoints[-1])
+            if max_gap is not None:
+                inside &= ~strymread._in_gaps(timepoints, grid, max_gap)
+
+            ratio = 1
+            if method == 'decimate' and grid.shape[0] > 1:
+                ratio = max(int(np.round(step/np.median(np.diff(timepoints)))), 1)
+            if ratio > 1:
+                decimated.setdefault(ratio, []).append((i, timepoints, values, inside))
+                continue
+
+            if method in ['linear', 'decimate']:
+                right = np.clip(np.searchsorted(timepoints, grid, side='right'), 1, n - 1)
+                left = right - 1
+                weight = (grid - timepoints[left])/(timepoints[right] - timepoints[left])
+                result = values[left] + weight*(values[right] - values[left])
+            elif method == 'previous':
+                result = values[np.clip(np.searchsorted(timepoints, grid, side='right') - 1, 0, n - 1)]
+            elif method == 'nearest':
+                # a grid point exactly halfway between two samples takes the earlier one, as in scipy's interp1d
+                midpoints = 0.5*(timepoints[1:] + timepoints[:-1])
+                result = values[np.searchsorted(midpoints, grid, side='left')]
+            else:
+                result = CubicSpline(timepoints, values)(grid)
+
+            resampled[:, i] = np.where(inside, result, np.nan)
+
+        for ratio, group in decimated.items():
+            # uniform grid at `ratio` times the rate of `grid`, whose every `ratio`-th point is a point of `grid`
+            native_grid = grid[0] + np.arange((grid.shape[0] - 1)*ratio + 1)*(step/ratio)
+            native = np.column_stack([np.interp(native_grid, timepoints, values) for _, timepoints, values, _ in group])
+            filtered = signal.resample_poly(native, 1, ratio, axis=0, padtype='line')[:grid.shape[0]]
+            for column, (i, _, _, inside) in enumerate(group):
+                resampled[:, i] = np.where(inside, filtered[:, column], np.nan)
+
+        if as_array:
+            return resampled
+
+        clock = pd.DatetimeIndex(pd.to_datetime(grid, unit='s'), name='Clock')
+        return [pd.DataFrame({'Time': grid, 'Message': resampled[:, i]}, index=clock) for i in range(len(series_list))]
+
+    @staticmethod
+    def _in_gaps(timepoints, grid, max_gap):
+        """
+        Boolean array telling for each grid point whether it lies strictly between two consecutive (sorted) time points
+        further apart than `max_gap` seconds
+        """
+        timepoints = np.asarray(timepoints, dtype=float)
+        if timepoints.shape[0] < 2:
+            return np.zeros(grid.shape[0], dtype=bool)
+        before = np.clip(np.searchsorted(timepoints, grid, side='right') - 1, 0, timepoints.shape[0] - 2)
+        return (timepoints[before + 1] - timepoints[before] > max_gap) & (grid > timepoints[before]) & (grid < timepoints[before + 1])
+
     @staticmethod
     def ts_sync(df1, df2, rate=50, **kwargs):
         """Time-synchronize and resample two time-series dataframes of varying, non-uniform sampling.
@@ -2856,20 +3469,8 @@ class strymread:
         method = kwargs.get("method", "cubic")
         # Usually timeseries have duplicated TimeIndex because more than one bus might produce same
         # information. For example, speed is received on Bus 0, and Bus 1 in Toyota Rav4.
-        # Drop the duplicated index, if the type of the index pd.DateTimeIndex
-        # Easier to drop the index, this way. If the type is not DateTime, first convert to DateTime
-        # and then drop.
-        if isinstance(df1.index, pd.DatetimeIndex):
-            df1 = df1[~df1.index.duplicated(keep='first')]
-        else:
-            df1 = strymread.timeindex(df1, inplace=True)
-            df1 = df1[~df1.index.duplicated(keep='first')]
-
-        if isinstance(df2.index, pd.DatetimeIndex):
-            df2 = df2[~df2.index.duplicated(keep='first')]
-        else:
-            df2 = strymread.timeindex(df2, inplace=True)
-            df2 = df2[~df2.index.duplicated(keep='first')]
+        df1 = strymread.remove_duplicates(df1)
+        df2 = strymread.remove_duplicates(df2)
 
 
         assert(np.all(np.diff(df1['Time'].values) > 0.0)), ('Timestamps of first timeseries dataframe are not monotonically increasing.')
@@ -2887,7 +3488,7 @@ class strymread:
             timenext = tempdf['Time'].iloc[0]
             valuenext = tempdf['Message'].iloc[0]
             interpol = (df1['Message'].iloc[0] - valuenext)/(df1['Time'].iloc[0] - timenext )*(df2['Time'].iloc[0] - timenext) + valuenext
-            df1 = df1.append({'Time' : df2['Time'].iloc[0] , 'Message' : interpol} , ignore_index=True)
+            df1 = pd.concat([df1, pd.DataFrame({'Time' : [df2['Time'].iloc[0]] , 'Message' : [interpol]})], ignore_index=True)
         elif df1['Time'].iloc[0] > df2['Time'].iloc[0]:
             # It means first time of df2 is earlier than df1 in time-truncated data
             # so we have to interpolate message value at df1's first time.
@@ -2897,7 +3498,7 @@ class strymread:
             timenext = tempdf['Time'].iloc[0]
             valuenext = tempdf['Message'].iloc[0]
             interpol = (df2['Message'].iloc[0] - valuenext)/(df2['Time'].iloc[0] - timenext )*(df1['Time'].iloc[0] - timenext) + valuenext
-            df2 = df2.append({'Time' : df1['Time'].iloc[0] , 'Message' : interpol} , ignore_index=True)
+            df2 = pd.concat([df2, pd.DataFrame({'Time' : [df1['Time'].iloc[0]] , 'Message' : [interpol]})], ignore_index=True)
 
         df1= df1.sort_values(by=['Time'])
         df2= df2.sort_values(by=['Time'])
@@ -2930,7 +3531,7 @@ class strymread:
             timefirst = tempdf['Time'].iloc[-1]
             valuefirst = tempdf['Message'].iloc[-1]
             interpol = (valuefirst - df2['Message'].iloc[-1])/(timefirst - df2['Time'].iloc[-1])*(timefirst - df1['Time'].iloc[-1]) + df2['Message'].iloc[-1]
-            df2 = df2.append({'Time' : df1['Time'].iloc[-1] , 'Message' : interpol} , ignore_index=True)
+            df2 = pd.concat([df2, pd.DataFrame({'Time' : [df1['Time'].iloc[-1]] , 'Message' : [interpol]})], ignore_index=True)
         elif df1['Time'].iloc[-1] > df2['Time'].iloc[-1]:
             # It means last time of df2 is earlier than df1 in time-series data
             # so we have to interpolate df1 value at df2's last time.
@@ -2940,7 +3541,7 @@ class strymread:
             timefirst = tempdf['Time'].iloc[-1]
             valuefirst = tempdf['Message'].iloc[-1]
             interpol = (valuefirst- df1['Message'].iloc[-1] )/(timefirst - df1['Time'].iloc[-1])*(timefirst - df2['Time'].iloc[-1]) + df1['Message'].iloc[-1]
-            df1 = df1.append({'Time' : df2['Time'].iloc[-1] , 'Message' : interpol} , ignore_index=True)
+            df1 = pd.concat([df1, pd.DataFrame({'Time' : [df2['Time'].iloc[-1]] , 'Message' : [interpol]})], ignore_index=True)
 
         df1= df1.sort_values(by=['Time'])
         df2= df2.sort_values(by=['Time'])
@@ -3097,21 +3698,28 @@ class strymread:
         dataframe = pd.DataFrame()
         dataframe['Time'] = df['Time']
         dataframe['Message'] = df['Message']
-        initial_time = dataframe['Time'].iloc[0]
-        second_elapsed = by
-        dataframe['Second'] = 0.0
-        for r, row in  dataframe.iterrows():
-            next_time = initial_time + by
-            if ((dataframe['Time'][r] >= initial_time) and (dataframe['Time'][r] <= next_time)):
-                dataframe.loc[r, 'Second'] = second_elapsed
-            if (dataframe['Time'][r] > next_time):
-                initial_time = dataframe['Time'][r]
-                second_elapsed = second_elapsed + by
-                dataframe.loc[r, 'Second'] = second_elapsed
+        timepoints = dataframe['Time'].values
+        n = timepoints.shape[0]
+
+        # A new split starts at the first time point that is more than `by` seconds past the start of the
+        # current split. Only split boundaries are visited here, rows are labelled by cumulative sum below.
+        breakpoints = []
+        start = 0
+        while n > 0:
+            start = np.searchsorted(timepoints, timepoints[start] + by, side='right')
+            if start >= n:
+                break
+            breakpoints.append(start)
+
+        markers = np.zeros(n, dtype=np.int64)
+        markers[breakpoints] = 1
+        seconds_elapsed = np.cumsum(np.full(len(breakpoints) + 1, float(by)))
+        dataframe['Second'] = seconds_elapsed[np.cumsum(markers)]
 
         df_split = []
-        for second, df in dataframe.groupby('Second'):
-            df_split.append(df)
+        for rows in np.split(np.arange(n), breakpoints):
+            if rows.shape[0] > 0:
+                df_split.append(dataframe.iloc[rows[0]:rows[-1] + 1])
 
         return dataframe, df_split
 
@@ -3363,14 +3971,7 @@ class strymread:
         else:
             newdf =df.copy(deep = True)
 
-        Time = pd.to_datetime(newdf['Time'], unit='s')
-        newdf.reset_index(drop=True, inplace=True)
-        newdf['Clock'] = pd.DatetimeIndex(Time).tolist()
-
-        if inplace:
-            newdf.set_index('Clock', inplace=inplace)
-        else:
-            newdf = newdf.set_index('Clock')
+        newdf.index = pd.DatetimeIndex(pd.to_datetime(newdf['Time'].values, unit='s'), name='Clock')
         return newdf
 
     @staticmethod
@@ -3396,7 +3997,7 @@ class strymread:
         return d
 
     @staticmethod
-    def timeslices(ts):
+    def timeslices(ts, return_arrays = False):
         """
         `timeslices` return a set of timeslices in the form of `[(t0, t1), (t2, t3), ...]`
         from `ts` where ts is a square pulse (or a timeseries) representing two levels 0 and 1
@@ -3405,48 +4006,42 @@ class strymread:
         with values  `[True, True, True, ...., False, False, ..., True, True, True ]` which represents
         square pulses. In that case, `t0, t2, ...` are times for edge rising, and `t1, t2, ...` for edge falling.
 
+        Rising and falling edges are found in a single vectorized pass over the series, so the cost is
+        linear in the length of `ts`. A slice that is still open at the end of `ts` is closed at the last sample.
+
         Parameters
         --------
         ts: `pandas.core.series.Series`
             A valid pandas time series with timestamp as index for the series
 
+        return_arrays: `bool`, default = False
+            If True, return two arrays with start and end times of slices instead of a list of tuples
+
         Returns
         --------
         `list`
             A list of tuples with start and end time of slices. E.g. `[(t0, t1), (t2, t3), ...]`
-        """
 
-        if ts.dtypes == bool:
-            ts = ts.astype(int)
+        `numpy.ndarray`, `numpy.ndarray`
+            Start and end times of slices, if `return_arrays` is True
+        """
+        values = np.asarray(ts.fillna(0).values).astype(bool)
 
-        tsdiff = ts.diff()
+        # Pad with a False level on both sides, so that a slice beginning at the first sample produces
+        # a rising edge and a slice still open at the last sample produces a falling edge
+        edges = np.diff(np.concatenate(([False], values, [False])).astype(np.int8))
 
-        # diff creates a NaN in the first row, so that can affect the calculation.
-        # In that case, we NaN can be replaced with 1 if there was True
-        tsdiff[0] = ts[0]
+        # Rising edge is the first sample of a slice, falling edge is the sample after the last sample of a slice
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
 
-        slices = []
-        time_tuple = (None,  None)
-        for index, row in tsdiff.iteritems():
-            if row == 1:
-                # Rising Edge Detected. We will get index to rising edge
-                location_of_index = tsdiff.index.indexer_at_time(index)
-                if time_tuple == (None, None):
-                    required_index = tsdiff.index[location_of_index+1].tolist()
-                    # time_tuple = (required_index[0], None)
-                    time_tuple = (index, None)
+        start_times = ts.index[starts]
+        end_times = ts.index[ends]
 
-            elif row == -1:
-                # Falling Edge Detected. We will get index before falling edge
-                location_of_index = tsdiff.index.indexer_at_time(index)
-                if time_tuple[1] == None and time_tuple[0] != None:
-                    required_index = tsdiff.index[location_of_index-1].tolist()
-                    time_tuple = (time_tuple[0], required_index[0] )
-                    #time_tuple = (time_tuple[0], index)
-                    slices.append(time_tuple)
-                    time_tuple = (None,  None)
+        if return_arrays:
+            return start_times.values, end_times.values
 
-        return slices
+        return list(zip(start_times, end_times))
 
     @staticmethod
     def time_shift(df1, df2, time_col1 = 'Time', time_col2='Time', msg_col1 = 'Message', msg_col2= 'Message', **kwargs):
@@ -3478,108 +4073,115 @@ class strymread:
             Name of message column in `df2`. Default value is "Message"
 
         correlation_threshold: `double`
-            Correlation coefficient threshold in [0,1] at which to stop looking for better time-shift and return the result.
+            Correlation coefficient threshold in [0,1]. If the correlation coefficient of the data aligned by
+            cross-correlation is below the threshold, the time-shift is further refined by bounded Brent minimization
+            of the distance between two timeseries within one sample of the cross-correlation estimate.
+
+        min_overlap: `double`, default = 0.5
+            Minimum overlap of two timeseries, as a fraction of the shorter timeseries, for a time shift to be considered.
+
+        return_correlation: `bool`, default = False
+            If True, return correlation coefficient of aligned data along with the time shift.
 
         Returns
         ---------
         `double`, `double`
             Time shift in the unit of time as used in time columns of both timeseries dataframe.
 
-            Maximu correlation with given timeshift.
+            Correlation coefficient of data aligned with given timeshift, only if `return_correlation` is True.
 
         """
         correlation_threshold = kwargs.get("correlation_threshold", 0.98)
-        resample_time = np.max([np.median(np.diff(df1[time_col1])), np.median(np.diff(df2[time_col1]))])
-
-        df1_re = strymread.resample(df1, rate = 1./resample_time, cont_method= 'nearest', time_col = time_col1, msg_col = msg_col1)
-        df2_re = strymread.resample(df2, rate = 1./resample_time, cont_method= 'nearest',time_col = time_col2,  msg_col = msg_col2)
-
-        initial_time_gap = df1_re[time_col1][0] - df2_re[time_col2][0]
-
-        x = df1_re[msg_col1].values
-        y = df2_re[msg_col2].values
-
-        correlation = signal.correlate(x, y, mode="full")
+        min_overlap = kwargs.get("min_overlap", 0.5)
+        return_correlation = kwargs.get("return_correlation", False)
+
+        # Duplicate timestamps (e.g. same message received on two buses) are dropped before interpolation
+        time1, first1 = np.unique(df1[time_col1].values.astype(float), return_index=True)
+        time2, first2 = np.unique(df2[time_col2].values.astype(float), return_index=True)
+        msg1 = df1[msg_col1].values.astype(float)[first1]
+        msg2 = df2[msg_col2].values.astype(float)[first2]
+
+        # Both timeseries are put on uniform grids with the common sampling interval
+        resample_time = np.max([np.median(np.diff(time1)), np.median(np.diff(time2))])
+        grid1 = time1[0] + np.arange(int((time1[-1] - time1[0])/resample_time) + 1)*resample_time
+        grid2 = time2[0] + np.arange(int((time2[-1] - time2[0])/resample_time) + 1)*resample_time
+
+        x = np.interp(grid1, time1, msg1)
+        y = np.interp(grid2, time2, msg2)
+
+        initial_time_gap = grid1[0] - grid2[0]
+
+        # Normalized cross-correlation, i.e. the correlation coefficient of the overlapping parts for every lag.
+        # Every term is a sum over the overlap and is computed for all lags at once with an FFT correlation.
+        x = x - np.mean(x)
+        y = y - np.mean(y)
+        fft_correlate = lambda a, b: signal.correlate(a, b, mode="full", method="fft")
+        ones_x = np.ones_like(x)
+        ones_y = np.ones_like(y)
+        n_overlap = np.rint(fft_correlate(ones_x, ones_y))
+        sum_x = fft_correlate(x, ones_y)
+        sum_y = fft_correlate(ones_x, y)
+        covariance = fft_correlate(x, y) - sum_x*sum_y/n_overlap
+        variance_x = np.clip(fft_correlate(x*x, ones_y) - sum_x**2/n_overlap, 0.0, None)
+        variance_y = np.clip(fft_correlate(ones_x, y*y) - sum_y**2/n_overlap, 0.0, None)
+        denominator = np.sqrt(variance_x*variance_y)
+
+        # Lags with too little overlap are not considered, their correlation coefficient is meaningless
+        valid = (n_overlap >= max(5, min_overlap*min(x.size, y.size))) & (denominator > 0.0)
+        correlation = np.full(n_overlap.shape, -np.inf)
+        correlation[valid] = covariance[valid]/denominator[valid]
+
+        # argmax returns the first maximum, so the result is deterministic even when the correlation has a plateau
         lags = signal.correlation_lags(x.size, y.size, mode="full")
-        lag = lags[np.argmax(correlation)]
-        lag_in_time_units = lag*resample_time
-        total_time_shift = initial_time_gap + lag_in_time_units
-
-        ts1 = df1.copy(deep=True)
-        ts2 = df2.copy(deep=True)
-
-        ts2['Time'] = ts2['Time']+total_time_shift
-        temp1 = ts1[  (ts1['Time'] >=  ts2['Time'].iloc[0]) & (ts1['Time'] <=  ts2['Time'].iloc[-1])]
-        temp2 = ts2[  (ts2['Time'] >=  ts1['Time'].iloc[0]) & (ts2['Time'] <=  ts1['Time'].iloc[-1])]
-        temp1, temp2 = strymread.ts_sync(temp1, temp2, rate ='first', method='nearest')
-
-        distance = 0
-        for i in range(0, temp1.shape[0]):
-            distance +=  (np.sqrt((temp1['Time'].iloc[i] - temp2['Time'].iloc[i])**2 +
-                (temp1['Message'].iloc[i] - temp2['Message'].iloc[i])**2 ) )/  temp2.shape[0]
-
-        correlation_coefficient = scipy.stats.pearsonr(temp1['Message'].values, temp2['Message'].values)
-        LOGGER.info("Zero pass correlation coefficient  = {}".format(correlation_coefficient))
-        if correlation_coefficient[0] <= correlation_threshold:
-            df2_re['Time'] = df2_re['Time']+total_time_shift
-            duration_left = df1_re['Time'].iloc[-1] -df2_re['Time'].iloc[0]
-            duration_right= df2_re['Time'].iloc[-1] -df1_re['Time'].iloc[0]
-
-            def get_min_shift(left, right, n_step):
-                shift_duration = np.linspace(left, right, n_step)
-                shift_duration_list=[]
-                distance_list = []
-                corr_coeff = 0.0
-                for shft in shift_duration:
-                    temp1 = df1_re.copy(deep=True)
-                    temp2 = df2_re.copy(deep=True)
-                    temp1['Time'] = df1_re['Time']+shft
-                    temp1_ = temp1[  (temp1['Time'] >=  temp2['Time'].iloc[0]) & (temp1['Time'] <=  temp2['Time'].iloc[-1])]
-                    temp2_ = temp2[  (temp2['Time'] >=  temp1['Time'].iloc[0]) & (temp2['Time'] <=  temp1['Time'].iloc[-1])]
-                    del temp1
-                    del temp2
-                    if (temp1_.shape[0]<= 5):
-                        continue
-                    if (temp2_.shape[0]<= 5):
-                        continue
-                    if temp1_.shape[0] != temp2_.shape[0]:
-                        temp1_, temp2_ = strymread.ts_sync(temp1_, temp2_, rate ='first', method='cubic')
-                    ## Calculate the distance between temp1 and temp2:
+        peak = np.argmax(correlation)
 
+        # Sub-sample refinement by fitting a parabola through the peak and its two neighbours
+        sub_sample = 0.0
+        if 0 < peak < correlation.size - 1:
+            left, center, right = correlation[peak - 1], correlation[peak], correlation[peak + 1]
+            curvature = left - 2.0*center + right
+            if np.isfinite(curvature) and curvature < 0:
+                sub_sample = 0.5*(left - right)/curvature
 
+        lag_in_time_units = (lags[peak] + sub_sample)*resample_time
+        total_time_shift = initial_time_gap + lag_in_time_units
 
-                    distance = 0
-                    for i in range(0, temp1_.shape[0]):
-                        distance += (np.sqrt((temp1_['Time'].iloc[i] - temp2_['Time'].iloc[i])**2 +
-                            (temp1_['Message'].iloc[i] - temp2_['Message'].iloc[i])**2 ) )/  temp2_.shape[0]
-                    distance_list.append(distance)
-                    shift_duration_list.append(shft)
+        def aligned(shift):
+            # Samples of first timeseries overlapping with shifted second timeseries, and the second timeseries
+            # linearly interpolated at those samples
+            shifted_time2 = time2 + shift
+            overlap = (time1 >= shifted_time2[0]) & (time1 <= shifted_time2[-1])
+            return msg1[overlap], np.interp(time1[overlap], shifted_time2, msg2)
 
-                    import scipy.stats
+        def distance(shift):
+            # Root mean square distance between the two aligned timeseries
+            a, b = aligned(shift)
+            if a.shape[0] <= 5:
+                return np.inf
+            return np.sqrt(np.mean((a - b)**2))
 
-                    if (np.all(temp1_['Message'].values == temp1_['Message'].values[0]) or np.all(temp2_['Message'].values == temp2_['Message'].values[0]) ):
-                        continue
+        def correlation_coefficient(shift):
+            a, b = aligned(shift)
+            if a.shape[0] <= 5 or np.all(a == a[0]) or np.all(b == b[0]):
+                return 0.0
+            return np.corrcoef(a, b)[0, 1]
 
-                    correlation_coefficient = scipy.stats.pearsonr(temp1_['Message'].values, temp2_['Message'].values)
-                    corr_coeff =  correlation_coefficient[0]
-                    #print("correlation coefficient  = {}".format(correlation_coefficient))
-                    if corr_coeff >= correlation_threshold:
-                        LOGGER.info("Correlation Coefficient of Aligned Data is {}".format(correlation_coefficient[0] ))
-                        break
+        coefficient = correlation_coefficient(total_time_shift)
+        LOGGER.info("Zero pass correlation coefficient  = {}".format(coefficient))
 
-                arg_dist = np.argmin(distance_list)
-                small_shift = shift_duration_list[arg_dist]
-                return corr_coeff, small_shift
+        if coefficient <= correlation_threshold:
+            from scipy.optimize import minimize_scalar
+            result = minimize_scalar(distance, bounds=(total_time_shift - resample_time, total_time_shift + resample_time),
+                method='bounded', options={'xatol': resample_time*1e-3})
+            if result.success and distance(result.x) < distance(total_time_shift):
+                total_time_shift = result.x
+                coefficient = correlation_coefficient(total_time_shift)
+                LOGGER.info("Correlation Coefficient of Aligned Data is {}".format(coefficient))
 
-            correlation_coefficient, small_shift = get_min_shift(-duration_left, duration_right, 300)
-            if correlation_coefficient  < correlation_threshold:
-                correlation_coefficient, small_shift = get_min_shift(small_shift-10, small_shift+10, 150)
-            if correlation_coefficient  < correlation_threshold:
-                correlation_coefficient, small_shift = get_min_shift(small_shift-1, small_shift+1, 100)
+        if return_correlation:
+            return total_time_shift, coefficient
 
-            return total_time_shift-small_shift
-        else:
-            return total_time_shift
+        return total_time_shift
 
 
     @staticmethod
@@ -3809,3 +4411,92 @@ class strymread:
                     fig.show()
             elif taxis == "clock":
                 raise NotImplementedError
+
+
+class strymview(strymread):
+    """
+    `strymview` is a lightweight view of a `strymread` object, returned by `strymread.msg_subset`.
+
+    A view shares the parsed CAN dataframe, DBC database, topic map and cache of decoded timeseries of the
+    `strymread` object it was created from, and only holds a row selection: time intervals and message IDs.
+    The subset dataframe is materialized on first access of `dataframe`, and timeseries are decoded once for
+    the whole drive and then restricted to the selection. Deduplication policies set on a view (see `set_dedup_policy`)
+    apply to the view only.
+
+    Parameters
+    ----------------
+    parent: `strymread`
+        The `strymread` object (or another view) to create the view from
+
+    intervals: `IntervalSet`
+        Selected time intervals in seconds
+
+    ids: `list`, default = None
+        Selected message IDs. All message IDs are selected if None
+
+    """
+    def __init__(self, parent, intervals, ids = None):
+        # Share all attributes, including the DBC database, with the parent, except for
+        # deduplication policies and decoded data that the view sets up on its own
+        self.__dict__.update(parent.__dict__)
+        self.dedup = dict(parent.dedup)
+
+        if isinstance(parent, strymview) and parent._base is not None:
+            # View of a view: restrict the selection of the parent view
+            intervals = intervals & parent._intervals
+            if parent._ids is not None:
+                ids = parent._ids if ids is None else np.intersect1d(ids, parent._ids)
+            parent = parent._base
+
+        self._base = parent
+        self._intervals = intervals
+        self._ids = None if ids is None else np.asarray(ids)
+        self._frame = None
+        self._decoded = {}
+        self._cache_owner = None
+
+    def _cache(self):
+        """
+        Cache of decoded data of the view. It is tied to the dataframe of the `strymread` object the view selects from,
+        so that the subset dataframe is not materialized to check whether the cache is still valid.
+        """
+        if self._base is None:
+            return strymread._cache(self)
+        if self._cache_owner is not self._base.dataframe:
+            self._decoded = {}
+            self._cache_owner = self._base.dataframe
+        return self._decoded
+
+    @property
+    def dataframe(self):
+        if self._frame is None:
+            df = self._base.dataframe
+            selected = self._intervals.contains(df['Time'].values)
+            if self._ids is not None:
+                selected &= np.isin(df['MessageID'].values, self._ids)
+            self._frame = df[selected]
+        return self._frame
+
+    @dataframe.setter
+    def dataframe(self, df):
+        # A view whose dataframe is replaced no longer corresponds to a selection of the parent
+        self._frame = df
+        self._base = None
+
+    def get_ts(self, msg, signal, verbose=False):
+        """
+        `get_ts` returns Timeseries data by given `msg_name` and `signal_name`, restricted to the selection of the view.
+        See `strymread.get_ts`.
+        """
+        if self._base is None:
+            return strymread.get_ts(self, msg, signal, verbose)
+
+        ts = self._base.get_ts(msg, signal, verbose)
+
+        if self._ids is not None:
+            message = dbc.findMessageInfo(msg, self.candb)
+            frame_id = msg if isinstance(msg, int) else getattr(message, 'frame_id', None)
+            if frame_id not in self._ids:
+                return ts.iloc[0:0]
+
+        return ts[self._intervals.contains(ts['Time'].values)]
@@ -0,0 +1,69 @@
+import os
+
+import cantools
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym import strymread
+
+DBCFILE = os.path.join(os.path.dirname(__file__), '..', 'src', 'strym', 'dbc', 'toyota_rav4_2019.dbc')
+
+START = 1600000000.0
+DURATION = 20.0
+
+def speed_profile(t):
+    return 40.0 + 30.0*np.sin(2*np.pi*t/20.0)
+
+# message: (rate in Hz, signal values at elapsed time t, buses)
+MESSAGES = {
+    'SPEED': (50, lambda t: {'SPEED': speed_profile(t)}, [0, 1]),
+    'ACCELEROMETER': (100, lambda t: {'ACCEL_X': 3.0*np.cos(2*np.pi*t/20.0), 'ACCEL_Z': 0.0}, [0]),
+    'KINEMATICS': (80, lambda t: {'YAW_RATE': 5.0*np.sin(t/10.0), 'ACCEL_Y': 0.1, 'STEERING_TORQUE': 0}, [0]),
+    'STEER_ANGLE_SENSOR': (80, lambda t: {'STEER_ANGLE': 10.0*np.sin(t/7.0), 'STEER_RATE': 1.0, 'STEER_FRACTION': 0.0}, [0]),
+    'WHEEL_SPEEDS': (80, lambda t: {name: speed_profile(t) for name in ['WHEEL_SPEED_FL', 'WHEEL_SPEED_FR', 'WHEEL_SPEED_RL', 'WHEEL_SPEED_RR']}, [0]),
+    'DSU_CRUISE': (10, lambda t: {'LEAD_DISTANCE': 30.0 if t % 10 < 6 else 252.0, 'REL_SPEED': 1.0}, [0]),
+    'PCM_CRUISE_SM': (5, lambda t: {'CRUISE_CONTROL_STATE': 6 if t > 8 else 2}, [0]),
+}
+
+def make_frames(start = START, duration = DURATION, bus_offset = 0.0001, seed = 0):
+    """
+    Raw CAN frames of a synthetic RAV4 drive in the format of strym CSV files. Messages received on
+    several buses are copies, each bus receiving them `bus_offset` seconds after the previous one.
+    """
+    db = cantools.database.load_file(DBCFILE)
+    rng = np.random.default_rng(seed)
+    rows = []
+    for name, (rate, values, buses) in MESSAGES.items():
+        message = db.get_message_by_name(name)
+        n = int(duration*rate)
+        timepoints = start + np.arange(n)/rate + rng.uniform(0, 0.002, n)
+        for t in timepoints:
+            signals = {signal.name: 0 for signal in message.signals}
+            signals.update(values(t - start))
+            data = message.encode(signals, strict=False)
+            for i, bus in enumerate(buses):
+                rows.append((t + i*bus_offset, bus, message.frame_id, data.hex(), len(data)))
+
+    df = pd.DataFrame(rows, columns=['Time', 'Bus', 'MessageID', 'Message', 'MessageLength'])
+    return df.sort_values('Time', kind='stable').reset_index(drop=True)
+
+@pytest.fixture(scope='session')
+def frames():
+    return make_frames()
+
+@pytest.fixture(scope='session')
+def start():
+    return START
+
+@pytest.fixture(scope='session')
+def frames_factory():
+    return make_frames
+
+@pytest.fixture
+def dbcfile():
+    return DBCFILE
+
+@pytest.fixture
+def reader(frames):
+    return strymread(frames.copy(), dbcfile=DBCFILE)
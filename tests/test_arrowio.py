@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym import arrowio
+
+pa = pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def state():
+    time = np.arange(5)*0.05
+    return pd.DataFrame({'Time': time, 'speed': np.linspace(10.0, 12.0, 5), 'acc_state': [2.0, 2.0, 6.0, 6.0, 6.0]})
+
+def test_compact_state_space_keeps_schema_in_metadata():
+    matrix = np.arange(6, dtype=np.float32).reshape(3, 2)
+    schema = {'columns': ['speed', 'acc_state'], 'kinds': ['numerical', 'categorical'], 'rate': 20, 'time': np.array([0.0, 0.05, 0.1])}
+    batch = arrowio.to_record_batch((matrix, schema), metadata={'vin': 'VINA'})
+
+    assert batch.schema.names == ['Time', 'speed', 'acc_state']
+    assert np.array_equal(batch.column(2).to_numpy(), matrix[:, 1])
+    assert arrowio.metadata(batch) == {'vin': 'VINA', 'kinds': ['numerical', 'categorical'], 'rate': 20}
+
+def test_ipc_file_round_trip(tmp_path, state):
+    path = str(tmp_path / 'state.arrow')
+    arrowio.write_ipc(path, state, metadata={'rate': 20})
+    table = arrowio.read_ipc(path)
+    assert table.to_pandas().equals(state)
+    assert arrowio.metadata(table) == {'rate': 20}
+
+def test_shared_memory_is_released_on_exit(state):
+    block = arrowio.to_shared_memory(state, metadata={'rate': 20})
+    try:
+        with arrowio.from_shared_memory(block.name) as shared:
+            copy = shared.table.to_pandas()
+            assert arrowio.metadata(shared.table) == {'rate': 20}
+        assert shared.table is None and shared.block is None
+        assert copy.equals(state)
+
+        # arrays still referenced keep the block from closing
+        shared = arrowio.from_shared_memory(block.name)
+        speed = shared.table.column('speed')
+        with pytest.raises(BufferError):
+            shared.close()
+        del speed
+        shared.close()
+        assert shared.block is None
+    finally:
+        block.close()
+        block.unlink()
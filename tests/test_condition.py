@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from strym import condition
+
+def test_and_binds_tighter_than_or():
+    node = condition.compile_condition('speed > 20 or speed < 5 and not lead vehicle present')
+    assert repr(node) == '((speed > 20.0) or ((speed < 5.0) and (not (lead_distance < 252.0))))'
+    assert node.operands() == {'speed', 'lead_distance'}
+
+def test_operands_are_normalized_and_conditions_cached():
+    node = condition.compile_condition('(SPEED > 20 or 386.long_dist.Message > 34.0)')
+    assert node.operands() == {'speed', '386.LONG_DIST.message'}
+    assert condition.compile_condition('(SPEED > 20 or 386.long_dist.Message > 34.0)') is node
+
+@pytest.mark.parametrize('text', ['', 'speed <', 'speed ~ 3', '(speed < 3', 'speed < fast', 'speed < 3 and'])
+def test_unsupported_conditions_raise(text):
+    with pytest.raises(ValueError):
+        condition.compile_condition(text)
+
+def test_condition_holds_until_next_sample():
+    series = {'speed': (np.array([1.0, 3.0, 5.0]), np.array([10.0, 30.0, 10.0])),
+              'lead_distance': (np.array([0.0, 4.0]), np.array([252.0, 40.0]))}
+    node = condition.compile_condition('speed > 20 or lead vehicle present')
+
+    grid, mask = condition.evaluate(node, series)
+    assert np.array_equal(grid, [0.0, 1.0, 3.0, 4.0, 5.0])
+    assert np.array_equal(mask, [False, False, True, True, True])
+
+    intervals = condition.intervals(grid, mask)
+    assert np.array_equal(intervals.starts, [3.0]) and np.array_equal(intervals.ends, [5.0])
+
+def test_condition_is_false_before_first_sample():
+    series = {'speed': (np.array([2.0]), np.array([0.0])), 'acceleration': (np.array([0.0]), np.array([0.0]))}
+    grid, mask = condition.evaluate(condition.compile_condition('speed < 1 and acceleration == 0'), series)
+    assert np.array_equal(mask, [False, True])
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym import dataset
+
+pytest.importorskip('pyarrow')
+
+DAY = 86400.0
+MIDNIGHT = 1600041600.0 # 2020-09-14 00:00:00 UTC
+
+def message_table(start, n, buses=(0, 1)):
+    time = start + np.arange(n)*0.5
+    return pd.DataFrame({'Time': time, 'Bus': np.resize(np.array(buses, dtype=np.uint8), n), 'SPEED': np.arange(n, dtype=float)})
+
+@pytest.fixture
+def root(tmp_path):
+    root = str(tmp_path / 'fleet')
+    partition_by = ('vin', 'date', 'message')
+    # drive_a spans midnight, drive_b is on the next day for another vehicle
+    entries = dataset.write_message(root, message_table(MIDNIGHT - 5, 20), 'SPEED', 'VINA', 'drive_a', partition_by)
+    entries += dataset.write_message(root, message_table(MIDNIGHT + DAY, 10), 'SPEED', 'VINB', 'drive_b', partition_by)
+    entries += dataset.write_message(root, message_table(MIDNIGHT + DAY, 10).rename(columns={'SPEED': 'ACCEL_X'}), 'ACCELEROMETER', 'VINB', 'drive_b', partition_by)
+    dataset.update_manifest(root, entries, partition_by)
+    return root
+
+def test_drive_spanning_midnight_is_split_by_date(root):
+    paths = sorted(entry['path'] for entry in dataset.dataset_files(root, drives=['drive_a']))
+    assert paths == ['vin=VINA/date=2020-09-13/message=SPEED/drive_a.parquet', 'vin=VINA/date=2020-09-14/message=SPEED/drive_a.parquet']
+    assert all(os.path.exists(os.path.join(root, path)) for path in paths)
+
+def test_files_are_pruned_from_the_manifest(root):
+    assert len(dataset.dataset_files(root)) == 4
+    assert [e['drive'] for e in dataset.dataset_files(root, vins='VINB', messages=['SPEED'])] == ['drive_b']
+    assert [e['date'] for e in dataset.dataset_files(root, dates=['2020-09-13'])] == ['2020-09-13']
+    assert len(dataset.dataset_files(root, time=(MIDNIGHT, MIDNIGHT + 1))) == 1
+    assert len(dataset.dataset_files(root, time=(None, MIDNIGHT - 10))) == 0
+
+def test_read_dataset_opens_only_selected_files(root):
+    # files of other vehicles are never opened
+    for entry in dataset.dataset_files(root, vins=['VINB']):
+        os.remove(os.path.join(root, entry['path']))
+
+    speed = dataset.read_dataset(root, messages=['SPEED'], vins=['VINA'], time=(MIDNIGHT - 2, MIDNIGHT + 2), columns=['SPEED'])['SPEED']
+    assert list(speed.columns) == ['Time', 'Bus', 'SPEED', 'vin', 'drive']
+    assert np.allclose(speed['Time'], MIDNIGHT + np.arange(-2.0, 2.5, 0.5))
+    assert np.all(np.diff(speed['Time']) > 0) and set(speed['vin']) == {'VINA'}
+
+def test_bus_partitions_restore_the_bus_column(tmp_path):
+    root = str(tmp_path / 'buses')
+    partition_by = ('message', 'bus')
+    entries = dataset.write_message(root, message_table(MIDNIGHT, 10), 'SPEED', None, 'drive_a', partition_by)
+    dataset.update_manifest(root, entries, partition_by)
+
+    assert sorted(e['path'] for e in entries) == ['message=SPEED/bus=0/drive_a.parquet', 'message=SPEED/bus=1/drive_a.parquet']
+    speed = dataset.read_dataset(root)['SPEED']
+    assert speed['Bus'].tolist() == [0, 1]*5 and set(speed['vin']) == {dataset.UNKNOWN_VIN}
+
+    with pytest.raises(ValueError):
+        dataset.update_manifest(root, entries, ('vin', 'message'))
+
+def test_exported_drive_reads_back_as_decoded(reader, tmp_path):
+    root = str(tmp_path / 'export')
+    reader.export_dataset(root, drive='drive_a', messages=['SPEED'])
+    speed = dataset.read_dataset(root, messages=['SPEED'])['SPEED']
+
+    decoded = reader.candb.get_message_by_name('SPEED')
+    expected = reader._decode_message(decoded, wide=True)
+    assert np.allclose(speed['Time'], expected['Time']) and np.allclose(speed['SPEED'], expected['SPEED'])
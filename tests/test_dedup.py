@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from strym import strymread
+
+def test_policy_set_on_view_leaves_parent_unchanged(reader):
+    speed = reader.speed()
+    view = reader.msg_subset(time=(2, 6))
+    view.set_dedup_policy(1, topic='speed')
+
+    assert reader.dedup == {}
+    assert view.dedup == {'speed': 1}
+    assert reader.speed().equals(speed)
+
+def test_copies_on_two_buses_with_offset_timestamps_are_removed():
+    df = pd.DataFrame({'Time': [0.0, 0.0001, 0.01, 0.0101, 0.02], 'Bus': [0, 1, 0, 1, 0], 'Message': [1., 1., 2., 2., 3.]})
+
+    preferred = strymread.remove_duplicates(df, prefer_bus=1)
+    assert np.array_equal(preferred['Time'].values, [0.0001, 0.0101])
+
+    first = strymread.remove_duplicates(df, tolerance=0.001)
+    assert np.array_equal(first['Time'].values, [0.0, 0.01, 0.02])
+    assert np.array_equal(strymread.remove_duplicates(df, keep='last', tolerance=0.001)['Bus'].values, [1, 1, 0])
+    assert np.array_equal(strymread.remove_duplicates(df)['Time'].values, df['Time'].values)
+
+def test_topic_policies_remove_copies_received_on_two_buses(reader, frames):
+    # SPEED is received on buses 0 and 1, 0.1 ms apart
+    n = frames[(frames['MessageID'] == 180) & (frames['Bus'] == 1)].shape[0]
+
+    assert reader.speed().shape[0] == n
+    reader.set_dedup_policy(1, topic='speed')
+    assert reader.speed().shape[0] == n
+    reader.set_dedup_policy('mean', topic='speed')
+    assert reader.speed().shape[0] == n
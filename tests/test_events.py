@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from strym import events
+
+def timeseries(values, rate=10.0):
+    values = np.asarray(values, dtype=float)
+    return pd.DataFrame({'Time': np.arange(values.shape[0])/rate, 'Message': values})
+
+def test_hysteresis_switches_on_at_on_and_off_at_off():
+    values = np.array([0.0, 5.0, 10.0, 7.0, np.nan, 6.0, 5.0, 8.0, 10.0])
+    assert np.array_equal(events.hysteresis(values, 10.0, 5.0), [False, False, True, True, True, True, False, False, True])
+
+    # thresholds below release detect low values, e.g. braking
+    values = np.array([0.0, -3.0, -2.0, -1.5, -2.5, -3.5])
+    assert np.array_equal(events.hysteresis(values, -3.0, -1.5), [False, True, True, False, False, True])
+
+def test_intervals_are_debounced_before_short_ones_are_dropped():
+    time = np.arange(12)/10.0
+    mask = np.array([1, 1, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1], dtype=bool)
+
+    assert events.detect_intervals(time, mask).to_tuples() == [(0.0, 0.1), (0.3, 0.3), (0.7, 0.7), (1.0, 1.1)]
+    debounced = events.detect_intervals(time, mask, min_duration=0.25, debounce=0.2)
+    assert np.allclose(debounced.starts, [0.0]) and np.allclose(debounced.ends, [0.3])
+
+    merged = events.detect_intervals(time, mask, debounce=0.4)
+    assert np.allclose(merged.starts, [0.0]) and np.allclose(merged.ends, [1.1])
+
+def test_hard_brake_peak_and_release():
+    accelx = timeseries([0.0, -1.0, -3.2, -4.0, -2.0, -1.6, -1.0, 0.0, -3.1, -1.0])
+    table = events.hard_brake(accelx, min_duration=0.2, debounce=0.0)
+    assert table.shape[0] == 1
+    assert np.isclose(table['Start'][0], 0.2) and np.isclose(table['End'][0], 0.5)
+    assert table['Peak'][0] == -4.0
+
+def test_cut_in_drops_and_close_appearances():
+    lead_distance = timeseries([40.0, 40.0, 20.0, 20.0, 252.0, 252.0, 10.0, 10.0, 252.0, 80.0, 80.0, 252.0, 21.0])
+    table = events.cut_in(lead_distance, debounce=0.0)
+
+    assert np.allclose(table['Start'], [0.1, 0.5, 1.1])
+    assert list(table['Before']) == [40.0, 252.0, 252.0]
+    assert list(table['After']) == [20.0, 10.0, 21.0]
+
+    # a lead vehicle appearing further than max_appear is not a cut-in
+    assert events.cut_in(lead_distance, max_appear=15.0, debounce=0.0)['Start'].shape[0] == 2
+
+def test_cut_in_ignores_dropouts():
+    lead_distance = pd.DataFrame({'Time': [0.0, 0.1, 2.0, 2.1], 'Message': [40.0, 40.0, 10.0, 10.0]})
+    assert events.cut_in(lead_distance).shape[0] == 0
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym import features
+
+def brute_force(timepoints, values, window, reduce):
+    result = []
+    for t in timepoints:
+        inside = values[(timepoints > t - window) & (timepoints <= t)]
+        inside = inside[~np.isnan(inside)]
+        result.append(reduce(inside) if inside.shape[0] > 0 else np.nan)
+    return np.array(result)
+
+def test_windows_exclude_the_sample_exactly_one_window_back():
+    timepoints = np.arange(6.0)
+    values = np.array([5.0, 1.0, 4.0, 2.0, 3.0, 0.0])
+    matrix, columns = features.rolling(timepoints, values, [2.0], statistics=['count', 'mean', 'min', 'max'])
+
+    assert columns == ['count_2s', 'mean_2s', 'min_2s', 'max_2s']
+    assert np.array_equal(matrix[:, 0], [1, 2, 2, 2, 2, 2])
+    assert np.allclose(matrix[:, 1], [5.0, 3.0, 2.5, 3.0, 2.5, 1.5])
+    assert np.array_equal(matrix[:, 2], [5.0, 1.0, 1.0, 2.0, 2.0, 0.0])
+    assert np.array_equal(matrix[:, 3], [5.0, 5.0, 4.0, 4.0, 3.0, 3.0])
+
+def test_statistics_match_brute_force_on_irregular_samples_with_nan():
+    rng = np.random.default_rng(0)
+    timepoints = np.cumsum(rng.uniform(0.01, 0.5, 300))
+    values = rng.normal(100.0, 5.0, 300)
+    values[rng.choice(300, 30, replace=False)] = np.nan
+    windows = [0.3, 2.0, 10.0]
+
+    matrix, columns = features.rolling(timepoints, values, windows, statistics=['mean', 'std', 'min', 'max'])
+    for i, window in enumerate(windows):
+        assert np.allclose(matrix[:, 4*i], brute_force(timepoints, values, window, np.mean), equal_nan=True)
+        expected_std = brute_force(timepoints, values, window, lambda v: np.std(v, ddof=1) if v.shape[0] > 1 else np.nan)
+        assert np.allclose(matrix[:, 4*i + 1], expected_std, equal_nan=True)
+        assert np.array_equal(matrix[:, 4*i + 2], brute_force(timepoints, values, window, np.min), equal_nan=True)
+        assert np.array_equal(matrix[:, 4*i + 3], brute_force(timepoints, values, window, np.max), equal_nan=True)
+
+def test_percentiles_match_pandas():
+    rng = np.random.default_rng(1)
+    timepoints = np.cumsum(rng.uniform(0.01, 0.2, 200))
+    values = rng.normal(0.0, 1.0, 200)
+    matrix, columns = features.rolling(timepoints, values, [1.0], statistics=['median', 'p95'])
+
+    series = pd.Series(values, index=pd.to_datetime(timepoints, unit='s')).rolling('1s', min_periods=1)
+    assert columns == ['median_1s', 'p95_1s']
+    assert np.allclose(matrix[:, 0], series.quantile(0.5).values)
+    assert np.allclose(matrix[:, 1], series.quantile(0.95).values)
+
+def test_unknown_statistic_raises():
+    with pytest.raises(ValueError):
+        features.rolling(np.arange(3.0), np.arange(3.0), [1.0], statistics=['mode'])
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from strym import strymread, fleet, rawdb
+
+MONTH = 30*86400.0
+
+@pytest.fixture(scope='module')
+def databases(tmp_path_factory, start, frames_factory):
+    # Two vehicles, one database each, the second vehicle driving a month later
+    root = tmp_path_factory.mktemp('fleet')
+    for vin, drive_start in [('VINA', start), ('VINB', start + MONTH)]:
+        connection = rawdb.connect(str(root / '{}.db'.format(vin)))
+        rawdb.load_frames(connection, frames_factory(start = drive_start), 'drive_{}'.format(vin), vin)
+        connection.close()
+    return str(root)
+
+def test_drives_are_pruned_by_vin_and_time(databases, start):
+    assert list(fleet.drives(databases)['VIN']) == ['VINA', 'VINB']
+    assert list(fleet.drives(databases, vin='VINB')['Name']) == ['drive_VINB']
+    assert list(fleet.drives(databases, time=(start + MONTH - 10, None))['VIN']) == ['VINB']
+    assert list(fleet.drives(databases, time=('2020-09-13', '2020-09-14'))['VIN']) == ['VINA']
+    assert fleet.drives(databases, vin='VINC').shape[0] == 0
+
+def test_query_where_matches_strymread(databases, frames, dbcfile):
+    result = fleet.query(databases, ['speed', 'acc_state'], where='cruise control on', dbcfile=dbcfile, workers=2)
+    speed = result['speed']
+    assert sorted(speed['vin'].unique()) == ['VINA', 'VINB']
+
+    r = strymread(frames.copy(), dbcfile=dbcfile)
+    intervals = r._condition_intervals('cruise control on')
+    expected = r.speed()
+    expected = expected[intervals.contains(expected['Time'].values)]
+
+    vina = speed[speed['vin'] == 'VINA']
+    assert np.allclose(vina['Time'].values, expected['Time'].values)
+    assert np.allclose(vina['Message'].values, expected['Message'].values)
+    assert np.all(result['acc_state']['Message'] == 6)
+
+def test_query_is_pruned_by_vin_and_time(databases, dbcfile, start):
+    speed = fleet.query(databases, 'speed', vin='VINB', time=(start + MONTH + 5, start + MONTH + 10), dbcfile=dbcfile, workers=1)['speed']
+    assert list(speed['drive'].unique()) == ['drive_VINB']
+    assert speed['Time'].min() >= start + MONTH + 5 and speed['Time'].max() <= start + MONTH + 10
+
+    assert fleet.query(databases, 'speed', time=('2099-01-01', None), dbcfile=dbcfile)['speed'].shape[0] == 0
+
+def test_query_without_dbcfile_infers_it_from_the_vin(databases):
+    speed = fleet.query(databases, 'speed', vin='VINA', workers=1)['speed']
+    assert speed.shape[0] > 0
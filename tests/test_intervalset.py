@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from strym.intervalset import IntervalSet
+
+def test_overlapping_and_touching_intervals_merge():
+    s = IntervalSet([5.0, 0.0, 1.0, 8.0, 2.0], [6.0, 1.0, 1.5, 9.0, 3.0])
+    assert s.to_tuples() == [(0.0, 1.5), (2.0, 3.0), (5.0, 6.0), (8.0, 9.0)]
+
+    nested = IntervalSet([0.0, 1.0, 4.0], [10.0, 2.0, 10.0])
+    assert nested.to_tuples() == [(0.0, 10.0)]
+
+def test_reversed_intervals_are_dropped_and_lengths_checked():
+    assert len(IntervalSet([2.0, 5.0], [1.0, 5.0])) == 1
+    with pytest.raises(ValueError):
+        IntervalSet([0.0, 1.0], [2.0])
+
+def test_union_intersection_difference():
+    a = IntervalSet.from_tuples([(0, 4), (6, 10)])
+    b = IntervalSet.from_tuples([(2, 7), (10, 12)])
+
+    assert (a | b).to_tuples() == [(0.0, 12.0)]
+    assert (a & b).to_tuples() == [(2.0, 4.0), (6.0, 7.0), (10.0, 10.0)]
+    assert (a - b).to_tuples() == [(0.0, 2.0), (7.0, 10.0)]
+    assert (b - a).to_tuples() == [(4.0, 6.0), (10.0, 12.0)]
+    assert (a & IntervalSet()) == IntervalSet()
+
+def test_complement_and_clip():
+    a = IntervalSet.from_tuples([(1, 2), (4, 5)])
+    assert a.complement(0, 6).to_tuples() == [(0.0, 1.0), (2.0, 4.0), (5.0, 6.0)]
+    assert a.complement(1, 5).to_tuples() == [(2.0, 4.0)]
+    assert a.clip(1.5, 4.5).to_tuples() == [(1.5, 2.0), (4.0, 4.5)]
+
+def test_from_mask_runs_and_gap_filling():
+    time = np.arange(10.0)
+    mask = np.array([1, 1, 0, 0, 1, 0, 1, 1, 1, 1], dtype=bool)
+    s = IntervalSet.from_mask(time, mask)
+    assert s.to_tuples() == [(0.0, 1.0), (4.0, 4.0), (6.0, 9.0)]
+
+    assert s.fill_gaps(2.0).to_tuples() == [(0.0, 1.0), (4.0, 9.0)]
+    assert s.min_duration(1.0).to_tuples() == [(0.0, 1.0), (6.0, 9.0)]
+    assert s.dilate(0.5).to_tuples() == [(-0.5, 1.5), (3.5, 4.5), (5.5, 9.5)]
+    assert s.total_duration() == 4.0
+
+def test_contains_includes_boundaries():
+    s = IntervalSet.from_tuples([(1, 2), (4, 4)])
+    assert np.array_equal(s.contains([0.5, 1.0, 2.0, 3.0, 4.0, 4.5]), [False, True, True, False, True, False])
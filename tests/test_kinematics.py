@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from strym import kinematics
+
+def test_euler_matches_step_by_step_dead_reckoning():
+    rng = np.random.default_rng(0)
+    speed, heading, dt = rng.uniform(0, 100, 50), rng.uniform(-180, 180, 50), 0.05
+    X, Y, Vx, Vy = kinematics.dead_reckoning(speed, heading, dt, x_init=1.0, y_init=-2.0, heading_init=10.0)
+
+    x, y = [1.0], [-2.0]
+    for s, h in zip(speed, heading):
+        vx, vy = kinematics.velocity(s, h + 10.0)
+        x.append(x[-1] + vx*dt)
+        y.append(y[-1] + vy*dt)
+    assert np.allclose(X, x) and np.allclose(Y, y)
+    assert Vx[0] == Vy[0] == 0.0 and X.shape == (51,)
+
+@pytest.mark.parametrize('method', ['trapezoid', 'simpson'])
+def test_integration_is_exact_for_linear_speed(method):
+    dt = 0.1
+    t = np.arange(21)*dt
+    speed = 36.0*t
+    X, Y, _, _ = kinematics.dead_reckoning(speed, np.zeros_like(t), dt, method=method)
+    # 36 km/h is 10 m/s, first step is an Euler step of zero velocity
+    assert np.allclose(X[1:], 5.0*t**2)
+    assert np.allclose(Y, 0.0)
+
+def test_batch_of_initial_conditions_matches_single_trajectories():
+    rng = np.random.default_rng(1)
+    speed, heading = rng.uniform(0, 100, 30), rng.uniform(-180, 180, 30)
+    headings = np.array([0.0, 45.0, 90.0])
+    X, Y, _, _ = kinematics.dead_reckoning(speed, heading, 0.1, x_init=[0.0, 1.0, 2.0], heading_init=headings)
+    assert X.shape == (31, 3)
+    for i, h in enumerate(headings):
+        x, y, _, _ = kinematics.dead_reckoning(speed, heading, 0.1, x_init=float(i), heading_init=h)
+        assert np.allclose(X[:, i], x) and np.allclose(Y[:, i], y)
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        kinematics.dead_reckoning([1.0, 2.0], [0.0, 0.0], 0.1, method='rk4')
+
+@pytest.mark.parametrize('method', ['euler', 'trapezoid'])
+def test_streamed_trajectory_matches_dead_reckoning(method):
+    rng = np.random.default_rng(2)
+    speed, heading = rng.uniform(0, 100, 100), rng.uniform(-180, 180, 100)
+    X, Y, _, _ = kinematics.dead_reckoning(speed, heading, 0.02, x_init=3.0, y_init=4.0, method=method)
+
+    integrator = kinematics.TrajectoryIntegrator(0.02, x_init=3.0, y_init=4.0, method=method)
+    chunks = [integrator.update(speed[i], heading[i]) for i in np.array_split(np.arange(100), 7)]
+    assert np.allclose(np.concatenate([c[0] for c in chunks]), X[1:])
+    assert np.allclose(np.concatenate([c[1] for c in chunks]), Y[1:])
@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.io as sio
+
+from strym.matio import MatWriter
+
+VARIABLES = {'speed': pd.DataFrame({'Time': [0.0, 0.5, 1.0], 'Message': [10.0, 11.5, 12.0]}),
+             'counts': np.arange(6, dtype=np.int32).reshape(2, 3),
+             'flags': np.array([True, False, True]),
+             'system_name': 'vehicle',
+             'empty': np.empty((0, 2))}
+
+def test_variables_appended_one_by_one_load_as_a_single_savemat(tmp_path):
+    matfile = str(tmp_path / 'drive.mat')
+    with MatWriter(matfile) as writer:
+        for name, value in VARIABLES.items():
+            writer.write(name, value)
+
+    expected = io.BytesIO()
+    sio.savemat(expected, {name: value.to_numpy() if isinstance(value, pd.DataFrame) else value for name, value in VARIABLES.items()})
+    expected.seek(0)
+    expected = sio.loadmat(expected)
+
+    loaded = sio.loadmat(matfile)
+    assert sorted(k for k in loaded if not k.startswith('__')) == sorted(VARIABLES)
+    for name in VARIABLES:
+        assert loaded[name].dtype == expected[name].dtype
+        assert np.array_equal(loaded[name], expected[name])
+    assert np.array_equal(loaded['speed'], VARIABLES['speed'].to_numpy())
+    assert loaded['system_name'][0] == 'vehicle'
+
+def test_mat_v73_variables_keep_matlab_shape_and_class(tmp_path):
+    h5py = pytest.importorskip('h5py')
+    matfile = str(tmp_path / 'drive.mat')
+    with MatWriter(matfile, version='7.3') as writer:
+        for name, value in VARIABLES.items():
+            writer.write(name, value)
+
+    with open(matfile, 'rb') as f:
+        assert f.read(19) == b'MATLAB 7.3 MAT-file'
+    with h5py.File(matfile, 'r') as f:
+        assert np.array_equal(f['speed'][()].T, VARIABLES['speed'].to_numpy())
+        assert f['counts'].attrs['MATLAB_class'] == b'int32' and f['counts'].shape == (3, 2)
+        assert f['flags'].attrs['MATLAB_class'] == b'logical'
+        assert f['system_name'][()].T.tobytes().decode('utf-16-le') == 'vehicle'
+        assert f['empty'].attrs['MATLAB_empty'] == 1
+
+def test_unsupported_version_raises(tmp_path):
+    with pytest.raises(ValueError):
+        MatWriter(str(tmp_path / 'drive.mat'), version='4')
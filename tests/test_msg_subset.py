@@ -0,0 +1,21 @@
+import pytest
+
+from strym import strymview
+
+def test_empty_conditions_are_rejected(reader):
+    with pytest.raises(ValueError):
+        reader.msg_subset(conditions=[])
+
+def test_condition_outside_of_time_window_returns_none(reader):
+    # cruise control is on only after 8 s
+    assert reader.msg_subset(conditions='cruise control on', time=(0, 5)) is None
+
+    view = reader.msg_subset(conditions='cruise control on', time=(0, 12))
+    assert isinstance(view, strymview)
+    assert view.speed()['Time'].max() - reader.dataframe['Time'].iloc[0] <= 12
+
+def test_view_decodes_without_materializing_its_dataframe(reader):
+    view = reader.msg_subset(time=(2, 6))
+    speed = view.speed()
+    assert view._frame is None
+    assert speed.shape[0] > 0
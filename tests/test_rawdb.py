@@ -0,0 +1,46 @@
+from strym import strymread, rawdb
+
+def drive_frames(connection, name):
+    return connection.execute('SELECT Frames, StartTime, EndTime FROM {} WHERE Name = ?;'.format(rawdb.DRIVES_TABLE), (name,)).fetchone()
+
+def test_same_frames_loaded_under_two_drives(tmp_path, frames, dbcfile):
+    db = str(tmp_path / 'frames.db')
+    connection = rawdb.connect(db)
+    _, first = rawdb.load_frames(connection, frames, 'drive_a', 'VINA')
+    _, second = rawdb.load_frames(connection, frames, 'drive_b', 'VINA')
+    _, again = rawdb.load_frames(connection, frames, 'drive_b', 'VINA')
+
+    assert first == second == frames.shape[0]
+    assert again == 0
+    for name in ['drive_a', 'drive_b']:
+        count, start, end = drive_frames(connection, name)
+        assert count == frames.shape[0]
+        assert abs(start - frames['Time'].min()) < 1e-6 and abs(end - frames['Time'].max()) < 1e-6
+    connection.close()
+
+    r = strymread.from_db(db, drives=['drive_b'], dbcfile=dbcfile)
+    assert r.dataframe.shape[0] == frames.shape[0]
+
+def test_legacy_key_without_drive_is_dropped(tmp_path, frames):
+    db = str(tmp_path / 'legacy.db')
+    connection = rawdb.connect(db)
+    rawdb.load_frames(connection, frames, 'drive_a')
+    connection.execute('DROP INDEX {};'.format(rawdb.KEY_INDEX))
+    connection.execute('CREATE UNIQUE INDEX {0}_KEY ON {0} (MessageID, TimeUs, Bus, Payload);'.format(rawdb.FRAMES_TABLE))
+    connection.commit()
+    connection.close()
+
+    connection = rawdb.connect(db)
+    _, inserted = rawdb.load_frames(connection, frames, 'drive_b')
+    assert inserted == frames.shape[0]
+    assert drive_frames(connection, 'drive_b')[0] == frames.shape[0]
+    connection.close()
+
+def test_database_path_under_home_directory(tmp_path, frames, dbcfile, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    connection = rawdb.connect(str(tmp_path / 'frames.db'))
+    rawdb.load_frames(connection, frames, 'drive_a', 'VINA')
+    connection.close()
+
+    r = strymread.from_db('~/frames.db', dbcfile=dbcfile)
+    assert r.dataframe.shape[0] == frames.shape[0]
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym import strymread
+
+@pytest.mark.parametrize('method', ['linear', 'nearest', 'previous', 'cubic'])
+def test_out_of_order_samples_are_resampled_in_time_order(method):
+    t = np.arange(0.0, 10.0, 0.1)
+    ordered = pd.DataFrame({'Time': t, 'Message': np.sin(t)})
+    shuffled = ordered.iloc[np.random.default_rng(0).permutation(t.shape[0])].reset_index(drop=True)
+
+    expected = strymread.resample(ordered, rate=20, cont_method=method)
+    resampled = strymread.resample(shuffled, rate=20, cont_method=method)
+    assert np.allclose(resampled['Message'].values, expected['Message'].values)
+
+def test_samples_with_the_same_time_keep_their_order():
+    df = pd.DataFrame({'Time': [2.0, 0.0, 1.0, 1.0, 3.0], 'Message': [2.0, 0.0, 1.0, 5.0, 3.0]})
+    resampled = strymread.resample(df, rate=2, cont_method='previous')
+    assert resampled['Message'].values[resampled['Time'].values.searchsorted(1.0)] == 1.0
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strym.signalstore import SignalStore
+
+def timeseries(time):
+    time = np.asarray(time, dtype=float)
+    return pd.DataFrame({'Time': time, 'Message': time*2.0})
+
+def test_windows_across_chunk_boundaries(tmp_path):
+    store = SignalStore(str(tmp_path), chunk_size=4)
+    store.write('speed', timeseries(np.arange(10.0)))
+    assert [chunk['rows'] for chunk in store._index('speed')['chunks']] == [4, 4, 2]
+
+    window = store.read('speed', 2.5, 8.0)
+    assert window['Time'].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    assert np.array_equal(window['Message'].values, window['Time'].values*2.0)
+
+    # windows ending exactly on the first sample of a chunk, or between chunks
+    assert store.read('speed', 3.0, 4.0)['Time'].tolist() == [3.0, 4.0]
+    assert store.read('speed', t1=0.0)['Time'].tolist() == [0.0]
+    assert store.read('speed', 9.5)['Time'].shape[0] == 0
+    assert store.read('speed')['Time'].tolist() == list(np.arange(10.0))
+
+def test_appended_samples_must_be_later(tmp_path):
+    store = SignalStore(str(tmp_path), chunk_size=4)
+    store.write('speed', timeseries([0.0, 1.0, 2.0]))
+    with pytest.raises(ValueError):
+        store.write('speed', timeseries([2.0, 3.0]), append=True)
+
+    store.write('speed', timeseries([3.0, 4.0]), append=True)
+    assert store.read('speed', 1.0)['Time'].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert store.time_range('speed') == (0.0, 4.0)
+
+def test_replaced_signal_removes_unreferenced_chunks(tmp_path):
+    store = SignalStore(str(tmp_path), chunk_size=4)
+    store.write('speed', timeseries(np.arange(10.0)))
+    store.write('speed', timeseries([100.0, 101.0]))
+
+    assert sorted(os.listdir(os.path.join(str(tmp_path), 'speed'))) == ['index.json', 'time_000000.npy', 'value_000000.npy']
+    assert store.read('speed')['Time'].tolist() == [100.0, 101.0]
+
+    # a new store reads the replaced index from disk
+    assert SignalStore(str(tmp_path)).read('speed')['Time'].tolist() == [100.0, 101.0]
+    assert SignalStore(str(tmp_path)).names() == ['speed']
+
+def test_unknown_signal_raises(tmp_path):
+    with pytest.raises(ValueError):
+        SignalStore(str(tmp_path)).read('speed')
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from strym import strymread
+
+def test_state_space_decoded_in_worker_processes_matches_serial(reader, frames, dbcfile):
+    serial = reader.state_space(workers=1)
+    parallel = strymread(frames.copy(), dbcfile=dbcfile).state_space(workers=2)
+    assert serial.equals(parallel)
+
+def test_prefetched_topics_are_decoded_from_the_cache(reader, frames, dbcfile):
+    reader._prefetch(['speed', 'acc_state'], workers=2)
+    assert ('ts', 'SPEED', 'SPEED') in reader._cache()
+    assert ('ts', 'PCM_CRUISE_SM', 'CRUISE_CONTROL_STATE') in reader._cache()
+
+    serial = strymread(frames.copy(), dbcfile=dbcfile)
+    assert reader.speed().equals(serial.speed())
+    assert reader.acc_state().equals(serial.acc_state())
+
+def test_incremental_state_space_matches_state_space(reader, frames, dbcfile):
+    from strym.streaming import StateSpaceBuilder
+
+    batch = reader.state_space(workers=1)
+
+    builder = StateSpaceBuilder(dbcfile=dbcfile)
+    for chunk in np.array_split(np.arange(frames.shape[0]), 5):
+        builder.update(frames.iloc[chunk].reset_index(drop=True))
+    incremental = builder.result()
+
+    assert list(incremental.columns) == list(batch.columns)
+    assert np.array_equal(incremental['Time'].values, batch['Time'].values)
+    assert np.allclose(incremental.drop(columns=['Time']).values, batch.drop(columns=['Time']).values)
+
+def test_drained_rows_are_released(frames, dbcfile):
+    from strym.streaming import StateSpaceBuilder
+
+    builder = StateSpaceBuilder(dbcfile=dbcfile)
+    drained = []
+    for chunk in np.array_split(np.arange(frames.shape[0]), 4):
+        emitted = builder.update(frames.iloc[chunk].reset_index(drop=True))
+        rows = builder.drain()
+        assert rows.equals(emitted)
+        assert builder.result().shape[0] == 0
+        drained.append(rows)
+
+    streaming = StateSpaceBuilder(dbcfile=dbcfile, keep_rows=False)
+    emitted = [streaming.update(frames.iloc[chunk].reset_index(drop=True)) for chunk in np.array_split(np.arange(frames.shape[0]), 4)]
+    assert len(streaming.rows) == 0
+    assert pd.concat(emitted).equals(pd.concat(drained))
+
+def test_frames_failing_to_decode_are_skipped_without_replacing_the_dataframe(reader):
+    reader.speed()
+    dataframe = reader.dataframe
+    message = reader.candb.get_message_by_name('ACCELEROMETER')
+    frames = dataframe[dataframe['MessageID'] == message.frame_id].copy()
+    frames.loc[frames.index[:10], 'Message'] = frames['Message'].iloc[:10].str[:7]
+
+    decoded = reader._decode_frames(message.name, frames)
+
+    assert decoded['ACCEL_X'].shape[0] == frames.shape[0] - 10
+    assert reader.dataframe is dataframe
+    assert ('ts', 'SPEED', 'SPEED') in reader._cache()
+
+def test_builder_loads_the_dbc_file_once(frames, dbcfile, monkeypatch):
+    import cantools
+    from strym.streaming import StateSpaceBuilder
+
+    load_file = cantools.db.load_file
+    loaded = []
+    monkeypatch.setattr(cantools.db, 'load_file', lambda *args, **kwargs: loaded.append(args) or load_file(*args, **kwargs))
+
+    builder = StateSpaceBuilder(dbcfile=dbcfile)
+    for chunk in np.array_split(np.arange(frames.shape[0]), 3):
+        builder.update(frames.iloc[chunk].reset_index(drop=True))
+    assert len(loaded) == 1